@@ -0,0 +1,7 @@
+# IT Risk Assessment (ITRA) gateway
+#
+# The scoping rules (itra_gateway.engine), the question catalog
+# (itra_gateway.catalog) and the export schema (itra_gateway.export) import
+# with the standard library only. Streamlit is loaded by itra_gateway.app
+# alone, which `itra-gateway ui` launches; NumPy only by the portfolio
+# scorer.
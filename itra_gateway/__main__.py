@@ -0,0 +1,7 @@
+# Run with: python -m itra_gateway --help
+
+import sys
+
+from itra_gateway.cli import main
+
+sys.exit(main())
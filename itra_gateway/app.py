@@ -0,0 +1,708 @@
+# ITRA Gateway Questions - Streamlit App (Minimal Dependencies)
+# Run with: uv run --extra ui itra-gateway ui
+
+import streamlit as st
+import functools
+import gc
+import inspect
+import json
+import os
+import pickle
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+
+from itra_gateway.audit import AuditLog
+from itra_gateway.bank import BANK
+from itra_gateway.catalog import CATALOG, Phase, Question
+from itra_gateway.dashboard import render_dashboard
+from itra_gateway.engine import Scope, ScopeChange, ScopeTracker, decode_answers
+from itra_gateway.export import serialize_configuration
+from itra_gateway.metrics import REGISTRY, SIZE_BUCKETS, log_metrics, serve_metrics
+from itra_gateway.profiles import AnswerProfile, ProfileCache
+from itra_gateway.report import report_pdf
+from itra_gateway.sessions import AssessmentSession, SessionStore
+from itra_gateway.store import AssessmentStore
+from itra_gateway.sync import IRMClient, IRMSync
+from itra_gateway.telemetry import DwellTelemetry
+
+# Keyed fragments let a widget callback rerun exactly the parts of the page
+# an answer affects; older Streamlit versions fall back to full-app reruns
+KEYED_FRAGMENTS = "key" in inspect.signature(st.fragment).parameters
+
+# Gateway keys per phase, shared by every session's ScopeTracker
+PHASE_KEYS = tuple(phase.keys for phase in CATALOG.phases)
+
+
+# Instrumentation, aggregated per process (Prometheus text via
+# ITRA_METRICS_PORT, JSON log lines via ITRA_METRICS_LOG_INTERVAL)
+RENDER_SECONDS = REGISTRY.histogram(
+    "itra_render_seconds", "Time to render one page section", ["section"]
+)
+RERUN_SECONDS = REGISTRY.histogram("itra_rerun_seconds", "Full script run time")
+SCOPE_SECONDS = REGISTRY.histogram(
+    "itra_scope_update_seconds", "Time to apply one answer to the session's scope"
+)
+RERUNS = REGISTRY.counter("itra_reruns_total", "Script runs", ["scope"])
+SESSION_RERUNS = REGISTRY.session_reruns(
+    "itra_session_reruns", "Script runs per live session"
+)
+SESSION_STATE_BYTES = REGISTRY.histogram(
+    "itra_session_state_bytes", "Pickled session_state size", buckets=SIZE_BUCKETS
+)
+EXPORTS = REGISTRY.counter("itra_exports_total", "Configurations exported")
+
+
+@st.cache_resource
+def start_metrics_exporters() -> bool:
+    """Start the configured metrics exporters once per process"""
+    port = os.environ.get("ITRA_METRICS_PORT")
+    if port:
+        serve_metrics(int(port), os.environ.get("ITRA_METRICS_HOST", "127.0.0.1"))
+    interval = os.environ.get("ITRA_METRICS_LOG_INTERVAL")
+    if interval:
+        log_metrics(float(interval))
+    return True
+
+
+@st.cache_resource
+def freeze_startup_objects() -> bool:
+    """Exempt the modules loaded at startup from the collection after every run"""
+    # Streamlit runs a full gc.collect() after each script run (and after
+    # each run a widget callback preempts); walking the imported modules'
+    # objects takes tens of milliseconds that every click waits on
+    gc.freeze()
+    return True
+
+
+def session_state_size() -> Optional[int]:
+    """Pickled size of this session's state, None if it cannot be pickled"""
+    try:
+        return len(pickle.dumps(dict(st.session_state), pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return None
+
+
+def timed(section: str):
+    """Record the decorated render method's duration under `section`"""
+
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with RENDER_SECONDS.time(section):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def fragment(key: str):
+    """Render the decorated method as an independently rerunning fragment"""
+    if KEYED_FRAGMENTS:
+        return st.fragment(key=key)
+    return lambda func: func
+
+
+# Resume links: the answer code and start time travel in one short query
+# parameter, so a half-done assessment needs no server-side storage
+RESUME_PARAM = "r"
+
+
+def resume_token(code: int, start_time: datetime) -> str:
+    """Query parameter value for an answer code and assessment start time"""
+    return f"{code:x}.{int(start_time.timestamp()):x}"
+
+
+def parse_resume_token(token: str) -> Tuple[Dict[str, str], datetime]:
+    """Answers and start time from a resume token; ValueError if invalid"""
+    code, _, started = token.partition(".")
+    try:
+        return decode_answers(int(code, 16)), datetime.fromtimestamp(int(started, 16))
+    except (OverflowError, OSError) as exc:
+        raise ValueError(f"invalid start time in resume token: {token}") from exc
+
+
+@st.cache_resource
+def get_assessment_store(path: str) -> AssessmentStore:
+    """One SQLite store per process, shared by all sessions"""
+    return AssessmentStore(path)
+
+
+@st.cache_resource
+def get_irm_sync(url: str) -> IRMSync:
+    """Background IRM sync per process; Export only enqueues"""
+    token = os.environ.get("ITRA_IRM_TOKEN")
+    return IRMSync(
+        IRMClient(url, headers={"Authorization": f"Bearer {token}"} if token else None),
+        spool_path=os.environ.get("ITRA_IRM_SPOOL_PATH"),
+    )
+
+
+@st.cache_resource
+def get_audit_log(path: str) -> AuditLog:
+    """Answer change log per process; appends are fsynced in batches"""
+    return AuditLog(
+        path,
+        sync_interval=float(os.environ.get("ITRA_AUDIT_SYNC_INTERVAL", 1.0)),
+    )
+
+
+@st.cache_resource
+def get_session_store() -> SessionStore:
+    """Assessments of every session in this process, bounded in memory"""
+    return SessionStore(
+        max_bytes=int(os.environ.get("ITRA_SESSION_MAX_BYTES", 64 * 1024 * 1024)),
+        ttl_seconds=float(os.environ.get("ITRA_SESSION_TTL", 7200)),
+        spill_path=os.environ.get("ITRA_SESSION_SPILL_PATH"),
+    )
+
+
+@st.cache_resource
+def get_telemetry() -> DwellTelemetry:
+    """Answer dwell sketches per process, merged into a shared file if set"""
+    return DwellTelemetry(
+        path=os.environ.get("ITRA_TELEMETRY_PATH"),
+        flush_interval=float(os.environ.get("ITRA_TELEMETRY_FLUSH_INTERVAL", 60)),
+    )
+
+
+@st.cache_resource
+def get_profile_cache() -> ProfileCache:
+    """Scope and summary of each distinct answer set, shared by all sessions"""
+    return ProfileCache(
+        max_entries=int(os.environ.get("ITRA_PROFILE_CACHE_SIZE", 1024))
+    )
+
+
+def show_time_estimate(scope: Scope, container=st):
+    """Estimated time metric for the enabled paths, from recorded dwell times"""
+    min_time, max_time = get_telemetry().estimate(scope)
+    container.metric(
+        "Estimated Time",
+        f"{min_time}-{max_time} min",
+        help="Typical (median) to slow (90th percentile) time for these "
+        "questions, from how long users have taken to answer them",
+    )
+
+
+QUICK_REFERENCE = """
+**When in Doubt:**
+- **Regulation**: If pharma-related → Yes
+- **Patient Safety**: If any patient connection → Yes  
+- **AI**: If it does anything "smart" → Yes
+- **Impact**: If you'd panic if it failed → High
+- **Connectivity**: If remote access → Multiple Networks
+"""
+
+
+def show_help(title: str, body: str, key: str):
+    """Help text behind a toggle, only sent to the browser while it is open"""
+    if st.toggle(title, key=key):
+        with st.container(border=True):
+            st.markdown(body)
+
+
+class ITRAGatewayApp:
+    def __init__(self):
+        self.phase_1_complete = False
+        self.phase_2_complete = False
+        self.phase_3_complete = False
+        # Fragment reruns call back into the instance of the run that drew
+        # them, after that run has finished
+        self.full_run = False
+        self.session: Optional[AssessmentSession] = None
+
+    def main(self):
+        start_metrics_exporters()
+        self.full_run = True
+        try:
+            with RERUN_SECONDS.time():
+                self.render_page()
+        finally:
+            self.full_run = False
+        self.save_session()
+        self.record_rerun("app")
+
+    def record_rerun(self, scope: str):
+        """Count a script run for this session and sample its state size"""
+        RERUNS.inc(scope)
+        SESSION_RERUNS.record(st.session_state.session_id)
+        size = session_state_size()
+        if size is not None:
+            SESSION_STATE_BYTES.observe(size)
+
+    def save_session(self):
+        """Hand this session's assessment back to the store as most recent"""
+        get_session_store().put(st.session_state.session_id, self.session)
+
+    def render_page(self):
+        # Header
+        st.title("🛡️ IT Risk Assessment - Smart Gateway")
+        st.markdown(
+            f"**Business-Friendly Risk Assessment** | Answer {len(CATALOG.questions)} key questions to determin your assessment scope"
+        )
+
+        # Initialize session state
+        if "session_id" not in st.session_state:
+            st.session_state.session_id = uuid.uuid4().hex
+        # The assessment lives in the session store; an evicted one comes
+        # back from its spill file or, failing that, from the resume link
+        self.session = get_session_store().get(st.session_state.session_id)
+        if self.session is None:
+            self.session = self.start_assessment()
+
+        # Main assessment flow
+        if self.session.section is None:
+            self.render_gateway()
+        else:
+            self.render_layout(self.render_full_assessment)
+
+    @fragment("gateway")
+    def render_gateway(self):
+        """Render the gateway phases with progress and summary"""
+        # Rerun as a whole only when a phase appears or disappears; other
+        # answers rerun just the summary (see on_answer_change)
+        self.render_layout(self.render_assessment_phases)
+
+    def render_layout(self, render_main):
+        """Progress bar above the main column and the summary beside it"""
+        # Progress tracking (filled in once this run's answers are known)
+        progress_slot = st.container()
+        col1, col2 = st.columns([2, 1])
+
+        with col1:
+            render_main()
+
+        with col2:
+            self.render_sidebar_summary()
+
+        with progress_slot:
+            self.show_progress()
+
+    def start_assessment(self) -> AssessmentSession:
+        """Start a new assessment, or resume the one in the page URL"""
+        answers, start_time = {}, datetime.now()
+        token = st.query_params.get(RESUME_PARAM)
+        if token:
+            try:
+                answers, start_time = parse_resume_token(token)
+            except ValueError:
+                st.warning("⚠️ This resume link has expired, starting a new assessment")
+
+        # Select the restored options before the radios are drawn, so the
+        # whole assessment comes back in this same run
+        for key, value in answers.items():
+            question = CATALOG.questions[key]
+            option = question.options[CATALOG.value_to_index[key][value]]
+            st.session_state[question.widget_key] = option.text
+        session = AssessmentSession(
+            scope=ScopeTracker(phases=PHASE_KEYS, answers=answers),
+            start_time=start_time,
+        )
+        audit_path = os.environ.get("ITRA_AUDIT_PATH")
+        if audit_path and answers:
+            # The audit trail of a resumed assessment starts from its answers
+            get_audit_log(audit_path).snapshot(session.assessment_id, answers)
+        return session
+
+    def update_resume_link(self):
+        """Keep the page URL pointing at the current answers"""
+        token = resume_token(self.scope.code, self.session.start_time)
+        if st.query_params.get(RESUME_PARAM) != token:
+            st.query_params[RESUME_PARAM] = token
+
+    @property
+    def scope(self) -> ScopeTracker:
+        """This session's answers with their incrementally maintained scope"""
+        return self.session.scope
+
+    def show_progress(self):
+        phases_complete = self.scope.phases_complete
+        phase_count = len(CATALOG.phases)
+        progress = phases_complete / phase_count
+        st.progress(progress)
+        st.markdown(
+            f"**Progress:** Phase {min(phases_complete + 1, phase_count)} of {phase_count} | {int(progress * 100)}% Complete"
+        )
+
+    def record_answer(self, key: str, selected: str) -> Optional[ScopeChange]:
+        """Apply a selected option to the scope and audit it if it changed"""
+        with SCOPE_SECONDS.time():
+            change = self.scope.set_answer(key, CATALOG.answer(key, selected))
+        if change is not None:
+            self.audit(change)
+        return change
+
+    def on_answer_change(self, key: str):
+        """Record a changed answer and rerun only what depends on it"""
+        question = CATALOG.questions[key]
+        change = self.record_answer(key, st.session_state[question.widget_key])
+        if change is None or not KEYED_FRAGMENTS:
+            return
+        if change.phases_changed:
+            # A phase appeared or disappeared, and the progress bar moved
+            st.rerun("gateway")
+
+        # The browser already shows the new radio selection; only questions
+        # that echo their answer need their phase redrawn, everything else
+        # derived lives in the summary. Naming the targets replaces the
+        # click's default rerun of the phase fragment.
+        targets = ["summary"]
+        if question.echo_selection:
+            targets.append(question.phase)
+        st.rerun(targets)
+
+    def audit(self, change: ScopeChange):
+        """Append an answer change to the audit log, when one is configured"""
+        path = os.environ.get("ITRA_AUDIT_PATH")
+        if path:
+            get_audit_log(path).record(
+                self.session.assessment_id,
+                change.key,
+                change.previous,
+                change.value,
+                self.scope.answers,
+            )
+
+    def render_assessment_phases(self):
+        """Render the main assessment phases"""
+        # Each phase is shown once every phase before it is complete
+        for index, phase in enumerate(CATALOG.phases):
+            if index > self.scope.phases_complete:
+                break
+            if index:
+                st.divider()
+            with st.container():
+                st.header(phase.header)
+                fragment(phase.key)(self.render_phase)(phase)
+
+    def render_phase(self, phase: Phase):
+        """Render every question of a phase"""
+        with RENDER_SECONDS.time(phase.key):
+            for question in phase.questions:
+                self.render_question(question)
+
+    def render_question(self, question: Question):
+        """Render one gateway question with its help text"""
+        st.subheader(question.title)
+
+        show_help(question.help_title, question.help, f"{question.key}_help")
+
+        selected = st.radio(
+            question.label,
+            options=question.texts,
+            key=question.widget_key,
+            on_change=self.on_answer_change,
+            args=(question.key,),
+            horizontal=question.horizontal,
+        )
+
+        if selected:
+            # Picks up default and resumed selections, which fire no callback
+            self.record_answer(question.key, selected)
+
+            if question.echo_selection:
+                st.success(f"✅ Selected: {selected}")
+
+    @fragment("summary")
+    @timed("summary")
+    def render_sidebar_summary(self):
+        """Render the sidebar with assessment summary"""
+        # Every fragment rerun includes the summary, so count them here
+        if not self.full_run:
+            self.save_session()
+            self.record_rerun("fragment")
+
+        st.subheader("📊 Assessment Summary")
+
+        answers = self.scope.answers
+        if self.session.section is None:
+            # Reruns with every answer, so it keeps the resume link current
+            self.update_resume_link()
+
+        if not answers:
+            st.info("👆 Start by selecting your asset type")
+            return
+        profile = self.profile(answers)
+
+        # Show current answers
+        st.markdown("**Your Answers:**")
+        for line in profile.answer_lines:
+            st.markdown(line)
+        st.caption("🔗 Bookmark this page to resume later, or share its link")
+        if os.environ.get("ITRA_AUDIT_PATH"):
+            st.caption(f"🧾 Audit trail: `{self.session.assessment_id}`")
+
+        # Calculate enabled paths
+        if self.scope.phases_complete >= 2:  # At least through Phase 2
+            st.divider()
+            st.subheader("🎯 Assessment Scope")
+
+            # Create metrics using simple layout
+            col1, col2 = st.columns(2)
+            with col1:
+                st.metric("Total Questions", f"{profile.total_questions}")
+            with col2:
+                st.metric("Assessment Areas", f"{profile.enabled_count}")
+
+            show_time_estimate(profile.scope)
+
+            st.markdown("**Enabled Assessment Areas:**")
+            for enabled, line in profile.path_lines:
+                if enabled:
+                    st.success(line)
+                else:
+                    st.info(line)
+
+        # Show next steps
+        if self.scope.phases_complete == len(CATALOG.phases):
+            st.divider()
+            st.success("🎉 Gateway Assessment Complete!")
+
+            # Remember the click: buttons are only True for a single rerun
+            if st.button("📋 Generate Full Assessment", type="primary"):
+                st.session_state.show_full_assessment = True
+            if st.session_state.get("show_full_assessment"):
+                self.show_full_assessment_preview(profile)
+
+        # Quick reference
+        st.divider()
+        show_help("🤔 Quick Reference", QUICK_REFERENCE, "quick_reference")
+
+    def profile(self, answers: Dict[str, str]) -> AnswerProfile:
+        """Cached scope, metrics and summary markdown for these answers"""
+        return get_profile_cache().get(answers)
+
+    def show_full_assessment_preview(self, profile: AnswerProfile):
+        """Show preview of the full assessment"""
+        st.subheader("📋 Full Assessment Preview")
+
+        answers = dict(profile.answers)
+
+        # Summary metrics
+        col1, col2, col3 = st.columns(3)
+
+        col1.metric("Total Questions", profile.total_questions)
+        col2.metric("Assessment Areas", profile.enabled_count)
+        show_time_estimate(profile.scope, col3)
+
+        # Detailed breakdown
+        st.markdown("**Assessment Breakdown:**")
+        for line in profile.breakdown_lines:
+            st.markdown(line)
+
+        # Export options
+        st.divider()
+        col1, col2 = st.columns(2)
+
+        with col1:
+            if st.button("📤 Export Configuration"):
+                st.session_state.export = self.export_configuration(answers)
+
+            # The export stays on offer until the answers change
+            export = st.session_state.get("export")
+            if export and export["answer_code"] == self.scope.code:
+                self.render_export(answers, export)
+
+        with col2:
+            st.info(
+                "💡 Ready to proceed with the full detailed assessment based on these answers."
+            )
+            if st.button("▶️ Start Full Assessment"):
+                self.session.section = 0
+                self.session.answered_at = time.time()
+                st.rerun()
+
+    @fragment("runner")
+    def render_full_assessment(self):
+        """Render the enabled paths' follow-up questions, one section at a time"""
+        if not self.full_run:
+            self.save_session()
+            self.record_rerun("fragment")
+
+        answers = self.scope.answers
+        sections = BANK.sections_for(self.scope.scope, answers.get("asset_type"))
+        index = min(self.session.section, len(sections))
+        if index == len(sections):
+            self.render_full_assessment_complete(answers, sections)
+            return
+
+        # Parse the next section's file while this one is being answered
+        if index + 1 < len(sections):
+            BANK.prefetch(sections[index + 1])
+
+        section = sections[index]
+        st.progress(index / len(sections))
+        st.markdown(f"**Full Assessment:** Section {index + 1} of {len(sections)}")
+        st.header(section.title)
+        for question in BANK.questions(section, answers):
+            choice = st.radio(
+                question.text,
+                options=question.options,
+                index=self.session.followup.get(question.id),
+                key=f"followup_{question.id}",
+                on_change=self.on_followup_change,
+                args=(section.path, question.id),
+            )
+            if choice is not None:
+                self.session.followup[question.id] = question.options.index(choice)
+
+        st.divider()
+        col1, col2 = st.columns(2)
+        with col1:
+            st.button(
+                "⬅️ Back",
+                key="runner_back",
+                on_click=self.show_section,
+                args=(index - 1 if index else None,),
+            )
+        with col2:
+            st.button(
+                "Next ➡️",
+                key="runner_next",
+                type="primary",
+                on_click=self.show_section,
+                args=(index + 1,),
+            )
+
+    def render_full_assessment_complete(self, answers: Dict[str, str], sections):
+        """Summary and download once every section has been shown"""
+        followup = {}
+        for section in sections:
+            for question in BANK.questions(section, answers):
+                option = self.session.followup.get(question.id)
+                if option is not None:
+                    followup[question.id] = question.options[option]
+        total = self.scope.total_questions
+
+        st.progress(1.0)
+        st.success(f"🎉 Full Assessment Complete! {len(followup)} of {total} answered")
+        st.download_button(
+            label="📥 Download Full Assessment JSON",
+            data=json.dumps(
+                {"gateway_answers": answers, "followup_answers": followup}, indent=2
+            ),
+            file_name=f"itra_full_assessment_{datetime.now():%Y%m%d_%H%M%S}.json",
+            mime="application/json",
+        )
+        st.button(
+            "⬅️ Back",
+            key="runner_back",
+            on_click=self.show_section,
+            args=(len(sections) - 1,),
+        )
+
+    def on_followup_change(self, path_name: str, question_id: str):
+        """Record how long the user took to answer a follow-up question"""
+        # Time since the section was shown or the previous answer
+        now = time.time()
+        if self.session.answered_at:
+            get_telemetry().record(
+                path_name, question_id, now - self.session.answered_at
+            )
+        self.session.answered_at = now
+
+    def show_section(self, index: Optional[int]):
+        """Move the full assessment to a section, None for the gateway"""
+        self.session.section = index
+        self.session.answered_at = time.time()
+        if index is None and KEYED_FRAGMENTS:
+            # Back to the gateway: the page layout changes. Otherwise the
+            # click already reruns the runner fragment holding the buttons
+            st.rerun()
+
+    def export_configuration(self, answers: Dict[str, str]) -> Dict:
+        """Export the assessment configuration"""
+        now = datetime.now()
+
+        # Keep completed assessments when a database is configured, and
+        # queue them for ServiceNow IRM when a sync endpoint is
+        db_path = os.environ.get("ITRA_DB_PATH")
+        irm_url = os.environ.get("ITRA_IRM_URL")
+        if db_path or irm_url:
+            config = json.loads(self.configuration_json(answers, now))
+            if db_path:
+                get_assessment_store(db_path).save(config)
+            if irm_url:
+                get_irm_sync(irm_url).submit(config)
+        EXPORTS.inc()
+
+        # Session state keeps only the answer code and export time; the
+        # document is rebuilt from them when drawn
+        return {"answer_code": self.scope.code, "exported_at": now}
+
+    def configuration_json(self, answers: Dict[str, str], now: datetime) -> str:
+        """Configuration document as exported at `now`"""
+        start_time = self.session.start_time
+        # Scope sections are serialized once per distinct answer set and
+        # shared by every session
+        return serialize_configuration(answers, start_time, now=now)
+
+    def report_metadata(self, now: datetime) -> Dict:
+        """Report header fields, as in the configuration's metadata"""
+        start_time = self.session.start_time
+        return {
+            "timestamp": now.isoformat(),
+            "start_time": start_time.isoformat(),
+            "duration_minutes": (now - start_time).total_seconds() / 60,
+        }
+
+    def render_export(self, answers: Dict[str, str], export: Dict):
+        """Offer a prepared export for download"""
+        json_string = self.configuration_json(answers, export["exported_at"])
+
+        # Generate filename with timestamp
+        timestamp = export["exported_at"].strftime("%Y%m%d_%H%M%S")
+        st.download_button(
+            label="📥 Download Configuration JSON",
+            data=json_string,
+            file_name=f"itra_assessment_config_{timestamp}.json",
+            mime="application/json",
+            help="Download the assessment configuration for integration with other systems",
+        )
+        st.download_button(
+            label="🖨️ Download Printable Report (PDF)",
+            data=report_pdf(answers, self.report_metadata(export["exported_at"])),
+            file_name=f"itra_assessment_report_{timestamp}.pdf",
+            mime="application/pdf",
+            help="Answers, assessment scope and summary for auditors",
+        )
+
+        # Show preview (the whole JSON again, so also only sent when open)
+        if st.toggle("👁️ Preview Configuration", key="export_preview"):
+            st.code(json_string, language="json")
+
+
+def main():
+    # Configure page (first Streamlit call of every run)
+    st.set_page_config(
+        page_title="IT Risk Assessment - Gateway Questions",
+        page_icon="🛡️",
+        layout="wide",
+        initial_sidebar_state="expanded",
+    )
+    freeze_startup_objects()
+    st.navigation(
+        [
+            st.Page(gateway_page, title="Gateway", icon="🛡️", default=True),
+            st.Page(portfolio_page, title="Portfolio", icon="📈", url_path="portfolio"),
+        ]
+    ).run()
+
+
+def gateway_page():
+    app = ITRAGatewayApp()
+    app.main()
+
+
+def portfolio_page():
+    start_metrics_exporters()
+    db_path = os.environ.get("ITRA_DB_PATH")
+    with RENDER_SECONDS.time("dashboard"):
+        render_dashboard(get_assessment_store(db_path) if db_path else None)
+
+
+if __name__ == "__main__":
+    main()
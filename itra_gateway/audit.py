@@ -0,0 +1,475 @@
+# ITRA answer audit log (standard library only)
+#
+# Every gateway answer change is appended to a JSON-lines file as one
+# record, hash-chained to the record before it: each record holds the
+# previous record's hash and its own hash covers both, so editing, dropping
+# or reordering any record breaks every hash after it. The file is only ever
+# appended to. Records are written as they happen and fsynced in batches,
+# every `sync_every` records or `sync_interval` seconds, whichever comes
+# first, so a crash loses at most one batch instead of costing an fsync per
+# answer.
+#
+# Each record also carries the byte offset of the same assessment's previous
+# record, and every `snapshot_every` changes an assessment gets a snapshot
+# record holding all of its answers. Rebuilding an assessment reads its
+# latest snapshot and the few changes after it; its history is a walk back
+# along the offsets, never a scan. Compaction folds what has been appended
+# into an index checkpoint (each assessment's latest record and snapshot)
+# next to the log, so opening it only scans the records appended since.
+#
+# Several processes can append to one log: each append holds an exclusive
+# flock on the file and first indexes whatever other processes appended, so
+# the chain stays linear. Where fcntl is unavailable (Windows) only one
+# process may write to a log at a time.
+
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Hash "before" the first record
+GENESIS = "0" * 64
+
+ANSWER = "answer"
+SNAPSHOT = "snapshot"
+
+
+def _encode(body: Mapping[str, Any]) -> bytes:
+    return json.dumps(body, separators=(",", ":"), sort_keys=True).encode()
+
+
+def _seal(body: Dict[str, Any]) -> bytes:
+    """The record line for `body`, with the hash of its canonical form added"""
+    body["hash"] = hashlib.sha256(_encode(body)).hexdigest()
+    return _encode(body) + b"\n"
+
+
+def _read_record(f, offset: int) -> Dict[str, Any]:
+    f.seek(offset)
+    return json.loads(f.readline())
+
+
+def _read_checkpoint(path: str) -> Optional[Dict[str, Any]]:
+    """The index checkpoint at `path`, None if there is none or it is unreadable"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class AuditLog:
+    """Append-only, hash-chained log of gateway answer changes per assessment
+
+    `read_only` opens the log for state and history alone (e.g. while the
+    app is writing to it): nothing is appended, truncated or checkpointed.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        sync_every: int = 100,
+        sync_interval: float = 1.0,
+        snapshot_every: int = 50,
+        compact_every: int = 10000,
+        read_only: bool = False,
+    ):
+        self.path = path
+        self.read_only = read_only
+        self.index_path = path + ".index"
+        self.sync_every = sync_every
+        self.snapshot_every = snapshot_every
+        self.compact_every = compact_every
+        # assessment id -> [offset of its latest record, offset of its latest
+        # snapshot or None, changes recorded since that snapshot]
+        self._assessments: Dict[str, List] = {}
+        self._seq = 0
+        self._head = GENESIS
+        self._last_offset: Optional[int] = None
+        self._unsynced = 0
+        self._since_compact = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+        self._file = open(path, "rb" if read_only else "ab")
+        self._reader = open(path, "rb")
+        self._offset = 0
+        try:
+            with self._file_lock():
+                self._load()
+        except ValueError:
+            self._file.close()
+            self._reader.close()
+            raise
+        if not read_only:
+            threading.Thread(
+                target=self._sync_every, args=(sync_interval,), daemon=True
+            ).start()
+
+    # Writes
+
+    def record(
+        self,
+        assessment_id: str,
+        key: str,
+        previous: Optional[str],
+        value: Optional[str],
+        answers: Mapping[str, str],
+    ) -> None:
+        """Append one answer change; `answers` is the state after it"""
+        with self._lock, self._writing():
+            self._append(
+                assessment_id,
+                {"type": ANSWER, "key": key, "from": previous, "to": value},
+            )
+            entry = self._assessments[assessment_id]
+            entry[2] += 1
+            if entry[2] >= self.snapshot_every:
+                self._append_snapshot(assessment_id, answers)
+
+    def snapshot(self, assessment_id: str, answers: Mapping[str, str]) -> None:
+        """Append the full answers of an assessment, e.g. one resumed from a link"""
+        with self._lock, self._writing():
+            self._append_snapshot(assessment_id, answers)
+
+    def _append_snapshot(self, assessment_id: str, answers: Mapping[str, str]):
+        offset = self._append(
+            assessment_id, {"type": SNAPSHOT, "answers": dict(answers)}
+        )
+        entry = self._assessments[assessment_id]
+        entry[1] = offset
+        entry[2] = 0
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Exclusive lock on the log file against other writing processes"""
+        if fcntl is None or self.read_only:
+            yield
+            return
+        fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    @contextmanager
+    def _writing(self) -> Iterator[None]:
+        """Append at the true end of the log (lock held)
+
+        Indexes the records other processes appended since this one last
+        wrote, and writes everything out before releasing the file lock.
+        """
+        if self.read_only:
+            raise ValueError(f"{self.path} is open read-only")
+        with self._file_lock():
+            if os.fstat(self._file.fileno()).st_size > self._offset:
+                self._scan(self._offset)
+            try:
+                yield
+            finally:
+                self._file.flush()
+
+    def _append(self, assessment_id: str, fields: Dict[str, Any]) -> int:
+        """Write one sealed record and return its offset (both locks held)"""
+        entry = self._assessments.get(assessment_id)
+        if entry is None:
+            entry = self._assessments[assessment_id] = [None, None, 0]
+        self._seq += 1
+        body = {
+            "seq": self._seq,
+            "assessment": assessment_id,
+            "at": datetime.now().isoformat(),
+            "back": entry[0],
+            "prev": self._head,
+            **fields,
+        }
+        line = _seal(body)
+        offset = self._offset
+        self._file.write(line)
+        self._offset += len(line)
+        self._head = body["hash"]
+        self._last_offset = offset
+        entry[0] = offset
+
+        self._unsynced += 1
+        self._since_compact += 1
+        if self._unsynced >= self.sync_every:
+            self._sync()
+        return offset
+
+    def _sync(self) -> None:
+        """Flush and fsync everything written so far (lock held)"""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._unsynced and not self.read_only:
+                self._sync()
+
+    def _sync_every(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            self.flush()
+            if self._since_compact >= self.compact_every:
+                self.compact()
+
+    def close(self) -> None:
+        self._stop.set()
+        self.compact()
+        with self._lock:
+            self._file.close()
+            self._reader.close()
+
+    def __enter__(self) -> "AuditLog":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # Reads
+
+    def _records_back(self, assessment_id: str) -> Iterator[Dict[str, Any]]:
+        """An assessment's records, newest first (lock held)"""
+        entry = self._assessments.get(assessment_id)
+        offset = entry[0] if entry else None
+        if not self.read_only:
+            self._file.flush()
+        while offset is not None:
+            record = _read_record(self._reader, offset)
+            yield record
+            offset = record["back"]
+
+    def state(self, assessment_id: str) -> Dict[str, str]:
+        """Current answers, from the latest snapshot and the changes after it"""
+        changes = []
+        answers: Dict[str, str] = {}
+        with self._lock:
+            for record in self._records_back(assessment_id):
+                if record["type"] == SNAPSHOT:
+                    answers = dict(record["answers"])
+                    break
+                changes.append(record)
+        for change in reversed(changes):
+            _apply(answers, change)
+        return answers
+
+    def history(
+        self, assessment_id: str, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """An assessment's records, oldest first (the latest `limit` if given)"""
+        records = []
+        with self._lock:
+            for record in self._records_back(assessment_id):
+                if limit is not None and len(records) >= limit:
+                    break
+                records.append(record)
+        records.reverse()
+        return records
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "records": self._seq,
+                "assessments": len(self._assessments),
+                "head": self._head,
+                "bytes": self._offset,
+            }
+
+    # Index checkpoint
+
+    def compact(self) -> None:
+        """Checkpoint the index so the next open skips everything so far"""
+        with self._lock:
+            if self._file.closed or self.read_only:
+                return
+            self._sync()
+            checkpoint = {
+                "offset": self._offset,
+                "last_offset": self._last_offset,
+                "seq": self._seq,
+                "head": self._head,
+                "assessments": self._assessments,
+            }
+            data = json.dumps(checkpoint, separators=(",", ":"))
+            self._since_compact = 0
+        # Per process, as other writers may compact at the same time
+        temporary = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(temporary, "w") as f:
+            f.write(data)
+        os.replace(temporary, self.index_path)
+
+    def _load(self) -> None:
+        """Restore the index from the checkpoint and scan the log after it"""
+        start = base_seq = 0
+        checkpoint = _read_checkpoint(self.index_path)
+        # Measured after reading the checkpoint: everything it covers was
+        # synced before it was written, by this or another process
+        self._offset = os.fstat(self._reader.fileno()).st_size
+        if checkpoint and self._checkpoint_matches(checkpoint):
+            start = checkpoint["offset"]
+            base_seq = self._seq = checkpoint["seq"]
+            self._head = checkpoint["head"]
+            self._last_offset = checkpoint["last_offset"]
+            self._assessments = checkpoint["assessments"]
+        elif checkpoint and not self.read_only:
+            # Only possible if records the checkpoint covers were removed or
+            # rewritten; appending would chain onto the altered log
+            raise ValueError(
+                f"{self.path} does not reach its index checkpoint; "
+                "check it with `itra-gateway audit`"
+            )
+        self._scan(start)
+        self._since_compact = self._seq - base_seq
+
+    def _scan(self, start: int) -> None:
+        """Index the records from `start` to the end of the log"""
+        offset = start
+        self._reader.seek(start)
+        for line in self._reader:
+            if not line.endswith(b"\n"):
+                # A record torn by a crash mid-write was never synced: drop
+                # it (a reader just stops, the writer may still finish it)
+                if not self.read_only:
+                    os.truncate(self.path, offset)
+                break
+            record = json.loads(line)
+            entry = self._assessments.get(record["assessment"])
+            if entry is None:
+                entry = self._assessments[record["assessment"]] = [None, None, 0]
+            entry[0] = offset
+            if record["type"] == SNAPSHOT:
+                entry[1] = offset
+                entry[2] = 0
+            else:
+                entry[2] += 1
+            self._seq = record["seq"]
+            self._head = record["hash"]
+            self._last_offset = offset
+            offset += len(line)
+        self._offset = offset
+
+    def _checkpoint_matches(self, checkpoint: Mapping[str, Any]) -> bool:
+        """Whether the checkpoint describes a prefix of this log"""
+        if checkpoint["offset"] > self._offset:
+            return False
+        if checkpoint["last_offset"] is None:
+            return checkpoint["offset"] == 0
+        try:
+            record = _read_record(self._reader, checkpoint["last_offset"])
+        except ValueError:
+            return False
+        return record.get("hash") == checkpoint["head"]
+
+
+def _apply(answers: Dict[str, str], change: Mapping[str, Any]) -> None:
+    if change["to"] is None:
+        answers.pop(change["key"], None)
+    else:
+        answers[change["key"]] = change["to"]
+
+
+# Verification
+
+
+@dataclass
+class VerifyResult:
+    records: int
+    assessments: int
+    head: str
+    # (line number, problem) for the first broken record, None if intact;
+    # line 0 when the index checkpoint itself is unreadable
+    error: Optional[Tuple[int, str]] = None
+    # Records covered by the index checkpoint, None without one
+    checkpoint: Optional[int] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def verify(path: str) -> VerifyResult:
+    """Check the whole chain, back offsets and snapshots in one streaming pass
+
+    The log must also reach the index checkpoint next to it: its last
+    record is the checkpoint's head, at the checkpoint's offset and count,
+    so records dropped from the end up to the last compaction are caught.
+    """
+    head = GENESIS
+    seq = 0
+    offset = 0
+    # assessment id -> (offset of its latest record, answers replayed so far)
+    assessments: Dict[str, Tuple[int, Dict[str, str]]] = {}
+    checkpoint = None
+    if os.path.exists(path + ".index"):
+        checkpoint = _read_checkpoint(path + ".index")
+        if not isinstance(checkpoint, dict) or not isinstance(
+            checkpoint.get("seq"), int
+        ):
+            return VerifyResult(0, 0, head, (0, "index checkpoint is unreadable"))
+
+    def result(error: Optional[str] = None) -> VerifyResult:
+        return VerifyResult(
+            seq,
+            len(assessments),
+            head,
+            (seq + 1, error) if error else None,
+            checkpoint and checkpoint["seq"],
+        )
+
+    with open(path, "rb") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+                claimed = record.pop("hash")
+            except (ValueError, KeyError, AttributeError):
+                return result("not a sealed record")
+            if hashlib.sha256(_encode(record)).hexdigest() != claimed:
+                return result("hash does not match the record")
+            if record.get("prev") != head:
+                return result("previous hash does not match the chain")
+            if record.get("seq") != seq + 1:
+                return result(f"expected seq {seq + 1}, got {record.get('seq')}")
+
+            latest, answers = assessments.get(record.get("assessment"), (None, {}))
+            if record.get("back") != latest:
+                return result("back offset skips a record of this assessment")
+            if record.get("type") == SNAPSHOT:
+                if latest is not None and record.get("answers") != answers:
+                    return result("snapshot does not match the replayed answers")
+                answers = dict(record.get("answers") or {})
+            elif record.get("type") == ANSWER:
+                if answers.get(record.get("key")) != record.get("from"):
+                    return result("change does not start from the current answer")
+                _apply(answers, record)
+            else:
+                return result(f"unknown record type {record.get('type')!r}")
+
+            if checkpoint and record["seq"] == checkpoint["seq"]:
+                if (claimed, offset, offset + len(line)) != (
+                    checkpoint.get("head"),
+                    checkpoint.get("last_offset"),
+                    checkpoint.get("offset"),
+                ):
+                    return result("record does not match the index checkpoint")
+
+            assessments[record["assessment"]] = (offset, answers)
+            head = claimed
+            seq += 1
+            offset += len(line)
+
+    if checkpoint and seq < checkpoint["seq"]:
+        return result(
+            f"log ends after {seq} records, the index checkpoint has "
+            f"{checkpoint['seq']}: records were removed from the end"
+        )
+    return result()
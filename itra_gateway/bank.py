@@ -0,0 +1,194 @@
+# ITRA follow-up question bank (no Streamlit required)
+#
+# question_bank/index.toml lists the sections of the full assessment, each
+# tied to an assessment path and optionally an asset type. Only the index is
+# read at startup; a section file is parsed the first time an assessment
+# reaches it (or when it is prefetched in the background, one section ahead)
+# and kept in a small LRU shared by every session, so startup time and
+# memory do not grow with the size of the bank.
+
+import os
+import threading
+import tomllib
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import product
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from itra_gateway.engine import (
+    ANSWER_DOMAINS,
+    GATEWAY_KEYS,
+    PATH_NAMES,
+    Scope,
+    calculate_assessment_paths,
+)
+
+BANK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "question_bank")
+
+
+@dataclass(frozen=True)
+class FollowUpQuestion:
+    id: str
+    text: str
+    options: Tuple[str, ...]
+    # Gateway answers this question requires, e.g. (("D.1", "Yes"),)
+    when: Tuple[Tuple[str, str], ...] = ()
+
+    def applies(self, answers: Mapping[str, str]) -> bool:
+        return all(answers.get(key) == value for key, value in self.when)
+
+
+@dataclass(frozen=True)
+class Section:
+    """Index entry for one section file"""
+
+    path: str
+    title: str
+    file: str
+    asset_type: Optional[str] = None
+
+
+def _required(table: Mapping[str, Any], field: str, where: str) -> Any:
+    if field not in table:
+        raise ValueError(f"{where}: missing {field!r}")
+    return table[field]
+
+
+def _compile_section(
+    data: Mapping[str, Any], scales: Mapping[str, Tuple[str, ...]], where: str
+) -> Tuple[FollowUpQuestion, ...]:
+    default_scale = data.get("scale")
+    questions = []
+    for index, raw in enumerate(data.get("questions", [])):
+        question_id = _required(raw, "id", f"{where} questions[{index}]")
+        at = f"{where} {question_id}"
+        scale = raw.get("scale", default_scale)
+        if scale not in scales:
+            raise ValueError(f"{at}: unknown scale {scale!r}")
+        when = tuple(raw.get("when", {}).items())
+        for key, value in when:
+            if value not in ANSWER_DOMAINS.get(key, ()):
+                raise ValueError(f"{at}: {key}={value!r} is not a gateway answer")
+        questions.append(
+            FollowUpQuestion(
+                question_id, _required(raw, "text", at), scales[scale], when
+            )
+        )
+    ids = [question.id for question in questions]
+    if len(set(ids)) != len(ids):
+        raise ValueError(f"{where}: duplicate question id")
+    return tuple(questions)
+
+
+class QuestionBank:
+    """Section index with lazily loaded, LRU-cached section files"""
+
+    def __init__(self, directory: str = BANK_DIR, max_loaded: int = 16):
+        self.directory = directory
+        self.max_loaded = max_loaded
+        with open(os.path.join(directory, "index.toml"), "rb") as f:
+            index = tomllib.load(f)
+
+        self.scales = MappingProxyType(
+            {name: tuple(options) for name, options in index["scales"].items()}
+        )
+        sections = []
+        for position, raw in enumerate(index.get("sections", [])):
+            where = f"sections[{position}]"
+            section = Section(
+                path=_required(raw, "path", where),
+                title=_required(raw, "title", where),
+                file=_required(raw, "file", where),
+                asset_type=raw.get("asset_type"),
+            )
+            if section.path not in PATH_NAMES:
+                raise ValueError(f"{where}: unknown assessment path {section.path!r}")
+            if section.asset_type not in (None,) + ANSWER_DOMAINS["asset_type"]:
+                raise ValueError(f"{where}: unknown asset type {section.asset_type!r}")
+            sections.append(section)
+        self.sections = tuple(sections)
+
+        self._loaded: "OrderedDict[str, Tuple[FollowUpQuestion, ...]]" = OrderedDict()
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._prefetcher: Optional[ThreadPoolExecutor] = None
+
+    def sections_for(self, scope: Scope, asset_type: Optional[str]) -> List[Section]:
+        """Sections of the enabled paths that apply to the asset type"""
+        enabled = {path.name for path in scope if path.enabled}
+        return [
+            section
+            for section in self.sections
+            if section.path in enabled and section.asset_type in (None, asset_type)
+        ]
+
+    def questions(
+        self, section: Section, answers: Mapping[str, str]
+    ) -> Tuple[FollowUpQuestion, ...]:
+        """A section's questions that apply to the gateway answers"""
+        return tuple(q for q in self._section(section) if q.applies(answers))
+
+    def prefetch(self, section: Section) -> None:
+        """Load a section file in the background if it is not loaded yet"""
+        with self._lock:
+            if section.file in self._loaded or section.file in self._pending:
+                return
+            if self._prefetcher is None:
+                self._prefetcher = ThreadPoolExecutor(1, thread_name_prefix="itra-bank")
+            self._pending[section.file] = self._prefetcher.submit(
+                self._load, section.file
+            )
+
+    def loaded(self) -> Tuple[str, ...]:
+        """Section files currently held in memory, least recently used first"""
+        with self._lock:
+            return tuple(self._loaded)
+
+    def _section(self, section: Section) -> Tuple[FollowUpQuestion, ...]:
+        with self._lock:
+            questions = self._loaded.get(section.file)
+            if questions is not None:
+                self._loaded.move_to_end(section.file)
+                return questions
+            pending = self._pending.get(section.file)
+        if pending is not None:
+            return pending.result()
+        return self._load(section.file)
+
+    def _load(self, file: str) -> Tuple[FollowUpQuestion, ...]:
+        try:
+            with open(os.path.join(self.directory, file), "rb") as f:
+                questions = _compile_section(tomllib.load(f), self.scales, file)
+            with self._lock:
+                self._loaded[file] = questions
+                self._loaded.move_to_end(file)
+                while len(self._loaded) > self.max_loaded:
+                    self._loaded.popitem(last=False)
+            return questions
+        finally:
+            with self._lock:
+                self._pending.pop(file, None)
+
+
+def verify_question_counts(bank: QuestionBank) -> None:
+    """Check the bank against every path's question count in the engine"""
+    for values in product(*(ANSWER_DOMAINS[key] for key in GATEWAY_KEYS)):
+        answers = dict(zip(GATEWAY_KEYS, values))
+        scope = calculate_assessment_paths(answers)
+        counts: Dict[str, int] = {}
+        for section in bank.sections_for(scope, answers["asset_type"]):
+            counts[section.path] = counts.get(section.path, 0) + len(
+                bank.questions(section, answers)
+            )
+        for path in scope:
+            if path.enabled and counts.get(path.name, 0) != path.question_count:
+                raise AssertionError(
+                    f"{path.name}: bank has {counts.get(path.name, 0)} questions, "
+                    f"engine expects {path.question_count} (answers: {answers})"
+                )
+
+
+# Index only; section files load on demand
+BANK = QuestionBank()
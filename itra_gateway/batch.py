@@ -0,0 +1,124 @@
+# ITRA bulk scoping (no Streamlit required)
+#
+# Streams gateway answers from JSONL or CSV, scopes them with the shared
+# engine and yields the export_configuration document for each row as one
+# NDJSON line. Rows are processed in fixed-size chunks and only a bounded
+# number of chunks is ever in flight, so memory stays constant no matter how
+# large the inventory is.
+
+import csv
+import json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import chain, islice
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from itra_gateway.engine import GATEWAY_KEYS
+from itra_gateway.export import parse_start_time, serialize_configuration
+
+# (gateway answers, ISO start time or None)
+AnswerRow = Tuple[Dict[str, str], Optional[str]]
+
+
+def _answers_from_record(record: Dict) -> AnswerRow:
+    """Pull gateway answers and start time out of one input record"""
+    # Previously exported documents can be fed straight back in
+    if "gateway_answers" in record:
+        answers = record["gateway_answers"]
+        if not isinstance(answers, dict):
+            raise ValueError("gateway_answers must be an object")
+        metadata = record.get("assessment_metadata") or {}
+        return _answer_values(answers, answers), metadata.get("start_time")
+    return _answer_values(record, GATEWAY_KEYS), record.get("start_time") or None
+
+
+def _answer_values(record: Dict, keys: Iterable[str]) -> Dict[str, str]:
+    """Answers as strings, like a CSV cell, leaving out blank ones"""
+    return {key: str(record[key]) for key in keys if record.get(key) not in (None, "")}
+
+
+def _read_jsonl(lines: Iterable[str]) -> Iterator[AnswerRow]:
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as error:
+            raise ValueError(f"line {line_number}: invalid JSON ({error})") from None
+        if not isinstance(record, dict):
+            raise ValueError(f"line {line_number}: expected a JSON object")
+        try:
+            row = _answers_from_record(record)
+        except ValueError as error:
+            raise ValueError(f"line {line_number}: {error}") from None
+        yield row
+
+
+def _read_csv(lines: Iterable[str]) -> Iterator[AnswerRow]:
+    for record in csv.DictReader(lines):
+        yield _answers_from_record(record)
+
+
+def detect_format(stream: TextIO) -> Tuple[str, Iterable[str]]:
+    """Sniff JSONL vs CSV from the first non-blank line"""
+    for line in stream:
+        if line.strip():
+            fmt = "jsonl" if line.lstrip().startswith("{") else "csv"
+            return fmt, chain([line], stream)
+    return "jsonl", iter(())
+
+
+def read_answer_rows(stream: TextIO, fmt: Optional[str] = None) -> Iterator[AnswerRow]:
+    """Lazily parse gateway answer rows from a JSONL or CSV stream"""
+    lines: Iterable[str] = stream
+    if fmt is None:
+        fmt, lines = detect_format(stream)
+    if fmt == "jsonl":
+        return _read_jsonl(lines)
+    if fmt == "csv":
+        return _read_csv(lines)
+    raise ValueError(f"unknown input format: {fmt!r}")
+
+
+def scope_row(answers: Dict[str, str], start_time: Optional[str] = None) -> str:
+    """Scope one answer set and serialize its configuration as an NDJSON line"""
+    now = datetime.now()
+    started = parse_start_time(start_time) if start_time else now
+    return serialize_configuration(answers, started, now=now, compact=True)
+
+
+def _scope_chunk(chunk: List[AnswerRow]) -> List[str]:
+    return [scope_row(answers, start_time) for answers, start_time in chunk]
+
+
+def _chunks(rows: Iterable[AnswerRow], size: int) -> Iterator[List[AnswerRow]]:
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def scope_rows(
+    rows: Iterable[AnswerRow], workers: int = 1, chunk_size: int = 1000
+) -> Iterator[str]:
+    """Scope answer rows in input order, optionally across a process pool"""
+    chunks = _chunks(rows, chunk_size)
+
+    if workers <= 1:
+        for chunk in chunks:
+            yield from _scope_chunk(chunk)
+        return
+
+    # Keep a small window of chunks in flight so input is never read ahead
+    # of what the workers can absorb
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_scope_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
@@ -0,0 +1,192 @@
+# ITRA gateway question catalog (no Streamlit required)
+#
+# The question text, options and display mappings live in questions.toml.
+# The file is parsed, checked against the scoping engine and compiled into
+# immutable lookup tables once per process; every session shares CATALOG.
+
+import os
+import tomllib
+from dataclasses import dataclass
+from hashlib import blake2b
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from itra_gateway.engine import ANSWER_DOMAINS, GATEWAY_KEYS
+
+CATALOG_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "questions.toml"
+)
+
+
+@dataclass(frozen=True)
+class Option:
+    text: str  # shown on the radio button
+    value: str  # internal answer value used by the scoping rules
+    summary: str  # shown in the assessment summary
+
+
+@dataclass(frozen=True)
+class Question:
+    key: str
+    phase: str
+    title: str
+    label: str
+    summary_label: str
+    help_title: str
+    help: str
+    options: Tuple[Option, ...]
+    horizontal: bool = False
+    echo_selection: bool = False
+
+    @property
+    def texts(self) -> List[str]:
+        return [option.text for option in self.options]
+
+    @property
+    def widget_key(self) -> str:
+        return f"{self.key}_display"
+
+
+@dataclass(frozen=True)
+class Phase:
+    key: str
+    header: str
+    questions: Tuple[Question, ...]
+
+    @property
+    def keys(self) -> Tuple[str, ...]:
+        return tuple(question.key for question in self.questions)
+
+
+class Catalog:
+    """Compiled question catalog with forward and reverse option maps"""
+
+    def __init__(self, phases: Tuple[Phase, ...]):
+        self.phases = phases
+        # Changes whenever any question text, option or label changes
+        self.fingerprint = blake2b(repr(phases).encode(), digest_size=8).hexdigest()
+        self.questions = MappingProxyType(
+            {q.key: q for phase in phases for q in phase.questions}
+        )
+        # Radio text -> internal value, per question
+        self.text_to_value = MappingProxyType(
+            {
+                key: MappingProxyType({o.text: o.value for o in q.options})
+                for key, q in self.questions.items()
+            }
+        )
+        # Internal value -> summary text and -> first radio option index
+        self.value_to_summary = MappingProxyType(
+            {
+                key: MappingProxyType({o.value: o.summary for o in reversed(q.options)})
+                for key, q in self.questions.items()
+            }
+        )
+        self.value_to_index = MappingProxyType(
+            {
+                key: MappingProxyType(
+                    {o.value: i for i, o in reversed(list(enumerate(q.options)))}
+                )
+                for key, q in self.questions.items()
+            }
+        )
+
+    def answer(self, key: str, text: str) -> str:
+        """Internal answer value for a selected radio option"""
+        return self.text_to_value[key][text]
+
+    def summary(self, key: str, value: str) -> str:
+        """Summary text for an internal answer value"""
+        return self.value_to_summary.get(key, {}).get(value, value)
+
+    def label(self, key: str) -> str:
+        question = self.questions.get(key)
+        return question.summary_label if question else key
+
+
+def _required(table: Mapping[str, Any], field: str, where: str) -> Any:
+    if field not in table:
+        raise ValueError(f"{where}: missing {field!r}")
+    return table[field]
+
+
+def _compile_question(raw: Mapping[str, Any], index: int) -> Question:
+    where = f"questions[{index}]"
+    key = _required(raw, "key", where)
+    where = f"question {key!r}"
+    if key not in ANSWER_DOMAINS:
+        raise ValueError(f"{where}: not a gateway question")
+
+    options = []
+    for raw_option in _required(raw, "options", where):
+        option = Option(
+            text=_required(raw_option, "text", where),
+            value=_required(raw_option, "value", where),
+            summary=_required(raw_option, "summary", where),
+        )
+        if option.value not in ANSWER_DOMAINS[key]:
+            raise ValueError(f"{where}: {option.value!r} is not a valid answer")
+        options.append(option)
+
+    texts = [option.text for option in options]
+    if len(set(texts)) != len(texts):
+        raise ValueError(f"{where}: duplicate option text")
+    missing = set(ANSWER_DOMAINS[key]) - {option.value for option in options}
+    if missing:
+        raise ValueError(f"{where}: no option for {sorted(missing)}")
+    summaries: Dict[str, str] = {}
+    for option in options:
+        if summaries.setdefault(option.value, option.summary) != option.summary:
+            raise ValueError(f"{where}: {option.value!r} has two summaries")
+
+    return Question(
+        key=key,
+        phase=_required(raw, "phase", where),
+        title=_required(raw, "title", where),
+        label=_required(raw, "label", where),
+        summary_label=_required(raw, "summary_label", where),
+        help_title=_required(raw, "help_title", where),
+        help=_required(raw, "help", where).strip(),
+        options=tuple(options),
+        horizontal=raw.get("horizontal", False),
+        echo_selection=raw.get("echo_selection", False),
+    )
+
+
+def compile_catalog(data: Mapping[str, Any]) -> Catalog:
+    """Validate a parsed catalog against the scoping engine and compile it"""
+    questions = [
+        _compile_question(raw, index)
+        for index, raw in enumerate(data.get("questions", []))
+    ]
+    keys = [question.key for question in questions]
+    if sorted(keys) != sorted(GATEWAY_KEYS):
+        raise ValueError(f"catalog must define each gateway question once, got {keys}")
+
+    phases = []
+    for index, raw in enumerate(data.get("phases", [])):
+        phase_key = _required(raw, "key", f"phases[{index}]")
+        phase_questions = tuple(q for q in questions if q.phase == phase_key)
+        if not phase_questions:
+            raise ValueError(f"phase {phase_key!r} has no questions")
+        phases.append(
+            Phase(phase_key, _required(raw, "header", phase_key), phase_questions)
+        )
+
+    known = {phase.key for phase in phases}
+    for question in questions:
+        if question.phase not in known:
+            raise ValueError(
+                f"question {question.key!r}: unknown phase {question.phase!r}"
+            )
+    return Catalog(tuple(phases))
+
+
+def load_catalog(path: Optional[str] = None) -> Catalog:
+    """Parse and compile a TOML question catalog"""
+    with open(path or CATALOG_PATH, "rb") as f:
+        return compile_catalog(tomllib.load(f))
+
+
+# Compiled once at import and shared by every session
+CATALOG = load_catalog()
@@ -0,0 +1,533 @@
+# ITRA Gateway command line
+# Run with: uv run itra-gateway scope inventory.csv -o scoped.ndjson
+#
+# Installed as the `itra-gateway` console command. Commands import what they
+# need when they run, so startup (and --help) stays at a few milliseconds
+# over the bare interpreter, and only `itra-gateway ui` loads Streamlit.
+# Streamlit is the optional `ui` extra: uv run --extra ui itra-gateway ui
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from itra_gateway.formats import EXPORT_FORMATS, INPUT_FORMATS, REPORT_FORMATS
+
+
+def _saving(lines: Iterable[str], db_path: str) -> Iterator[str]:
+    """Pass NDJSON lines through while storing them in batches"""
+    from itra_gateway.store import AssessmentStore
+
+    with AssessmentStore(db_path) as store:
+        batch = []
+        for line in lines:
+            batch.append(json.loads(line))
+            if len(batch) >= store.batch_size:
+                store.save_many(batch)
+                batch = []
+            yield line
+        store.save_many(batch)
+
+
+def cmd_scope(args: argparse.Namespace) -> int:
+    """Stream gateway answers through the scoping engine as NDJSON"""
+    from itra_gateway.batch import read_answer_rows, scope_rows
+
+    fmt = args.format
+    if fmt is None and args.input != "-":
+        extension = os.path.splitext(args.input)[1].lower()
+        fmt = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}.get(extension)
+
+    started = time.perf_counter()
+    count = 0
+    source = target = None
+    try:
+        source = sys.stdin if args.input == "-" else open(args.input, newline="")
+        target = sys.stdout if args.output == "-" else open(args.output, "w")
+        rows = read_answer_rows(source, fmt)
+        lines = scope_rows(rows, workers=args.workers, chunk_size=args.chunk_size)
+        if args.db:
+            lines = _saving(lines, args.db)
+        for line in lines:
+            target.write(line)
+            target.write("\n")
+            count += 1
+    except (OSError, ValueError) as error:
+        # A missing or unreadable file is reported like a bad row
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+    finally:
+        if source not in (None, sys.stdin):
+            source.close()
+        if target is sys.stdout:
+            target.flush()
+        elif target is not None:
+            target.close()
+
+    elapsed = time.perf_counter() - started
+    rate = count / elapsed if elapsed > 0 else 0.0
+    print(
+        f"Scoped {count} rows in {elapsed:.2f}s ({rate:,.0f} rows/sec)",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def _answer_filter(pairs: List[str]) -> Dict[str, str]:
+    answers = {}
+    for pair in pairs:
+        key, sep, value = pair.partition("=")
+        if not sep:
+            raise ValueError(f"expected KEY=VALUE, got {pair!r}")
+        answers[key] = value
+    return answers
+
+
+def cmd_export(args: argparse.Namespace) -> int:
+    """Stream stored assessments as NDJSON or CSV"""
+    from itra_gateway.export import export_stored
+    from itra_gateway.store import AssessmentStore
+
+    if not os.path.exists(args.db):
+        print(f"error: no database at {args.db}", file=sys.stderr)
+        return 1
+
+    target = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+    count = 0
+    try:
+        with AssessmentStore(args.db) as store:
+            assessments = store.find(
+                _answer_filter(args.answer), args.path, limit=args.limit
+            )
+            for line in export_stored(assessments, args.format):
+                target.write(line)
+                count += 1
+    except ValueError as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+    finally:
+        if target is not sys.stdout:
+            target.close()
+        else:
+            target.flush()
+
+    if args.format == "csv":
+        count -= 1  # header
+    print(f"Exported {max(count, 0)} assessments", file=sys.stderr)
+    return 0
+
+
+def cmd_sync(args: argparse.Namespace) -> int:
+    """Push stored assessments to ServiceNow IRM"""
+    from itra_gateway.export import export_stored
+    from itra_gateway.store import AssessmentStore
+    from itra_gateway.sync import IRMClient, IRMSync
+
+    if not os.path.exists(args.db):
+        print(f"error: no database at {args.db}", file=sys.stderr)
+        return 1
+    token = os.environ.get("ITRA_IRM_TOKEN")
+    client = IRMClient(
+        args.url,
+        headers={"Authorization": f"Bearer {token}"} if token else None,
+        pool_size=args.concurrency,
+    )
+    sync = IRMSync(
+        client,
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+        spool_path=args.spool,
+    )
+
+    started = time.perf_counter()
+    count = 0
+    try:
+        with AssessmentStore(args.db) as store:
+            assessments = store.find(
+                _answer_filter(args.answer), args.path, limit=args.limit
+            )
+            for line in export_stored(assessments):
+                sync.submit(json.loads(line), block=True)
+                count += 1
+    except ValueError as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+    finally:
+        sync.close()
+
+    outcomes = sync.stats()
+    elapsed = time.perf_counter() - started
+    if sync.requeued:
+        print(f"Resent {sync.requeued} assessments from {args.spool}", file=sys.stderr)
+    print(
+        f"Synced {outcomes['sent']} of {count + sync.requeued} assessments in "
+        f"{elapsed:.2f}s ({outcomes['failed']} failed)",
+        file=sys.stderr,
+    )
+    return 1 if outcomes["failed"] else 0
+
+
+def cmd_whatif(args: argparse.Namespace) -> int:
+    """Rescore stored assessments under candidate rules and report the deltas"""
+    from itra_gateway.engine import RULES, load_rules
+    from itra_gateway.store import AssessmentStore
+    from itra_gateway.whatif import format_report, rescore
+
+    if not os.path.exists(args.db):
+        print(f"error: no database at {args.db}", file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    try:
+        candidate = load_rules(args.rules)
+        baseline = load_rules(args.baseline) if args.baseline else RULES
+        with AssessmentStore(args.db) as store:
+            profiles = store.profile_counts(_answer_filter(args.answer), args.path)
+            report = rescore(profiles, candidate, baseline, store.assessment_ids)
+    except (OSError, ValueError) as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        json.dump(report.to_dict(), sys.stdout, indent=2)
+        print()
+    else:
+        for line in format_report(report):
+            print(line)
+    elapsed = time.perf_counter() - started
+    print(
+        f"Rescored {report.total.assessments_before} assessments "
+        f"({len(profiles)} answer profiles) in {elapsed:.2f}s",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def cmd_audit(args: argparse.Namespace) -> int:
+    """Verify the audit log's hash chain, or show one assessment's trail"""
+    from itra_gateway.audit import AuditLog, verify
+
+    if not os.path.exists(args.log):
+        print(f"error: no audit log at {args.log}", file=sys.stderr)
+        return 1
+
+    if args.assessment:
+        with AuditLog(args.log, read_only=True) as log:
+            for record in log.history(args.assessment, limit=args.limit):
+                print(json.dumps(record))
+            answers = log.state(args.assessment)
+        print(f"Current answers: {json.dumps(answers)}", file=sys.stderr)
+        return 0
+
+    started = time.perf_counter()
+    result = verify(args.log)
+    elapsed = time.perf_counter() - started
+    if not result.ok:
+        line, problem = result.error
+        where = f"line {line}" if line else f"{args.log}.index"
+        print(f"error: {where}: {problem}", file=sys.stderr)
+        return 1
+    checkpoint = (
+        "no index checkpoint"
+        if result.checkpoint is None
+        else f"index checkpoint at record {result.checkpoint}"
+    )
+    print(
+        f"Verified {result.records} records of {result.assessments} assessments "
+        f"in {elapsed:.2f}s (head {result.head}, {checkpoint})",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def cmd_report(args: argparse.Namespace) -> int:
+    """Render printable reports of stored assessments into a directory or zip"""
+    from itra_gateway.report import render_reports, write_reports
+    from itra_gateway.store import AssessmentStore
+
+    if not os.path.exists(args.db):
+        print(f"error: no database at {args.db}", file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    try:
+        with AssessmentStore(args.db) as store:
+            assessments = store.find(
+                _answer_filter(args.answer), args.path, limit=args.limit
+            )
+            reports = render_reports(
+                assessments,
+                tuple(args.format or REPORT_FORMATS),
+                workers=args.workers,
+                chunk_size=args.chunk_size,
+            )
+            count = write_reports(reports, args.output)
+    except ValueError as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+
+    elapsed = time.perf_counter() - started
+    rate = count / elapsed if elapsed > 0 else 0.0
+    print(
+        f"Wrote {count} report files to {args.output} in {elapsed:.2f}s "
+        f"({rate:,.0f} files/sec)",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def cmd_serve(args: argparse.Namespace) -> int:
+    """Run the HTTP scoping service"""
+    import asyncio
+
+    from itra_gateway.service import serve
+
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def cmd_ui(args: argparse.Namespace) -> int:
+    """Launch the Streamlit app"""
+    try:
+        from streamlit.web import cli as streamlit_cli
+    except ImportError:
+        print(
+            "error: the UI needs Streamlit (pip install 'itra-gateway-app[ui]')",
+            file=sys.stderr,
+        )
+        return 1
+
+    app = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+    sys.argv = ["streamlit", "run", app, *args.streamlit_args]
+    return streamlit_cli.main()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="itra-gateway", description="IT Risk Assessment gateway tools"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    scope = commands.add_parser(
+        "scope",
+        help="scope gateway answers from JSONL/CSV and write NDJSON configurations",
+    )
+    scope.add_argument(
+        "input", nargs="?", default="-", help="JSONL or CSV file (default: stdin)"
+    )
+    scope.add_argument(
+        "-o", "--output", default="-", help="NDJSON output file (default: stdout)"
+    )
+    scope.add_argument(
+        "-f",
+        "--format",
+        choices=INPUT_FORMATS,
+        help="input format (default: from file extension or sniffed)",
+    )
+    scope.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="worker processes for multi-core runs (default: 1)",
+    )
+    scope.add_argument(
+        "--chunk-size",
+        type=int,
+        default=1000,
+        help="rows handed to a worker at a time (default: 1000)",
+    )
+    scope.add_argument(
+        "--db", help="also store the scoped assessments in this SQLite database"
+    )
+    scope.set_defaults(handler=cmd_scope)
+
+    export = commands.add_parser(
+        "export", help="stream stored assessments as NDJSON or CSV"
+    )
+    export.add_argument("db", help="SQLite database written by scope --db")
+    export.add_argument(
+        "-o", "--output", default="-", help="output file (default: stdout)"
+    )
+    export.add_argument(
+        "-f",
+        "--format",
+        choices=EXPORT_FORMATS,
+        default="ndjson",
+        help="output format (default: ndjson)",
+    )
+    export.add_argument(
+        "--answer",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="only assessments with this gateway answer (repeatable)",
+    )
+    export.add_argument(
+        "--path",
+        action="append",
+        metavar="NAME",
+        help="only assessments with this path enabled (repeatable)",
+    )
+    export.add_argument("--limit", type=int, help="export at most this many")
+    export.set_defaults(handler=cmd_export)
+
+    sync = commands.add_parser("sync", help="push stored assessments to ServiceNow IRM")
+    sync.add_argument("db", help="SQLite database written by scope --db")
+    sync.add_argument(
+        "--url",
+        default=os.environ.get("ITRA_IRM_URL"),
+        required="ITRA_IRM_URL" not in os.environ,
+        help="IRM import set endpoint (default: $ITRA_IRM_URL)",
+    )
+    sync.add_argument(
+        "--answer",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="only assessments with this gateway answer (repeatable)",
+    )
+    sync.add_argument(
+        "--path",
+        action="append",
+        metavar="NAME",
+        help="only assessments with this path enabled (repeatable)",
+    )
+    sync.add_argument("--limit", type=int, help="sync at most this many")
+    sync.add_argument(
+        "--batch-size", type=int, default=100, help="records per request (default: 100)"
+    )
+    sync.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="requests in flight and pooled connections (default: 4)",
+    )
+    sync.add_argument(
+        "--spool",
+        default=os.environ.get("ITRA_IRM_SPOOL_PATH"),
+        metavar="PATH",
+        help="keep batches that still fail here and resend them on the next "
+        "sync (default: $ITRA_IRM_SPOOL_PATH)",
+    )
+    sync.set_defaults(handler=cmd_sync)
+
+    whatif = commands.add_parser(
+        "whatif",
+        help="compare stored assessments' scope under candidate scoping rules",
+    )
+    whatif.add_argument("db", help="SQLite database written by scope --db")
+    whatif.add_argument("rules", help="candidate rules file (see rules.toml)")
+    whatif.add_argument(
+        "--baseline", help="rules file to compare against (default: rules in force)"
+    )
+    whatif.add_argument(
+        "--answer",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="only assessments with this gateway answer (repeatable)",
+    )
+    whatif.add_argument(
+        "--path",
+        action="append",
+        metavar="NAME",
+        help="only assessments with this path enabled (repeatable)",
+    )
+    whatif.add_argument("--json", action="store_true", help="print the report as JSON")
+    whatif.set_defaults(handler=cmd_whatif)
+
+    report = commands.add_parser(
+        "report", help="render printable HTML/PDF reports of stored assessments"
+    )
+    report.add_argument("db", help="SQLite database written by scope --db")
+    report.add_argument(
+        "-o",
+        "--output",
+        required=True,
+        help="directory to write reports into, or a .zip archive",
+    )
+    report.add_argument(
+        "-f",
+        "--format",
+        action="append",
+        choices=REPORT_FORMATS,
+        help="report format, repeatable (default: html and pdf)",
+    )
+    report.add_argument(
+        "--answer",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="only assessments with this gateway answer (repeatable)",
+    )
+    report.add_argument(
+        "--path",
+        action="append",
+        metavar="NAME",
+        help="only assessments with this path enabled (repeatable)",
+    )
+    report.add_argument("--limit", type=int, help="report at most this many")
+    report.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="worker processes for multi-core runs (default: 1)",
+    )
+    report.add_argument(
+        "--chunk-size",
+        type=int,
+        default=200,
+        help="assessments handed to a worker at a time (default: 200)",
+    )
+    report.set_defaults(handler=cmd_report)
+
+    audit = commands.add_parser(
+        "audit",
+        help="verify the answer audit log, or show one assessment's changes",
+    )
+    audit.add_argument("log", help="audit log written with ITRA_AUDIT_PATH")
+    audit.add_argument(
+        "--assessment",
+        metavar="ID",
+        help="print this assessment's records as NDJSON instead of verifying",
+    )
+    audit.add_argument(
+        "--limit", type=int, help="with --assessment, only the latest records"
+    )
+    audit.set_defaults(handler=cmd_audit)
+
+    serve = commands.add_parser("serve", help="run the HTTP scoping service")
+    serve.add_argument("--host", default="127.0.0.1", help="bind address")
+    serve.add_argument("--port", type=int, default=8080, help="listen port")
+    serve.set_defaults(handler=cmd_serve)
+
+    ui = commands.add_parser(
+        "ui",
+        help="run the Streamlit assessment app",
+        description="Run the Streamlit assessment app. Other options are passed "
+        "to `streamlit run`, e.g. --server.port 8502",
+    )
+    ui.set_defaults(handler=cmd_ui)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+    if args.command == "ui":
+        args.streamlit_args = extra
+    elif extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
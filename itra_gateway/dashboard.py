@@ -0,0 +1,120 @@
+# ITRA portfolio dashboard - Streamlit page
+#
+# Reads only the store's materialized rollup (one row per asset type,
+# business impact and path), so the page costs the same with ten stored
+# assessments as with ten million. Filters are applied to those rows here.
+
+import streamlit as st
+from typing import Dict, List, Optional
+
+from itra_gateway.catalog import CATALOG
+from itra_gateway.engine import PATH_NAMES
+from itra_gateway.store import ALL_PATHS, AssessmentStore, RollupRow
+
+ASSET_TYPE = "asset_type"
+IMPACT = "B.13"
+
+
+def _label(key: str, value: str) -> str:
+    return CATALOG.summary(key, value) if value else "Not answered"
+
+
+def _totals(rows: List[RollupRow], field: str) -> Dict[str, List[int]]:
+    """[assessments, questions] of the all-paths rows, grouped by `field`"""
+    totals: Dict[str, List[int]] = {}
+    for row in rows:
+        if row.path == ALL_PATHS:
+            total = totals.setdefault(getattr(row, field), [0, 0])
+            total[0] += row.assessments
+            total[1] += row.questions
+    return totals
+
+
+def _breakdown(rows: List[RollupRow], field: str, key: str) -> List[Dict]:
+    return [
+        {
+            CATALOG.label(key): _label(key, value),
+            "Assessments": assessments,
+            "Follow-up questions": questions,
+        }
+        for value, (assessments, questions) in sorted(
+            _totals(rows, field).items(), key=lambda item: -item[1][0]
+        )
+    ]
+
+
+def render_dashboard(store: Optional[AssessmentStore]):
+    """Portfolio rollup of every stored assessment"""
+    st.title("📈 Portfolio Dashboard")
+    if store is None:
+        st.info("Set ITRA_DB_PATH to keep completed assessments and see them here.")
+        return
+
+    rows = store.rollup()
+    if not rows:
+        st.info("No assessments stored yet.")
+        return
+
+    # Filters
+    asset_types = sorted({row.asset_type for row in rows})
+    impacts = sorted({row.impact for row in rows})
+    left, right = st.columns(2)
+    chosen_types = left.multiselect(
+        CATALOG.label(ASSET_TYPE),
+        asset_types,
+        format_func=lambda value: _label(ASSET_TYPE, value),
+        placeholder="All",
+    )
+    chosen_impacts = right.multiselect(
+        CATALOG.label(IMPACT),
+        impacts,
+        format_func=lambda value: _label(IMPACT, value),
+        placeholder="All",
+    )
+    rows = [
+        row
+        for row in rows
+        if (not chosen_types or row.asset_type in chosen_types)
+        and (not chosen_impacts or row.impact in chosen_impacts)
+    ]
+
+    # Headline numbers
+    assessments = sum(row.assessments for row in rows if row.path == ALL_PATHS)
+    questions = sum(row.questions for row in rows if row.path == ALL_PATHS)
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Assessments", f"{assessments:,}")
+    col2.metric("Follow-up Questions", f"{questions:,}")
+    col3.metric(
+        "Average per Assessment",
+        f"{questions / assessments:.1f}" if assessments else "-",
+    )
+    if not assessments:
+        return
+
+    # Assets triggering each path
+    st.subheader("Assessment Paths")
+    per_path = {name: [0, 0] for name in PATH_NAMES}
+    for row in rows:
+        if row.path in per_path:
+            per_path[row.path][0] += row.assessments
+            per_path[row.path][1] += row.questions
+    st.dataframe(
+        [
+            {
+                "Path": name,
+                "Assessments": count,
+                "Share": f"{count / assessments:.0%}",
+                "Follow-up questions": path_questions,
+            }
+            for name, (count, path_questions) in per_path.items()
+        ],
+        hide_index=True,
+    )
+
+    left, right = st.columns(2)
+    with left:
+        st.subheader("By Asset Type")
+        st.dataframe(_breakdown(rows, "asset_type", ASSET_TYPE), hide_index=True)
+    with right:
+        st.subheader("By Business Impact")
+        st.dataframe(_breakdown(rows, "impact", IMPACT), hide_index=True)
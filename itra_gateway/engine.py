@@ -0,0 +1,532 @@
+# ITRA Gateway scoping engine (no Streamlit required)
+#
+# The gateway answer space is small and finite, so every possible outcome is
+# computed once at import time and kept in an immutable decision table.
+# Scoping an answer set is then a single dict lookup that returns a shared
+# tuple of AssessmentPath instances.
+#
+# Answer sets also have a compact form: a versioned integer answer code that
+# packs all eight answers into 16 bits. Sessions, the store and the export
+# caches key on it instead of dicts of strings.
+
+import os
+import tomllib
+from dataclasses import dataclass
+from hashlib import blake2b
+from itertools import product
+from math import prod
+from operator import itemgetter
+from types import MappingProxyType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+# Gateway questions in the order they are asked
+GATEWAY_KEYS = ("asset_type", "B.2", "T.6", "B.3", "S.1", "B.13", "D.1", "D.2")
+
+# Internal values each gateway question can take
+ANSWER_DOMAINS = MappingProxyType(
+    {
+        "asset_type": (
+            "computerised_equipment",
+            "it_infrastructure",
+            "it_system",
+            "health_software",
+        ),
+        "B.2": ("Yes", "No"),
+        "T.6": ("Yes", "No"),
+        "B.3": ("Yes", "No"),
+        "S.1": ("Not Connected", "1", "2"),
+        "B.13": ("Low", "Medium", "High"),
+        "D.1": ("Yes", "No"),
+        "D.2": ("Yes", "No"),
+    }
+)
+
+
+@dataclass(frozen=True, slots=True)
+class AssessmentPath:
+    name: str
+    enabled: bool
+    question_count: int
+    description: str
+
+
+Scope = Tuple[AssessmentPath, ...]
+
+
+# Scoping rules
+#
+# The rules are data (rules.toml): each path lists the answers that trigger
+# it and how many follow-up questions each trigger adds. A RuleSet compiles
+# its version of the rules into the scope and question total of every answer
+# code, so scoring under any version is a tuple index.
+
+RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rules.toml")
+
+
+@dataclass(frozen=True)
+class Trigger:
+    answer: str
+    questions: int
+    # Matches an answer in `values`, or with values None, any answer not in
+    # `unless`
+    values: Optional[FrozenSet[str]] = None
+    unless: FrozenSet[str] = frozenset()
+
+    def matches(self, value: Optional[str]) -> bool:
+        if self.values is not None:
+            return value in self.values
+        return value is not None and value not in self.unless
+
+
+@dataclass(frozen=True)
+class PathRule:
+    name: str
+    description: str
+    triggers: Tuple[Trigger, ...]
+    always: bool = False
+    otherwise: int = 0
+
+    @property
+    def answers(self) -> Tuple[str, ...]:
+        """Gateway answers the path is derived from, in question order"""
+        keys = {trigger.answer for trigger in self.triggers}
+        return tuple(key for key in GATEWAY_KEYS if key in keys)
+
+    def evaluate(self, answers: Mapping[str, str]) -> AssessmentPath:
+        # Trigger.matches inlined: this is the uncached scoring loop
+        matched = False
+        questions = 0
+        for trigger in self.triggers:
+            value = answers.get(trigger.answer)
+            if (
+                value in trigger.values
+                if trigger.values is not None
+                else value is not None and value not in trigger.unless
+            ):
+                matched = True
+                questions += trigger.questions
+        return AssessmentPath(
+            self.name,
+            self.always or matched,
+            questions if matched else self.otherwise,
+            self.description,
+        )
+
+
+# None stands for "not answered yet" so partial answer sets are covered too
+_ENTRY_DOMAINS = tuple((None,) + ANSWER_DOMAINS[key] for key in GATEWAY_KEYS)
+
+
+def _entry_column(keys: Sequence[str], lookup: Callable[[Tuple], Any]) -> List:
+    """lookup(answers to keys) for every decision table entry, in code order
+
+    Entries run through the answers like digits of a number, first question
+    most significant, so a value that depends on a few questions is a short
+    block of lookups repeated in C rather than one lookup per entry.
+    """
+    positions = [GATEWAY_KEYS.index(key) for key in keys]
+    first, last = (min(positions), max(positions) + 1) if positions else (0, 0)
+    picks = [position - first for position in positions]
+    block = [
+        lookup(tuple(values[i] for i in picks))
+        for values in product(*_ENTRY_DOMAINS[first:last])
+    ]
+    repeat = prod(map(len, _ENTRY_DOMAINS[last:]))
+    return [value for value in block for _ in range(repeat)] * prod(
+        map(len, _ENTRY_DOMAINS[:first])
+    )
+
+
+class RuleSet:
+    """One version of the scoping rules, compiled into lookup tables
+
+    `scopes` and `totals` hold the scope and follow-up question total of
+    every (possibly partial) answer set, indexed by packed answer code.
+    """
+
+    def __init__(self, version: str, paths: Sequence[PathRule]):
+        self.version = version
+        self.paths = tuple(paths)
+        # Paths in the order they are always reported
+        self.names = tuple(path.name for path in self.paths)
+        # Gateway answers each path is derived from, in report order.
+        # Changing an answer only needs the paths that list it recomputed.
+        self.dependencies = MappingProxyType(
+            {path.name: path.answers for path in self.paths}
+        )
+
+        # Each path on its own, keyed by its dependency answers
+        interned: Dict[AssessmentPath, AssessmentPath] = {}
+        tables = []
+        for path in self.paths:
+            deps = path.answers
+            table = {}
+            for values in product(*(ANSWER_DOMAINS[key] + (None,) for key in deps)):
+                answers = {k: v for k, v in zip(deps, values) if v is not None}
+                outcome = path.evaluate(answers)
+                table[values] = interned.setdefault(outcome, outcome)
+            tables.append(MappingProxyType(table))
+        self.path_tables = tuple(tables)
+
+        # Every answer set, from per-path columns built in answer code order
+        columns = [
+            _entry_column(path.answers, table.__getitem__)
+            for path, table in zip(self.paths, self.path_tables)
+        ]
+        self.scopes: Tuple[Scope, ...] = tuple(zip(*columns))
+        self.totals: Tuple[int, ...] = tuple(
+            map(
+                sum,
+                zip(
+                    *(
+                        [p.question_count if p.enabled else 0 for p in column]
+                        for column in columns
+                    )
+                ),
+            )
+        )
+
+        # Digest of every rule outcome and the answer code layout. Anything
+        # cached under it stops matching as soon as a trigger, a question
+        # count or an answer domain changes.
+        self.fingerprint = blake2b(
+            repr(
+                (
+                    ANSWER_DOMAINS.items(),
+                    [
+                        (dependency, table.items())
+                        for dependency, table in zip(
+                            self.dependencies.items(), self.path_tables
+                        )
+                    ],
+                )
+            ).encode(),
+            digest_size=8,
+        ).hexdigest()
+
+    def evaluate(self, answers: Mapping[str, str]) -> Scope:
+        """Apply the rules to an answer set (uncached)"""
+        return tuple([path.evaluate(answers) for path in self.paths])
+
+    def scope(self, answers: Mapping[str, str]) -> Scope:
+        """Scope of an answer set, looked up unless it is out of domain"""
+        code = answer_code(answers)
+        if code is None:
+            return self.evaluate(answers)
+        return self.scopes[code & _PACKED_MASK]
+
+
+def _values(raw: Any, where: str, key: str) -> FrozenSet[str]:
+    values = frozenset(raw)
+    unknown = values - set(ANSWER_DOMAINS[key])
+    if unknown:
+        raise ValueError(f"{where}: {sorted(unknown)} are not answers to {key}")
+    return values
+
+
+def _compile_trigger(raw: Mapping[str, Any], where: str) -> Trigger:
+    key = raw.get("answer")
+    if key not in ANSWER_DOMAINS:
+        raise ValueError(f"{where}: unknown gateway answer {key!r}")
+    questions = raw.get("questions")
+    if not isinstance(questions, int) or questions < 0:
+        raise ValueError(f"{where}: questions must be a non-negative integer")
+    if ("values" in raw) == ("unless" in raw):
+        raise ValueError(f"{where}: give exactly one of values and unless")
+    if "values" in raw:
+        return Trigger(key, questions, values=_values(raw["values"], where, key))
+    return Trigger(key, questions, unless=_values(raw["unless"], where, key))
+
+
+def compile_rules(data: Mapping[str, Any]) -> RuleSet:
+    """Validate a parsed rules file and compile it"""
+    version = data.get("version")
+    if not isinstance(version, str) or not version:
+        raise ValueError("rules need a version string")
+    paths = []
+    for index, raw in enumerate(data.get("paths", [])):
+        where = f"paths[{index}]"
+        for field in ("name", "description"):
+            if not isinstance(raw.get(field), str):
+                raise ValueError(f"{where}: missing field {field!r}")
+        paths.append(
+            PathRule(
+                name=raw["name"],
+                description=raw["description"],
+                triggers=tuple(
+                    _compile_trigger(trigger, f"{where}.triggers[{i}]")
+                    for i, trigger in enumerate(raw.get("triggers", []))
+                ),
+                always=bool(raw.get("always", False)),
+                otherwise=int(raw.get("otherwise", 0)),
+            )
+        )
+    names = [path.name for path in paths]
+    if not names or len(set(names)) != len(names):
+        raise ValueError(f"rules must define each path once, got {names}")
+    return RuleSet(version, paths)
+
+
+def load_rules(path: Optional[str] = None) -> RuleSet:
+    """Parse and compile a TOML rules file"""
+    with open(path or RULES_PATH, "rb") as f:
+        return compile_rules(tomllib.load(f))
+
+
+# The rules in force, compiled once at import
+RULES = load_rules()
+RULES_VERSION = RULES.version
+RULES_FINGERPRINT = RULES.fingerprint
+PATH_DEPENDENCIES = RULES.dependencies
+PATH_TABLES = RULES.path_tables
+# Assessment paths in the order they are always reported
+PATH_NAMES = RULES.names
+
+# Reverse edges: gateway answer -> indexes of the paths that depend on it
+ANSWER_DEPENDENTS = MappingProxyType(
+    {
+        key: tuple(
+            index
+            for index, deps in enumerate(PATH_DEPENDENCIES.values())
+            if key in deps
+        )
+        for key in GATEWAY_KEYS
+    }
+)
+
+# Scope and total question count, indexed by packed answer code
+SCOPES: Tuple[Scope, ...] = RULES.scopes
+TOTALS: Tuple[int, ...] = RULES.totals
+# The same scopes keyed by answer tuple, for answer dicts
+DECISION_TABLE: Mapping[Tuple[Optional[str], ...], Scope] = MappingProxyType(
+    dict(
+        zip(
+            zip(*(_entry_column((key,), itemgetter(0)) for key in GATEWAY_KEYS)),
+            SCOPES,
+        )
+    )
+)
+
+
+def evaluate_assessment_paths(answers: Mapping[str, str]) -> Scope:
+    """Apply the scoping rules in force to an answer set (uncached)"""
+    return RULES.evaluate(answers)
+
+
+def answer_key(answers: Mapping[str, str]) -> Tuple[Optional[str], ...]:
+    """Decision table key for an answer set"""
+    return tuple(map(answers.get, GATEWAY_KEYS))
+
+
+# Answer codes
+#
+# code = ANSWER_CODE_VERSION << 15 | packed, where packed is a mixed-radix
+# number with one digit per gateway question (first question most
+# significant): 0 for unanswered, i + 1 for the i-th value of its domain.
+# Bump the version whenever GATEWAY_KEYS or ANSWER_DOMAINS change.
+
+ANSWER_CODE_VERSION = 1
+_PACKED_BITS = 15
+_RADIXES = tuple(len(ANSWER_DOMAINS[key]) + 1 for key in GATEWAY_KEYS)
+_PLACES = tuple(prod(_RADIXES[i + 1 :]) for i in range(len(_RADIXES)))
+_PACKED_MASK = (1 << _PACKED_BITS) - 1
+if prod(_RADIXES) > 1 << _PACKED_BITS:
+    raise ValueError("gateway answer space no longer fits the answer code")
+_DIGITS = MappingProxyType(
+    {
+        key: MappingProxyType(
+            {None: 0, **{v: i + 1 for i, v in enumerate(ANSWER_DOMAINS[key])}}
+        )
+        for key in GATEWAY_KEYS
+    }
+)
+_KEY_PLACES = MappingProxyType(dict(zip(GATEWAY_KEYS, zip(_PLACES, _RADIXES))))
+
+
+def encode_answers(answers: Mapping[str, str]) -> int:
+    """Answer code for an answer set within the gateway answer domains"""
+    packed = 0
+    for key, radix in zip(GATEWAY_KEYS, _RADIXES):
+        value = answers.get(key)
+        digit = _DIGITS[key].get(value)
+        if digit is None:
+            raise ValueError(f"{key}={value!r} cannot be encoded")
+        packed = packed * radix + digit
+    return ANSWER_CODE_VERSION << _PACKED_BITS | packed
+
+
+def unpack_code(code: int) -> int:
+    """Packed answer index of a code, checking its version"""
+    version, packed = code >> _PACKED_BITS, code & _PACKED_MASK
+    if version != ANSWER_CODE_VERSION or packed >= len(SCOPES):
+        raise ValueError(f"not a version {ANSWER_CODE_VERSION} answer code: {code}")
+    return packed
+
+
+def decode_answers(code: int) -> Dict[str, str]:
+    """Answer set for an answer code, in gateway question order"""
+    packed = unpack_code(code)
+    answers = {}
+    for key, place, radix in zip(GATEWAY_KEYS, _PLACES, _RADIXES):
+        digit = packed // place % radix
+        if digit:
+            answers[key] = ANSWER_DOMAINS[key][digit - 1]
+    return answers
+
+
+def answer_code(answers: Mapping[str, str]) -> Optional[int]:
+    """Answer code for an answer set, None if it has out-of-domain values"""
+    try:
+        return encode_answers(answers)
+    except ValueError:
+        return None
+
+
+def calculate_assessment_paths(answers: Mapping[str, str]) -> Scope:
+    """Calculate which assessment paths are enabled"""
+    scope = DECISION_TABLE.get(answer_key(answers))
+    if scope is None:
+        # Values outside the known answer domains are scored directly
+        scope = evaluate_assessment_paths(answers)
+    return scope
+
+
+def total_questions(paths: Scope) -> int:
+    """Number of follow-up questions across enabled paths"""
+    return sum(path.question_count for path in paths if path.enabled)
+
+
+def estimate_time_range(question_count: int) -> Tuple[int, int]:
+    """Estimated (min, max) minutes to answer the follow-up questions"""
+    return int(question_count * 0.5), int(question_count * 1.0)
+
+
+def invalid_answers(answers: Mapping[str, str]) -> Dict[str, str]:
+    """Answers whose key or value is outside the gateway answer domains"""
+    return {
+        key: value
+        for key, value in answers.items()
+        if key not in ANSWER_DOMAINS or value not in ANSWER_DOMAINS[key]
+    }
+
+
+# Incremental scoping
+
+
+@dataclass(frozen=True)
+class ScopeChange:
+    """What one answer change did to the scope"""
+
+    key: str
+    previous: Optional[str]
+    value: Optional[str]
+    # (before, after) for every path whose outcome changed, in report order
+    paths: Tuple[Tuple[AssessmentPath, AssessmentPath], ...]
+    previous_total: int
+    total_questions: int
+    previous_phases: int
+    phases_complete: int
+
+    @property
+    def phases_changed(self) -> bool:
+        return self.previous_phases != self.phases_complete
+
+
+class ScopeTracker:
+    """Answer code and its scope, updated one answer at a time
+
+    The answers, scope and question total are looked up from the answer code
+    when read, so a tracker holds a single int per session. A change diffs
+    only the paths that depend on the answer and hands the ScopeChange to
+    every listener.
+    """
+
+    __slots__ = ("phases", "code", "listeners")
+
+    def __init__(
+        self,
+        phases: Sequence[Sequence[str]] = (),
+        answers: Optional[Mapping[str, str]] = None,
+        listeners: Optional[List[Callable[[ScopeChange], None]]] = None,
+    ):
+        # Gateway keys asked in each phase, in order
+        self.phases = tuple(map(tuple, phases))
+        self.code = encode_answers(answers or {})
+        self.listeners = list(listeners or ())
+
+    @property
+    def answers(self) -> Dict[str, str]:
+        return decode_answers(self.code)
+
+    @property
+    def scope(self) -> Scope:
+        return SCOPES[self.code & _PACKED_MASK]
+
+    @property
+    def total_questions(self) -> int:
+        return TOTALS[self.code & _PACKED_MASK]
+
+    def get(self, key: str) -> Optional[str]:
+        """Current answer to one gateway question"""
+        place, radix = _KEY_PLACES[key]
+        digit = (self.code & _PACKED_MASK) // place % radix
+        return ANSWER_DOMAINS[key][digit - 1] if digit else None
+
+    @property
+    def phases_complete(self) -> int:
+        """Number of leading phases whose questions are all answered"""
+        packed = self.code & _PACKED_MASK
+        complete = 0
+        for keys in self.phases:
+            for key in keys:
+                place, radix = _KEY_PLACES[key]
+                if not packed // place % radix:
+                    return complete
+            complete += 1
+        return complete
+
+    def set_answer(self, key: str, value: Optional[str]) -> Optional[ScopeChange]:
+        """Record an answer (None clears it); None when nothing changed"""
+        if key not in _KEY_PLACES or value not in _DIGITS[key]:
+            raise ValueError(f"{key}={value!r} cannot be encoded")
+        place, radix = _KEY_PLACES[key]
+        packed = self.code & _PACKED_MASK
+        digit = packed // place % radix
+        new_digit = _DIGITS[key][value]
+        if new_digit == digit:
+            return None
+        previous_phases = self.phases_complete
+
+        before = SCOPES[packed]
+        previous_total = TOTALS[packed]
+        packed += (new_digit - digit) * place
+        self.code = ANSWER_CODE_VERSION << _PACKED_BITS | packed
+        after = SCOPES[packed]
+
+        change = ScopeChange(
+            key=key,
+            previous=ANSWER_DOMAINS[key][digit - 1] if digit else None,
+            value=value,
+            paths=tuple(
+                (before[index], after[index])
+                for index in ANSWER_DEPENDENTS[key]
+                if before[index] != after[index]
+            ),
+            previous_total=previous_total,
+            total_questions=TOTALS[packed],
+            previous_phases=previous_phases,
+            phases_complete=self.phases_complete,
+        )
+        for listener in self.listeners:
+            listener(change)
+        return change
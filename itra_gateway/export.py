@@ -0,0 +1,264 @@
+# ITRA assessment configuration export (no Streamlit required)
+#
+# Builds the document offered as "Download Configuration JSON" in the app so
+# batch and API callers produce exactly the same structure.
+#
+# Only the metadata and the answers change between two exports of the same
+# answer set; the scope and summary sections are serialized once per distinct
+# answer set and spliced into each document. Stored assessments are exported
+# as NDJSON or CSV one line at a time, so an export of any size runs in
+# constant memory.
+
+import csv
+import io
+import json
+from datetime import datetime
+from functools import lru_cache
+from itertools import chain
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from itra_gateway.engine import (
+    GATEWAY_KEYS,
+    PATH_NAMES,
+    RULES_VERSION,
+    SCOPES,
+    AssessmentPath,
+    answer_code,
+    answer_key,
+    calculate_assessment_paths,
+    unpack_code,
+    estimate_time_range,
+    total_questions,
+)
+from itra_gateway.store import StoredAssessment
+
+
+def build_scope(
+    enabled_paths: Sequence[AssessmentPath], total_questions: int
+) -> Dict[str, Any]:
+    """Scope and summary sections of the configuration document"""
+    min_time, max_time = estimate_time_range(total_questions)
+
+    return {
+        "assessment_scope": [
+            {
+                "name": path.name,
+                "enabled": path.enabled,
+                "question_count": path.question_count,
+                "description": path.description,
+            }
+            for path in enabled_paths
+        ],
+        "summary": {
+            "enabled_paths": sum(1 for path in enabled_paths if path.enabled),
+            "total_questions": total_questions,
+            "estimated_time_minutes": f"{min_time}-{max_time}",
+        },
+    }
+
+
+def build_configuration(
+    answers: Mapping[str, str],
+    enabled_paths: Sequence[AssessmentPath],
+    total_questions: int,
+    start_time: datetime,
+    now: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """Build the assessment configuration document"""
+    if now is None:
+        now = datetime.now()
+
+    return {
+        "assessment_metadata": build_metadata(
+            answers, total_questions, start_time, now
+        ),
+        "gateway_answers": dict(answers),
+        **build_scope(enabled_paths, total_questions),
+    }
+
+
+def parse_start_time(value: Any) -> datetime:
+    """ISO 8601 start time as the naive local time the app records
+
+    Timestamps with an offset (or "Z") are converted to local time, so their
+    duration against datetime.now() is right. Raises ValueError otherwise.
+    """
+    if not isinstance(value, str):
+        raise ValueError(f"start_time must be an ISO 8601 string, got {value!r}")
+    start_time = datetime.fromisoformat(value)
+    if start_time.tzinfo is not None:
+        start_time = start_time.astimezone().replace(tzinfo=None)
+    return start_time
+
+
+def build_metadata(
+    answers: Mapping[str, str],
+    total_questions: int,
+    start_time: datetime,
+    now: datetime,
+) -> Dict[str, Any]:
+    """Metadata section of the configuration document"""
+    return {
+        "timestamp": now.isoformat(),
+        "start_time": start_time.isoformat(),
+        "duration_minutes": (now - start_time).total_seconds() / 60,
+        "total_gateway_questions": len(answers),
+        "estimated_total_questions": total_questions,
+        "rules_version": RULES_VERSION,
+    }
+
+
+# Serialization
+
+# json.dumps arguments for the two layouts we emit: the indented download
+# from the app and one-line NDJSON records
+_LAYOUTS = {
+    False: {"indent": 2},
+    True: {"separators": (",", ":")},
+}
+
+
+ScopeKey = Union[int, Tuple[Optional[str], ...]]
+
+
+def _scope_key(answers: Mapping[str, str]) -> ScopeKey:
+    """Answer code, or the full answer key for out-of-domain answer sets"""
+    code = answer_code(answers)
+    return answer_key(answers) if code is None else code
+
+
+@lru_cache(maxsize=4096)
+def _scope_json(key: ScopeKey, compact: bool) -> Tuple[str, int]:
+    """Serialized scope and summary sections plus the total question count"""
+    if isinstance(key, int):
+        paths = SCOPES[unpack_code(key)]
+    else:
+        paths = calculate_assessment_paths(
+            {k: v for k, v in zip(GATEWAY_KEYS, key) if v is not None}
+        )
+    total = total_questions(paths)
+    return json.dumps(build_scope(paths, total), **_LAYOUTS[compact]), total
+
+
+def _splice(head: str, tail: str, compact: bool) -> str:
+    """Join two serialized JSON objects into one, as json.dumps would"""
+    if compact:
+        return f"{head[:-1]},{tail[1:]}"
+    return f"{head[:-2]},\n{tail[2:]}"
+
+
+def _configuration_json(
+    answers: Mapping[str, str], metadata: Dict[str, Any], scope: str, compact: bool
+) -> str:
+    head = {"assessment_metadata": metadata, "gateway_answers": dict(answers)}
+    return _splice(json.dumps(head, **_LAYOUTS[compact]), scope, compact)
+
+
+def serialize_configuration(
+    answers: Mapping[str, str],
+    start_time: datetime,
+    now: Optional[datetime] = None,
+    compact: bool = False,
+) -> str:
+    """Configuration document as JSON, byte-identical to build_configuration"""
+    if now is None:
+        now = datetime.now()
+    scope, total = _scope_json(_scope_key(answers), compact)
+    metadata = build_metadata(answers, total, start_time, now)
+    return _configuration_json(answers, metadata, scope, compact)
+
+
+# Streaming export of stored assessments
+
+CSV_COLUMNS = (
+    (
+        "assessment_id",
+        "timestamp",
+        "start_time",
+        "duration_minutes",
+        "rules_version",
+        "scored_rules_version",
+    )
+    + GATEWAY_KEYS
+    + ("total_questions", "estimated_time_minutes")
+    + PATH_NAMES
+)
+
+
+def _stored_ndjson(assessment: StoredAssessment) -> str:
+    answers = assessment.answers
+    key = assessment.answer_code
+    scope, total = _scope_json(_scope_key(answers) if key is None else key, True)
+    metadata = {
+        "timestamp": assessment.timestamp,
+        "start_time": assessment.start_time,
+        "duration_minutes": assessment.duration_minutes,
+        "total_gateway_questions": len(answers),
+        "estimated_total_questions": total,
+        # The rules the assessment was completed under, and those its stored
+        # scope (rescored whenever the rules change) was computed with
+        "rules_version": assessment.rules_version,
+        "scored_rules_version": RULES_VERSION,
+    }
+    return _configuration_json(answers, metadata, scope, True)
+
+
+def _stored_csv(assessment: StoredAssessment) -> List[Any]:
+    code = assessment.answer_code
+    scope = (
+        calculate_assessment_paths(assessment.answers)
+        if code is None
+        else SCOPES[unpack_code(code)]
+    )
+    paths = {path.name: path for path in scope}
+    min_time, max_time = estimate_time_range(assessment.total_questions)
+    return (
+        [
+            assessment.assessment_id,
+            assessment.timestamp,
+            assessment.start_time,
+            assessment.duration_minutes,
+            assessment.rules_version or "",
+            RULES_VERSION,
+        ]
+        + [assessment.answers.get(key, "") for key in GATEWAY_KEYS]
+        + [assessment.total_questions, f"{min_time}-{max_time}"]
+        # Follow-up question count per path, 0 when the path is skipped, so
+        # the columns add up to total_questions
+        + [
+            paths[name].question_count if paths[name].enabled else 0
+            for name in PATH_NAMES
+        ]
+    )
+
+
+def export_stored(
+    assessments: Iterable[StoredAssessment], fmt: str = "ndjson"
+) -> Iterator[str]:
+    """Stream stored assessments as NDJSON lines or CSV rows (with header)"""
+    if fmt == "ndjson":
+        for assessment in assessments:
+            yield _stored_ndjson(assessment) + "\n"
+        return
+    if fmt != "csv":
+        raise ValueError(f"unknown export format: {fmt!r}")
+
+    # One small buffer reused for every row
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in chain([CSV_COLUMNS], map(_stored_csv, assessments)):
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
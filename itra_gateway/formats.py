@@ -0,0 +1,13 @@
+# ITRA file formats (standard library only)
+#
+# Kept apart from the readers and writers so the command line can offer
+# them as choices without importing the scoping engine.
+
+# Bulk scoping input (itra_gateway.batch)
+INPUT_FORMATS = ("jsonl", "csv")
+
+# Stored assessment export (itra_gateway.export)
+EXPORT_FORMATS = ("ndjson", "csv")
+
+# Printable assessment reports (itra_gateway.report)
+REPORT_FORMATS = ("html", "pdf")
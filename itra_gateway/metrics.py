@@ -0,0 +1,322 @@
+# In-process metrics for the ITRA gateway (standard library only)
+#
+# Histograms and counters are aggregated in memory and rendered on demand in
+# the Prometheus text format, or logged as one JSON line at a fixed interval.
+# Recording a value costs a bisect and a short lock, so instrumentation can
+# stay on in production.
+
+import json
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Seconds; tuned for render and rerun times of a few ms to a few seconds
+TIME_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+# Bytes, for session_state size
+SIZE_BUCKETS = tuple(2**n for n in range(10, 23, 2))
+# Reruns per session
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = Tuple[str, ...]
+
+
+def _labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic count, optionally split by label values"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        with self._lock:
+            values = dict(self._values)
+        for label_values, value in sorted(values.items()):
+            yield self.name, _labels(self.labels, label_values), value
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {",".join(k) or "total": v for k, v in sorted(self._values.items())}
+
+
+class Gauge(Counter):
+    """Current value that can go up and down, optionally split by labels"""
+
+    kind = "gauge"
+
+    def set(self, value: float, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram:
+    """Bucketed distribution with sum and count, optionally split by labels"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = TIME_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (+Inf last), sum]
+        self._series: Dict[LabelValues, List] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def _copy(self) -> Dict[LabelValues, Tuple[List[int], float]]:
+        with self._lock:
+            return {k: (list(v[0]), v[1]) for k, v in self._series.items()}
+
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        for label_values, (counts, total) in sorted(self._copy().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _number(bound)
+                labels = _labels(self.labels, label_values, f'le="{le}"')
+                yield f"{self.name}_bucket", labels, cumulative
+            labels = _labels(self.labels, label_values)
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, cumulative
+
+    def snapshot(self) -> Dict[str, Any]:
+        result = {}
+        for label_values, (counts, total) in sorted(self._copy().items()):
+            count = sum(counts)
+            result[",".join(label_values) or "total"] = {
+                "count": count,
+                "sum": total,
+                "mean": total / count if count else 0.0,
+            }
+        return result
+
+
+class SessionReruns:
+    """Reruns per live session, rendered as a histogram at scrape time
+
+    Sessions are forgotten after `idle_seconds` without a rerun, and at most
+    `max_sessions` are tracked so memory stays bounded.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        idle_seconds: float = 1800.0,
+        max_sessions: int = 10_000,
+    ):
+        self.name = name
+        self.help = help
+        self.idle_seconds = idle_seconds
+        self.max_sessions = max_sessions
+        self._sessions: Dict[str, List] = {}  # id -> [reruns, last seen]
+        self._lock = threading.Lock()
+
+    def record(self, session_id: str) -> int:
+        """Count one rerun for a session and return its total so far"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._sessions.pop(session_id, None) or [0, now]
+            entry[0] += 1
+            entry[1] = now
+            # Re-inserted last, so the dict stays ordered by last activity
+            self._sessions[session_id] = entry
+            if len(self._sessions) > self.max_sessions:
+                del self._sessions[next(iter(self._sessions))]
+            return entry[0]
+
+    def _live(self) -> List[int]:
+        cutoff = time.monotonic() - self.idle_seconds
+        with self._lock:
+            while self._sessions:
+                oldest = next(iter(self._sessions))
+                if self._sessions[oldest][1] >= cutoff:
+                    break
+                del self._sessions[oldest]
+            return [reruns for reruns, _ in self._sessions.values()]
+
+    def _current(self) -> Histogram:
+        histogram = Histogram(self.name, self.help, buckets=COUNT_BUCKETS)
+        for reruns in self._live():
+            histogram.observe(reruns)
+        return histogram
+
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        return self._current().samples()
+
+    def snapshot(self) -> Dict[str, Any]:
+        live = self._live()
+        return {
+            "sessions": len(live),
+            "max": max(live, default=0),
+            "mean": sum(live) / len(live) if live else 0.0,
+        }
+
+
+class Registry:
+    """Named metrics, created once and shared by every caller in the process"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, name: str, factory: Callable[[], Any]) -> Any:
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.setdefault(name, factory())
+        return metric
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(name, lambda: Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(name, lambda: Gauge(name, help, labels))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = TIME_BUCKETS,
+    ) -> Histogram:
+        return self._get_or_create(name, lambda: Histogram(name, help, labels, buckets))
+
+    def session_reruns(self, name: str, help: str) -> SessionReruns:
+        return self._get_or_create(name, lambda: SessionReruns(name, help))
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        for name, metric in sorted(self._metrics.items()):
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for sample, labels, value in metric.samples():
+                lines.append(f"{sample}{labels} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict[str, Any]:
+        """All metrics as plain data, for JSON logs"""
+        return {name: m.snapshot() for name, m in sorted(self._metrics.items())}
+
+
+# Process-wide registry used by the app and the HTTP service
+REGISTRY = Registry()
+
+
+# Exposure
+
+
+def serve_metrics(
+    port: int, host: str = "127.0.0.1", registry: Registry = REGISTRY
+) -> ThreadingHTTPServer:
+    """Serve GET /metrics from a daemon thread (local connections by default)"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def log_metrics(
+    interval: float,
+    logger: Optional[logging.Logger] = None,
+    registry: Registry = REGISTRY,
+) -> threading.Event:
+    """Log a JSON snapshot every `interval` seconds; set the event to stop"""
+    if logger is None:
+        logger = logging.getLogger("itra.metrics")
+        # Nothing configures logging under `streamlit run`: unless the
+        # deployment routes these lines itself, print them to stderr
+        if not logger.hasHandlers():
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger.addHandler(handler)
+        if not logger.isEnabledFor(logging.INFO):
+            logger.setLevel(logging.INFO)
+    stop = threading.Event()
+
+    def run():
+        while not stop.wait(interval):
+            logger.info(json.dumps(registry.snapshot(), separators=(",", ":")))
+
+    threading.Thread(target=run, daemon=True).start()
+    return stop
@@ -0,0 +1,94 @@
+# ITRA vectorized portfolio scoring (requires NumPy)
+#
+# Scores a whole inventory held as columnar answer arrays, one array per
+# gateway key. Rows are collapsed to their distinct answer profiles with
+# NumPy, each profile is scored once through the shared engine, and the
+# per-profile results are broadcast back to every row. No AssessmentPath is
+# built per row, and the results match calculate_assessment_paths row for row.
+
+from dataclasses import dataclass
+from typing import Any, Mapping, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError as error:  # pragma: no cover - depends on environment
+    raise ImportError(
+        "Portfolio scoring requires NumPy: uv pip install 'itra-gateway-app[portfolio]'"
+    ) from error
+
+from itra_gateway.engine import GATEWAY_KEYS, PATH_NAMES, calculate_assessment_paths
+
+
+@dataclass(frozen=True)
+class PortfolioScores:
+    path_names: Tuple[str, ...]
+    enabled: np.ndarray  # (rows, paths) bool
+    question_counts: np.ndarray  # (rows, paths) int, as reported per path
+    total_questions: np.ndarray  # (rows,) questions across enabled paths
+    min_minutes: np.ndarray  # (rows,)
+    max_minutes: np.ndarray  # (rows,)
+
+    def __len__(self) -> int:
+        return len(self.total_questions)
+
+
+def _factorize(column: Any, rows: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Integer codes and distinct values of one answer column ("" = missing)"""
+    if column is None:
+        return np.zeros(rows, dtype=np.intp), np.array([""])
+
+    values = np.asarray(column)
+    if values.dtype == object:
+        # None, NaN and "" all mean "not answered"
+        missing = np.equal(values, None) | (values != values) | (values == "")
+        values = np.where(missing, "", values)
+    uniques, codes = np.unique(values.astype(str), return_inverse=True)
+    return codes, uniques
+
+
+def score_portfolio(columns: Mapping[str, Sequence]) -> PortfolioScores:
+    """Score columnar gateway answers, one array per gateway key"""
+    unknown = set(columns) - set(GATEWAY_KEYS)
+    if unknown:
+        raise ValueError(f"unknown gateway keys: {sorted(unknown)}")
+
+    lengths = {len(column) for column in columns.values() if column is not None}
+    if len(lengths) > 1:
+        raise ValueError("all answer columns must have the same length")
+    rows = lengths.pop() if lengths else 0
+
+    # Collapse rows to distinct answer profiles, re-factorizing after each
+    # key so the combined code stays small
+    profile = np.zeros(rows, dtype=np.intp)
+    factors = []
+    for key in GATEWAY_KEYS:
+        codes, uniques = _factorize(columns.get(key), rows)
+        factors.append((key, codes, uniques))
+        _, profile = np.unique(profile * len(uniques) + codes, return_inverse=True)
+
+    # Score each distinct profile once through the engine
+    _, first_rows, profile = np.unique(profile, return_index=True, return_inverse=True)
+    profile_enabled = np.zeros((len(first_rows), len(PATH_NAMES)), dtype=bool)
+    profile_counts = np.zeros((len(first_rows), len(PATH_NAMES)), dtype=np.int64)
+    for index, row in enumerate(first_rows):
+        answers = {
+            key: str(uniques[codes[row]])
+            for key, codes, uniques in factors
+            if uniques[codes[row]] != ""
+        }
+        for path_index, path in enumerate(calculate_assessment_paths(answers)):
+            profile_enabled[index, path_index] = path.enabled
+            profile_counts[index, path_index] = path.question_count
+
+    enabled = profile_enabled[profile]
+    question_counts = profile_counts[profile]
+    totals = np.where(enabled, question_counts, 0).sum(axis=1)
+
+    return PortfolioScores(
+        path_names=PATH_NAMES,
+        enabled=enabled,
+        question_counts=question_counts,
+        total_questions=totals,
+        min_minutes=totals // 2,
+        max_minutes=totals,
+    )
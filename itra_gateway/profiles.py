@@ -0,0 +1,146 @@
+# ITRA answer profile cache (no Streamlit required)
+#
+# Most assets share a handful of gateway answer profiles. Everything derived
+# from an answer set alone (its scope, the summary metrics and the summary
+# markdown) is computed once per distinct profile and shared by every
+# session in the process. Entries are content-addressed: the key is a hash of
+# the canonical answers together with the scoping rules' and the catalog's
+# fingerprints, so after a rule or catalog change old entries simply stop
+# matching and age out of the LRU.
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from hashlib import blake2b
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
+
+from itra_gateway.catalog import CATALOG, Catalog
+from itra_gateway.engine import (
+    GATEWAY_KEYS,
+    RULES_FINGERPRINT,
+    Scope,
+    calculate_assessment_paths,
+    total_questions,
+)
+from itra_gateway.metrics import REGISTRY, Registry
+
+# Summary order: gateway questions as asked, then anything unknown
+_ORDER = {key: index for index, key in enumerate(GATEWAY_KEYS)}
+
+
+@dataclass(frozen=True)
+class AnswerProfile:
+    """Scope, summary metrics and summary markdown of one answer set"""
+
+    key: str
+    answers: Mapping[str, str]
+    scope: Scope
+    total_questions: int
+    enabled_count: int
+    # "• **Label**: answer" per answer, in gateway question order
+    answer_lines: Tuple[str, ...]
+    # (enabled, text) per path, as listed under Enabled Assessment Areas
+    path_lines: Tuple[Tuple[bool, str], ...]
+    # "• **Path**: n questions - description" per path with questions
+    breakdown_lines: Tuple[str, ...]
+
+
+def profile_key(answers: Mapping[str, str], version: str = "") -> str:
+    """Canonical hash of an answer set (in any order) under a version string"""
+    canonical = "\n".join([version, *(f"{k}\t{v}" for k, v in sorted(answers.items()))])
+    return blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+
+def build_profile(
+    answers: Mapping[str, str], key: str = "", catalog: Catalog = CATALOG
+) -> AnswerProfile:
+    """Compute everything an answer profile holds (uncached)"""
+    scope = calculate_assessment_paths(answers)
+    return AnswerProfile(
+        key=key,
+        answers=MappingProxyType(dict(answers)),
+        scope=scope,
+        total_questions=total_questions(scope),
+        enabled_count=sum(1 for path in scope if path.enabled),
+        answer_lines=tuple(
+            f"• **{catalog.label(k)}**: {catalog.summary(k, answers[k])}"
+            for k in sorted(answers, key=lambda k: _ORDER.get(k, len(_ORDER)))
+        ),
+        path_lines=tuple(
+            (
+                (True, f"✅ {path.name} ({path.question_count} questions)")
+                if path.enabled
+                else (False, f"⏭️ {path.name} (skipped)")
+            )
+            for path in scope
+        ),
+        breakdown_lines=tuple(
+            f"• **{path.name}**: {path.question_count} questions - {path.description}"
+            for path in scope
+            if path.enabled and path.question_count > 0
+        ),
+    )
+
+
+class ProfileCache:
+    """Process-wide LRU of answer profiles with hit/miss counters"""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        catalog: Catalog = CATALOG,
+        rules_fingerprint: str = RULES_FINGERPRINT,
+        registry: Registry = REGISTRY,
+    ):
+        self.max_entries = max_entries
+        self.catalog = catalog
+        # Part of every key, so profiles from other rules never match
+        self.version = f"{rules_fingerprint}:{catalog.fingerprint}"
+        self._profiles: "OrderedDict[str, AnswerProfile]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+        self._lookups = registry.counter(
+            "itra_profile_cache_lookups_total", "Answer profile lookups", ["result"]
+        )
+        self._entries = registry.gauge(
+            "itra_profile_cache_entries", "Answer profiles held in the cache"
+        )
+
+    def get(self, answers: Mapping[str, str]) -> AnswerProfile:
+        """The answer set's profile, computed on first use"""
+        key = profile_key(answers, self.version)
+        with self._lock:
+            profile: Optional[AnswerProfile] = self._profiles.get(key)
+            if profile is not None:
+                self._profiles.move_to_end(key)
+                self._hits += 1
+        if profile is not None:
+            self._lookups.inc("hit")
+            return profile
+
+        profile = build_profile(answers, key, self.catalog)
+        with self._lock:
+            self._misses += 1
+            self._profiles[key] = profile
+            while len(self._profiles) > self.max_entries:
+                self._profiles.popitem(last=False)
+            entries = len(self._profiles)
+        self._lookups.inc("miss")
+        self._entries.set(entries)
+        return profile
+
+    def clear(self) -> None:
+        with self._lock:
+            self._profiles.clear()
+        self._entries.set(0)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._profiles),
+                "hits": self._hits,
+                "misses": self._misses,
+            }
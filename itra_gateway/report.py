@@ -0,0 +1,395 @@
+# ITRA printable assessment reports (standard library only)
+#
+# Renders an assessment's gateway answers, assessment scope and summary as a
+# self-contained HTML page or a PDF for auditors. The page templates are
+# compiled once at import, and everything derived from the answer set alone
+# (the answer and scope tables, the summary and their PDF lines) is rendered
+# once per distinct answer set, so a quarter-end batch of thousands of
+# reports mostly fills in metadata. PDFs are written directly in the base
+# PDF format with the standard Helvetica fonts, no renderer needed.
+#
+# Batches are rendered in chunks across a process pool with only a bounded
+# number of chunks in flight, and each report is handed on (to a directory
+# or a zip archive) as soon as its chunk is done.
+
+import html
+import os
+import re
+import textwrap
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from itertools import islice
+from string import Template
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from itra_gateway.catalog import CATALOG
+from itra_gateway.engine import (
+    GATEWAY_KEYS,
+    RULES_VERSION,
+    Scope,
+    answer_key,
+    calculate_assessment_paths,
+    estimate_time_range,
+    total_questions,
+)
+from itra_gateway.formats import REPORT_FORMATS
+from itra_gateway.store import StoredAssessment
+
+TITLE = "IT Risk Assessment Report"
+
+# Templates
+
+_PAGE = Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>$title</title>
+<style>
+body { font-family: Helvetica, Arial, sans-serif; color: #222; margin: 2em; }
+h1 { font-size: 1.5em; margin-bottom: 0.2em; }
+h2 { font-size: 1.15em; margin-top: 1.6em; border-bottom: 1px solid #ccc; }
+table { border-collapse: collapse; width: 100%; }
+th, td { text-align: left; padding: 0.35em 0.6em; border-bottom: 1px solid #eee; vertical-align: top; }
+th { background: #f4f4f4; }
+td.count { text-align: right; }
+tr.skipped td { color: #888; }
+.meta td:first-child { width: 14em; color: #555; }
+@media print { body { margin: 0; } h2 { break-after: avoid; } tr { break-inside: avoid; } }
+</style>
+</head>
+<body>
+<h1>$title</h1>
+<table class="meta">
+$metadata
+</table>
+$sections
+</body>
+</html>
+""")
+
+_META_ROW = Template("<tr><td>$label</td><td>$value</td></tr>")
+
+_SECTIONS = Template("""<h2>Gateway Answers</h2>
+<table>
+<tr><th>Question</th><th>Answer</th></tr>
+$answers
+</table>
+<h2>Assessment Scope</h2>
+<table>
+<tr><th>Assessment area</th><th>Status</th><th>Questions</th><th>Description</th></tr>
+$paths
+</table>
+<h2>Summary</h2>
+<table class="meta">
+$summary
+</table>""")
+
+_ANSWER_ROW = Template("<tr><td>$label</td><td>$answer</td></tr>")
+
+_PATH_ROW = Template(
+    '<tr class="$status"><td>$name</td><td>$label</td>'
+    '<td class="count">$questions</td><td>$description</td></tr>'
+)
+
+
+# Per answer set sections
+
+
+@dataclass(frozen=True)
+class _Sections:
+    html: str
+    # (bold, text, indent) per line of the PDF body
+    pdf_lines: Tuple[Tuple[bool, str, int], ...]
+
+
+def _summary_rows(scope: Scope) -> List[Tuple[str, str]]:
+    total = total_questions(scope)
+    min_time, max_time = estimate_time_range(total)
+    return [
+        ("Enabled assessment areas", str(sum(1 for path in scope if path.enabled))),
+        ("Follow-up questions", str(total)),
+        ("Estimated time", f"{min_time}-{max_time} minutes"),
+    ]
+
+
+@lru_cache(maxsize=4096)
+def _sections(key: Tuple[Optional[str], ...]) -> _Sections:
+    """Answer, scope and summary sections of one answer set"""
+    answers = {k: v for k, v in zip(GATEWAY_KEYS, key) if v is not None}
+    scope = calculate_assessment_paths(answers)
+    answer_rows = [
+        (CATALOG.label(k), CATALOG.summary(k, v)) for k, v in answers.items()
+    ]
+    summary_rows = _summary_rows(scope)
+
+    html_sections = _SECTIONS.substitute(
+        answers="\n".join(
+            _ANSWER_ROW.substitute(label=html.escape(label), answer=html.escape(text))
+            for label, text in answer_rows
+        ),
+        paths="\n".join(
+            _PATH_ROW.substitute(
+                status="enabled" if path.enabled else "skipped",
+                name=html.escape(path.name),
+                label="Enabled" if path.enabled else "Skipped",
+                questions=path.question_count if path.enabled else "",
+                description=html.escape(path.description),
+            )
+            for path in scope
+        ),
+        summary=_meta_rows(summary_rows),
+    )
+
+    lines: List[Tuple[bool, str, int]] = [(True, "Gateway Answers", 0)]
+    lines += [(False, f"{label}: {_plain(text)}", 12) for label, text in answer_rows]
+    lines.append((True, "Assessment Scope", 0))
+    for path in scope:
+        status = f"{path.question_count} questions" if path.enabled else "skipped"
+        lines.append((False, f"{path.name} ({status})", 12))
+        if path.enabled:
+            lines.append((False, path.description, 24))
+    lines.append((True, "Summary", 0))
+    lines += [(False, f"{label}: {value}", 12) for label, value in summary_rows]
+    return _Sections(html_sections, tuple(lines))
+
+
+def _meta_rows(rows: Iterable[Tuple[str, str]]) -> str:
+    return "\n".join(
+        _META_ROW.substitute(label=html.escape(label), value=html.escape(value))
+        for label, value in rows
+    )
+
+
+# Emoji and other symbols the standard PDF fonts cannot draw
+_NOT_LATIN = re.compile("[^\x00-\xff]+")
+
+
+def _plain(text: str) -> str:
+    return _NOT_LATIN.sub("", text).strip()
+
+
+def _when(value: Any) -> str:
+    """An ISO timestamp to the minute, anything else as is"""
+    try:
+        return datetime.fromisoformat(value).strftime("%Y-%m-%d %H:%M")
+    except (TypeError, ValueError):
+        return str(value or "")
+
+
+def _metadata_rows(metadata: Mapping[str, Any]) -> List[Tuple[str, str]]:
+    version = metadata.get("rules_version", RULES_VERSION)
+    rows = [
+        ("Completed", _when(metadata.get("timestamp"))),
+        ("Started", _when(metadata.get("start_time"))),
+        ("Duration", f"{float(metadata.get('duration_minutes') or 0):.1f} minutes"),
+        ("Scoping rules version", "not recorded" if version is None else str(version)),
+    ]
+    # The sections below are always scoped under the rules in force
+    if version != RULES_VERSION:
+        rows.append(("Scope shown under rules version", RULES_VERSION))
+    return rows
+
+
+def report_html(
+    answers: Mapping[str, str], metadata: Mapping[str, Any], title: str = TITLE
+) -> str:
+    """Printable HTML report of one assessment"""
+    return _PAGE.substitute(
+        title=html.escape(title),
+        metadata=_meta_rows(_metadata_rows(metadata)),
+        sections=_sections(answer_key(answers)).html,
+    )
+
+
+def report_pdf(
+    answers: Mapping[str, str], metadata: Mapping[str, Any], title: str = TITLE
+) -> bytes:
+    """Printable PDF report of one assessment"""
+    lines = [(True, title, 0)]
+    lines += [
+        (False, f"{label}: {value}", 0) for label, value in _metadata_rows(metadata)
+    ]
+    lines += _sections(answer_key(answers)).pdf_lines
+    return _pdf(lines)
+
+
+def stored_metadata(assessment: StoredAssessment) -> Dict[str, Any]:
+    return {
+        "timestamp": assessment.timestamp,
+        "start_time": assessment.start_time,
+        "duration_minutes": assessment.duration_minutes,
+        "rules_version": assessment.rules_version,
+    }
+
+
+# PDF
+
+# A4 in points, and the layout of the text on it
+_PAGE_WIDTH, _PAGE_HEIGHT = 595, 842
+_MARGIN = 56
+_BODY_SIZE, _HEADING_SIZE = 10, 13
+_LEADING = 1.45
+# Average Helvetica glyph width as a share of the font size, for wrapping
+_CHAR_WIDTH = 0.5
+
+
+def _pdf_string(text: str) -> bytes:
+    data = text.encode("cp1252", "ignore")
+    return b"(" + re.sub(rb"([\\()])", rb"\\\1", data) + b")"
+
+
+@lru_cache(maxsize=4096)
+def _wrapped(bold: bool, text: str, indent: int) -> Tuple[Tuple[bytes, bytes], ...]:
+    """Text operators of a wrapped line, split around their y position"""
+    size = _HEADING_SIZE if bold else _BODY_SIZE
+    width = int((_PAGE_WIDTH - 2 * _MARGIN - indent) / (size * _CHAR_WIDTH))
+    return tuple(
+        (
+            b"BT /%s %d Tf %d "
+            % (b"F2" if bold else b"F1", size, _MARGIN + indent + (12 if index else 0)),
+            b" Td %s Tj ET" % _pdf_string(part),
+        )
+        for index, part in enumerate(textwrap.wrap(text, width) or [""])
+    )
+
+
+def _pdf_pages(lines: Iterable[Tuple[bool, str, int]]) -> List[bytes]:
+    """Content streams of the pages the lines flow onto"""
+    pages: List[bytes] = []
+    ops: List[bytes] = []
+    y = _PAGE_HEIGHT - _MARGIN
+    for bold, text, indent in lines:
+        size = _HEADING_SIZE if bold else _BODY_SIZE
+        if bold and ops:
+            y -= size * 0.6  # space above headings
+        for head, tail in _wrapped(bold, text, indent):
+            if y - size * _LEADING < _MARGIN:
+                pages.append(b"\n".join(ops))
+                ops, y = [], _PAGE_HEIGHT - _MARGIN
+            y -= size * _LEADING
+            ops.append(b"%s%.1f%s" % (head, y, tail))
+    pages.append(b"\n".join(ops))
+    return pages
+
+
+def _pdf(lines: Iterable[Tuple[bool, str, int]]) -> bytes:
+    """A PDF document of text lines in Helvetica, wrapped and paginated"""
+    pages = _pdf_pages(lines)
+    # Objects 1-4 are the catalog, the page tree and the two fonts, then a
+    # page object and its content stream per page
+    page_ids = [5 + 2 * index for index in range(len(pages))]
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [%s] /Count %d >>"
+        % (b" ".join(b"%d 0 R" % page for page in page_ids), len(pages)),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica "
+        b"/Encoding /WinAnsiEncoding >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold "
+        b"/Encoding /WinAnsiEncoding >>",
+    ]
+    for page, content in zip(page_ids, pages):
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] "
+            b"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents %d 0 R >>"
+            % (_PAGE_WIDTH, _PAGE_HEIGHT, page + 1)
+        )
+        objects.append(
+            b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content)
+        )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    return bytes(out)
+
+
+# Batches
+
+# (file name, contents)
+Report = Tuple[str, bytes]
+
+
+def render_stored(
+    assessment: StoredAssessment, formats: Tuple[str, ...] = REPORT_FORMATS
+) -> List[Report]:
+    """The requested report files of one stored assessment"""
+    metadata = stored_metadata(assessment)
+    title = f"{TITLE} - Assessment {assessment.assessment_id}"
+    name = f"itra-report-{assessment.assessment_id:06d}"
+    reports = []
+    for fmt in formats:
+        if fmt == "html":
+            data = report_html(assessment.answers, metadata, title).encode()
+        elif fmt == "pdf":
+            data = report_pdf(assessment.answers, metadata, title)
+        else:
+            raise ValueError(f"unknown report format: {fmt!r}")
+        reports.append((f"{name}.{fmt}", data))
+    return reports
+
+
+def _render_chunk(
+    chunk: List[StoredAssessment], formats: Tuple[str, ...]
+) -> List[Report]:
+    return [report for item in chunk for report in render_stored(item, formats)]
+
+
+def render_reports(
+    assessments: Iterable[StoredAssessment],
+    formats: Tuple[str, ...] = REPORT_FORMATS,
+    workers: int = 1,
+    chunk_size: int = 200,
+) -> Iterator[Report]:
+    """Report files of stored assessments in order, optionally across processes"""
+    for fmt in formats:
+        if fmt not in REPORT_FORMATS:
+            raise ValueError(f"unknown report format: {fmt!r}")
+    assessments = iter(assessments)
+    chunks = iter(lambda: list(islice(assessments, chunk_size)), [])
+
+    if workers <= 1:
+        for chunk in chunks:
+            yield from _render_chunk(chunk, formats)
+        return
+
+    # As in bulk scoping: a small window of chunks in flight, so the store is
+    # never read far ahead of the workers and reports stream out in order
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_render_chunk, chunk, formats))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def write_reports(reports: Iterable[Report], output: str) -> int:
+    """Write report files into a directory, or a zip archive for *.zip"""
+    count = 0
+    if output.lower().endswith(".zip"):
+        with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as archive:
+            for name, data in reports:
+                archive.writestr(name, data)
+                count += 1
+        return count
+
+    os.makedirs(output, exist_ok=True)
+    for name, data in reports:
+        with open(os.path.join(output, name), "wb") as f:
+            f.write(data)
+        count += 1
+    return count
@@ -0,0 +1,266 @@
+# ITRA Gateway HTTP scoping service (standard library only)
+# Run with: uv run itra-gateway serve --port 8080
+#
+# A small asyncio HTTP/1.1 server with keep-alive, exposing the same scoping
+# rules and export document as the Streamlit app:
+#
+#   GET  /healthz          liveness probe
+#   GET  /metrics          request latency histograms (Prometheus text format)
+#   POST /v1/scope         {"answers": {...}} -> assessment scope and summary
+#   POST /v1/export        {"answers": {...}, "start_time": "..."} -> configuration
+#   POST /v1/export/batch  {"assessments": [{"answers": ..., ...}, ...]}
+
+import asyncio
+import json
+import time
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Tuple
+
+from itra_gateway.engine import (
+    GATEWAY_KEYS,
+    SCOPES,
+    calculate_assessment_paths,
+    decode_answers,
+    encode_answers,
+    invalid_answers,
+    total_questions,
+    unpack_code,
+)
+from itra_gateway.export import build_configuration, build_scope, parse_start_time
+from itra_gateway.metrics import CONTENT_TYPE, REGISTRY
+
+MAX_BODY_BYTES = 16 * 1024 * 1024
+MAX_BATCH_SIZE = 10_000
+INLINE_BODY_BYTES = 64 * 1024
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+REQUEST_SECONDS = REGISTRY.histogram(
+    "itra_service_request_seconds",
+    "Time to handle one request",
+    ["route", "status"],
+)
+
+
+class RequestError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _parse_answers(payload: Any) -> Dict[str, str]:
+    """Validate the gateway answers of one assessment in a request body"""
+    if not isinstance(payload, dict) or not isinstance(payload.get("answers"), dict):
+        raise RequestError(400, "expected an object with an 'answers' object")
+    answers = payload["answers"]
+    invalid = invalid_answers(answers)
+    if invalid:
+        raise RequestError(400, f"invalid gateway answers: {invalid}")
+    # Canonical question order, as the app records them
+    return {key: answers[key] for key in GATEWAY_KEYS if key in answers}
+
+
+def _parse_start_time(payload: Dict, now: datetime) -> datetime:
+    start_time = payload.get("start_time")
+    if start_time is None:
+        return now
+    try:
+        return parse_start_time(start_time)
+    except ValueError:
+        raise RequestError(400, "start_time must be an ISO 8601 timestamp") from None
+
+
+@lru_cache(maxsize=4096)
+def _scope_body(code: int) -> bytes:
+    """Serialized scope response, cached per answer code"""
+    answers = decode_answers(code)
+    paths = SCOPES[unpack_code(code)]
+    body = {
+        "gateway_answers": answers,
+        **build_scope(paths, total_questions(paths)),
+    }
+    return json.dumps(body, separators=(",", ":")).encode()
+
+
+def _export(payload: Any, now: datetime) -> Dict[str, Any]:
+    answers = _parse_answers(payload)
+    start_time = _parse_start_time(payload, now)
+    paths = calculate_assessment_paths(answers)
+    return build_configuration(
+        answers, paths, total_questions(paths), start_time, now=now
+    )
+
+
+def handle_scope(payload: Any) -> bytes:
+    answers = _parse_answers(payload)
+    # Validated answers are always within the answer domains
+    return _scope_body(encode_answers(answers))
+
+
+def handle_export(payload: Any) -> bytes:
+    return json.dumps(_export(payload, datetime.now())).encode()
+
+
+def handle_export_batch(payload: Any) -> bytes:
+    if not isinstance(payload, dict) or not isinstance(
+        payload.get("assessments"), list
+    ):
+        raise RequestError(400, "expected an object with an 'assessments' list")
+    assessments = payload["assessments"]
+    if len(assessments) > MAX_BATCH_SIZE:
+        raise RequestError(413, f"at most {MAX_BATCH_SIZE} assessments per batch")
+
+    now = datetime.now()
+    results = []
+    for index, item in enumerate(assessments):
+        try:
+            results.append(_export(item, now))
+        except RequestError as error:
+            raise RequestError(error.status, f"assessments[{index}]: {error}")
+    return json.dumps({"results": results}).encode()
+
+
+ROUTES = {
+    "/v1/scope": handle_scope,
+    "/v1/export": handle_export,
+    "/v1/export/batch": handle_export_batch,
+}
+
+
+def _response(
+    status: int,
+    body: bytes,
+    keep_alive: bool,
+    content_type: str = "application/json",
+) -> bytes:
+    head = (
+        f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+def _error_body(message: str) -> bytes:
+    return json.dumps({"error": message}).encode()
+
+
+def dispatch(method: str, path: str, body: bytes) -> Tuple[int, bytes]:
+    """Route one request to its handler and return (status, body)"""
+    path = path.split("?", 1)[0]
+    if path == "/healthz":
+        return 200, b'{"status":"ok"}'
+
+    handler = ROUTES.get(path)
+    if handler is None:
+        return 404, _error_body(f"no route for {path}")
+    if method != "POST":
+        return 405, _error_body(f"{path} only accepts POST")
+
+    try:
+        payload = json.loads(body)
+    except (UnicodeDecodeError, json.JSONDecodeError) as error:
+        return 400, _error_body(f"invalid JSON body: {error}")
+    try:
+        return 200, handler(payload)
+    except RequestError as error:
+        return error.status, _error_body(str(error))
+
+
+async def handle_connection(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> None:
+    """Serve HTTP/1.1 requests on one keep-alive connection"""
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                break
+
+            request_line, *header_lines = head.decode("latin-1").split("\r\n")
+            try:
+                method, path, version = request_line.split(" ", 2)
+            except ValueError:
+                writer.write(_response(400, _error_body("bad request line"), False))
+                break
+
+            headers = {}
+            for line in header_lines:
+                name, _, value = line.partition(":")
+                if name:
+                    headers[name.strip().lower()] = value.strip()
+
+            connection = headers.get("connection", "").lower()
+            keep_alive = (
+                connection != "close"
+                if version == "HTTP/1.1"
+                else connection == "keep-alive"
+            )
+
+            try:
+                length = int(headers.get("content-length", "0"))
+            except ValueError:
+                length = -1
+            if length < 0 or length > MAX_BODY_BYTES:
+                status = 400 if length < 0 else 413
+                writer.write(_response(status, _error_body("bad body size"), False))
+                break
+
+            body = await reader.readexactly(length) if length else b""
+            route = path.split("?", 1)[0]
+            if route == "/metrics":
+                metrics = REGISTRY.render().encode()
+                writer.write(_response(200, metrics, keep_alive, CONTENT_TYPE))
+                await writer.drain()
+                if not keep_alive:
+                    break
+                continue
+
+            started = time.perf_counter()
+            try:
+                if length > INLINE_BODY_BYTES:
+                    # Large batches are scored off the event loop so they do
+                    # not stall other connections
+                    status, payload = await asyncio.get_running_loop().run_in_executor(
+                        None, dispatch, method, path, body
+                    )
+                else:
+                    status, payload = dispatch(method, path, body)
+            except Exception as error:  # never take the connection down silently
+                status, payload = 500, _error_body(f"internal error: {error}")
+            REQUEST_SECONDS.observe(
+                time.perf_counter() - started,
+                route if route in ROUTES or route == "/healthz" else "other",
+                str(status),
+            )
+
+            writer.write(_response(status, payload, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionResetError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8080) -> None:
+    """Run the scoping service until cancelled"""
+    server = await asyncio.start_server(
+        handle_connection, host, port, reuse_address=True, backlog=1024
+    )
+    addresses = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+    print(f"ITRA scoping service listening on {addresses}", flush=True)
+    async with server:
+        await server.serve_forever()
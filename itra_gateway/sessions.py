@@ -0,0 +1,197 @@
+# ITRA assessment session store (no Streamlit required)
+#
+# Streamlit keeps session_state alive for every open tab, so abandoned
+# assessments would otherwise pile up for as long as the tab stays open.
+# The app keeps each session's assessment here instead: a process-wide LRU
+# with a hard cap on resident bytes and an idle TTL. Evicted sessions are
+# optionally spilled to a SQLite file and loaded back when their user
+# returns; without a spill file the app falls back to the resume link.
+
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from itra_gateway.engine import ScopeTracker
+from itra_gateway.metrics import REGISTRY, Registry
+
+_SPILL_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    state BLOB NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_last_seen ON sessions (last_seen);
+"""
+
+
+@dataclass(slots=True)
+class AssessmentSession:
+    """One user's assessment: answers with their scope and the start time"""
+
+    scope: ScopeTracker
+    start_time: datetime
+    # Follow-up answers as question id -> option index, and the full
+    # assessment section being shown (None while on the gateway)
+    followup: Dict[str, int] = field(default_factory=dict)
+    section: Optional[int] = None
+    # time.time() of the last follow-up answer or section change, for dwell
+    # telemetry (0 when unknown, e.g. after a resume link)
+    answered_at: float = 0.0
+    # Names this assessment's records in the audit log
+    assessment_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+
+
+class SessionStore:
+    """Bounded session store with idle TTL, LRU eviction and disk spill
+
+    Sizes are the pickled size of each session, measured when it is put.
+    `spill_ttl_seconds` bounds how long spilled sessions are kept on disk.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: float = 7200.0,
+        spill_path: Optional[str] = None,
+        spill_ttl_seconds: float = 7 * 86400.0,
+        registry: Registry = REGISTRY,
+    ):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.spill_ttl_seconds = spill_ttl_seconds
+        # session id -> [session, pickled size, last seen], oldest first
+        self._sessions: "OrderedDict[str, List]" = OrderedDict()
+        self._bytes = 0
+        self._next_sweep = 0.0
+        self._lock = threading.Lock()
+
+        self._spill = None
+        if spill_path:
+            self._spill = sqlite3.connect(spill_path, check_same_thread=False)
+            self._spill.execute("PRAGMA journal_mode=WAL")
+            with self._spill:
+                self._spill.executescript(_SPILL_SCHEMA)
+
+        self._resident_bytes = registry.gauge(
+            "itra_session_store_bytes", "Pickled bytes of resident sessions"
+        )
+        self._resident = registry.gauge(
+            "itra_session_store_sessions", "Resident sessions"
+        )
+        self._evictions = registry.counter(
+            "itra_session_evictions_total", "Sessions evicted", ["reason"]
+        )
+        self._restores = registry.counter(
+            "itra_session_restores_total", "Evicted sessions loaded from the spill"
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._spill is not None:
+                self._spill.close()
+                self._spill = None
+
+    def get(self, session_id: str) -> Optional[Any]:
+        """A session, loading it back from the spill if it was evicted"""
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is not None:
+                self._sessions.move_to_end(session_id)
+                entry[2] = time.time()
+                return entry[0]
+            session = self._load_spilled(session_id)
+        if session is not None:
+            self._restores.inc()
+            self.put(session_id, session)
+        return session
+
+    def put(self, session_id: str, session: Any) -> None:
+        """Store or refresh a session as the most recently used"""
+        size = len(pickle.dumps(session, pickle.HIGHEST_PROTOCOL))
+        now = time.time()
+        with self._lock:
+            previous = self._sessions.pop(session_id, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            else:
+                # A spilled copy is stale once the session is resident again
+                self._drop_spilled(session_id)
+            self._sessions[session_id] = [session, size, now]
+            self._bytes += size
+
+            evicted = []
+            if now >= self._next_sweep:
+                evicted += self._expire(now)
+            # Never evict the session being put, even if it alone is too big
+            while self._bytes > self.max_bytes and len(self._sessions) > 1:
+                evicted.append(self._evict(next(iter(self._sessions)), "lru"))
+            self._spill_sessions(evicted)
+            self._report()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"sessions": len(self._sessions), "bytes": self._bytes}
+
+    # Eviction
+
+    def _expire(self, now: float) -> List[Tuple[str, Any, float]]:
+        """Evict sessions idle for longer than the TTL"""
+        self._next_sweep = now + min(self.ttl_seconds / 10, 60.0)
+        cutoff = now - self.ttl_seconds
+        evicted = []
+        while self._sessions:
+            session_id, (_, _, last_seen) = next(iter(self._sessions.items()))
+            if last_seen >= cutoff:
+                break
+            evicted.append(self._evict(session_id, "ttl"))
+        if self._spill is not None:
+            with self._spill:
+                self._spill.execute(
+                    "DELETE FROM sessions WHERE last_seen < ?",
+                    (now - self.spill_ttl_seconds,),
+                )
+        return evicted
+
+    def _evict(self, session_id: str, reason: str) -> Tuple[str, Any, float]:
+        session, size, last_seen = self._sessions.pop(session_id)
+        self._bytes -= size
+        self._evictions.inc(reason)
+        return session_id, session, last_seen
+
+    def _spill_sessions(self, evicted: List[Tuple[str, Any, float]]) -> None:
+        if self._spill is None or not evicted:
+            return
+        with self._spill:
+            self._spill.executemany(
+                "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?)",
+                [
+                    (session_id, pickle.dumps(session, pickle.HIGHEST_PROTOCOL), seen)
+                    for session_id, session, seen in evicted
+                ],
+            )
+
+    def _load_spilled(self, session_id: str) -> Optional[Any]:
+        if self._spill is None:
+            return None
+        row = self._spill.execute(
+            "SELECT state FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        return None if row is None else pickle.loads(row[0])
+
+    def _drop_spilled(self, session_id: str) -> None:
+        if self._spill is None:
+            return
+        with self._spill:
+            self._spill.execute(
+                "DELETE FROM sessions WHERE session_id = ?", (session_id,)
+            )
+
+    def _report(self) -> None:
+        self._resident_bytes.set(self._bytes)
+        self._resident.set(len(self._sessions))
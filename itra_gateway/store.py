@@ -0,0 +1,504 @@
+# ITRA assessment persistence (SQLite, standard library only)
+#
+# Completed assessments are stored in three tables:
+#
+#   profiles     one row per distinct gateway answer set, with its answer
+#                code, its enabled paths as a bit mask and its total
+#                question count
+#   assessments  one row per completed assessment, pointing at its profile,
+#                with the export metadata (timestamp, start_time, duration
+#                and the rules version it was scoped under, NULL if unknown)
+#   rollup       assessment counts and question sums per asset type, business
+#                impact and assessment path, updated in the same transaction
+#                as every insert so the portfolio dashboard reads at most a
+#                few hundred rows however many assessments are stored
+#   scoring      the rules version (and fingerprint) the profiles and rollup
+#                were scored under; opening the store with other rules in
+#                force rescores every profile and rebuilds the rollup
+#
+# The gateway answer space is small, so the profiles table stays tiny even
+# with millions of assessments. Queries such as "all GxP + AI assets with
+# High business impact" resolve the matching profiles first and then read
+# assessments through the profile index, which keeps them in milliseconds.
+
+import sqlite3
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+from itra_gateway.engine import (
+    GATEWAY_KEYS,
+    PATH_NAMES,
+    RULES_FINGERPRINT,
+    RULES_VERSION,
+    answer_code,
+    calculate_assessment_paths,
+    total_questions,
+)
+
+# Column per gateway question, e.g. "B.2" -> "b_2"
+ANSWER_COLUMNS = {key: key.lower().replace(".", "_") for key in GATEWAY_KEYS}
+
+# Bit per assessment path in profiles.enabled_paths
+PATH_BITS = {name: 1 << index for index, name in enumerate(PATH_NAMES)}
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS profiles (
+    profile_id INTEGER PRIMARY KEY,
+    {", ".join(f"{column} TEXT NOT NULL" for column in ANSWER_COLUMNS.values())},
+    answer_code INTEGER,
+    enabled_paths INTEGER NOT NULL,
+    total_questions INTEGER NOT NULL,
+    UNIQUE ({", ".join(ANSWER_COLUMNS.values())})
+);
+{"".join(
+    f"CREATE INDEX IF NOT EXISTS profiles_{column} ON profiles ({column});"
+    for column in ANSWER_COLUMNS.values()
+)}
+CREATE INDEX IF NOT EXISTS profiles_enabled_paths ON profiles (enabled_paths);
+
+CREATE TABLE IF NOT EXISTS assessments (
+    assessment_id INTEGER PRIMARY KEY,
+    profile_id INTEGER NOT NULL REFERENCES profiles (profile_id),
+    timestamp TEXT NOT NULL,
+    start_time TEXT NOT NULL,
+    duration_minutes REAL NOT NULL,
+    rules_version TEXT
+);
+CREATE INDEX IF NOT EXISTS assessments_profile
+    ON assessments (profile_id, assessment_id);
+CREATE INDEX IF NOT EXISTS assessments_timestamp ON assessments (timestamp);
+
+CREATE TABLE IF NOT EXISTS rollup (
+    asset_type TEXT NOT NULL,
+    impact TEXT NOT NULL,
+    path TEXT NOT NULL,
+    assessments INTEGER NOT NULL,
+    questions INTEGER NOT NULL,
+    PRIMARY KEY (asset_type, impact, path)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS scoring (
+    rules_version TEXT NOT NULL,
+    rules_fingerprint TEXT NOT NULL
+);
+"""
+
+# Created after _migrate, which adds the column to older databases.
+# NULL (answers outside the answer domains) is allowed more than once.
+_ANSWER_CODE_INDEX = (
+    "CREATE UNIQUE INDEX IF NOT EXISTS profiles_answer_code ON profiles (answer_code)"
+)
+
+_ADD_TO_ROLLUP = (
+    "INSERT INTO rollup VALUES (?, ?, ?, ?, ?) "
+    "ON CONFLICT (asset_type, impact, path) DO UPDATE SET "
+    "assessments = assessments + excluded.assessments, "
+    "questions = questions + excluded.questions"
+)
+
+# rollup.path of the row counting every assessment (and total questions)
+ALL_PATHS = ""
+
+_INSERT_ASSESSMENT = (
+    "INSERT INTO assessments "
+    "(profile_id, timestamp, start_time, duration_minutes, rules_version) "
+    "VALUES (?, ?, ?, ?, ?)"
+)
+
+
+@dataclass(frozen=True)
+class StoredAssessment:
+    assessment_id: int
+    answers: Dict[str, str]
+    answer_code: Optional[int]
+    enabled_paths: Tuple[str, ...]
+    total_questions: int
+    timestamp: str
+    start_time: str
+    duration_minutes: float
+    # Rules the assessment was scoped under; the profile columns above are
+    # always scored under the rules in force
+    rules_version: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class RollupRow:
+    """Assessments and question load for one asset type, impact and path
+
+    Unanswered asset type or impact is "", and `path` is ALL_PATHS for the
+    row counting every assessment with its total questions.
+    """
+
+    asset_type: str
+    impact: str
+    path: str
+    assessments: int
+    questions: int
+
+
+# (asset_type, impact, path, questions) rows one assessment adds to the rollup
+RollupShare = Tuple[Tuple[str, str, str, int], ...]
+
+
+def _profile_key(answers: Mapping[str, str]) -> Tuple[str, ...]:
+    # Unanswered questions are stored as "" so the UNIQUE constraint holds
+    return tuple(answers.get(key) or "" for key in GATEWAY_KEYS)
+
+
+def _rollup_share(values: Tuple[str, ...]) -> RollupShare:
+    """What one assessment with these profile answer columns adds to the rollup"""
+    answers = dict(zip(GATEWAY_KEYS, values))
+    paths = calculate_assessment_paths({k: v for k, v in answers.items() if v})
+    cell = (answers["asset_type"], answers["B.13"])
+    return ((*cell, ALL_PATHS, total_questions(paths)),) + tuple(
+        (*cell, path.name, path.question_count) for path in paths if path.enabled
+    )
+
+
+def _path_mask(paths: Iterable[str]) -> int:
+    mask = 0
+    for name in paths:
+        if name not in PATH_BITS:
+            raise ValueError(f"unknown assessment path: {name!r}")
+        mask |= PATH_BITS[name]
+    return mask
+
+
+class AssessmentStore:
+    """SQLite store of completed assessments (export_configuration documents)"""
+
+    def __init__(self, path: str, batch_size: int = 500):
+        self.path = path
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        # Answer code (or answer columns when there is none) -> profile id
+        self._profile_ids: Dict[Union[int, Tuple[str, ...]], int] = {}
+        # Profile id -> its assessments' share of the rollup
+        self._rollup_shares: Dict[int, RollupShare] = {}
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+            self._migrate()
+            self._conn.execute(_ANSWER_CODE_INDEX)
+            scored = self._conn.execute(
+                "SELECT rules_fingerprint FROM scoring"
+            ).fetchone()
+            if scored is None or scored[0] != RULES_FINGERPRINT:
+                self._rescore()
+            elif self._conn.execute("SELECT 1 FROM rollup LIMIT 1").fetchone() is None:
+                # New table in an older database, or an empty store
+                self._rebuild_rollup()
+
+    def _migrate(self) -> None:
+        """Add columns that older databases lack"""
+        columns = {
+            row[1] for row in self._conn.execute("PRAGMA table_info(assessments)")
+        }
+        if "rules_version" not in columns:
+            # Which rules earlier assessments were scoped under is not known
+            self._conn.execute("ALTER TABLE assessments ADD COLUMN rules_version TEXT")
+
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(profiles)")}
+        if "answer_code" in columns:
+            return
+        self._conn.execute("ALTER TABLE profiles ADD COLUMN answer_code INTEGER")
+        rows = self._conn.execute(
+            f"SELECT profile_id, {', '.join(ANSWER_COLUMNS.values())} FROM profiles"
+        ).fetchall()
+        self._conn.executemany(
+            "UPDATE profiles SET answer_code = ? WHERE profile_id = ?",
+            [
+                (
+                    answer_code({k: v for k, v in zip(GATEWAY_KEYS, row[1:]) if v}),
+                    row[0],
+                )
+                for row in rows
+            ],
+        )
+
+    def _rescore(self) -> None:
+        """Score every profile under the rules in force and rebuild the rollup"""
+        columns = ", ".join(ANSWER_COLUMNS.values())
+        updates = []
+        for profile_id, *values in self._conn.execute(
+            f"SELECT profile_id, {columns} FROM profiles"
+        ).fetchall():
+            paths = calculate_assessment_paths(
+                {k: v for k, v in zip(GATEWAY_KEYS, values) if v}
+            )
+            enabled = _path_mask(path.name for path in paths if path.enabled)
+            updates.append((enabled, total_questions(paths), profile_id))
+        self._conn.executemany(
+            "UPDATE profiles SET enabled_paths = ?, total_questions = ? "
+            "WHERE profile_id = ?",
+            updates,
+        )
+        self._conn.execute("DELETE FROM scoring")
+        self._conn.execute(
+            "INSERT INTO scoring VALUES (?, ?)", (RULES_VERSION, RULES_FINGERPRINT)
+        )
+        self._rebuild_rollup()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "AssessmentStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # Writes
+
+    def _profile_id(self, answers: Mapping[str, str]) -> int:
+        """Look up or create the profile row for an answer set"""
+        code = answer_code(answers)
+        values = _profile_key(answers)
+        key = values if code is None else code
+        profile_id = self._profile_ids.get(key)
+        if profile_id is not None:
+            return profile_id
+
+        columns = ", ".join(ANSWER_COLUMNS.values())
+        if code is None:
+            where = " AND ".join(f"{column} = ?" for column in ANSWER_COLUMNS.values())
+            row = self._conn.execute(
+                f"SELECT profile_id FROM profiles WHERE {where}", values
+            ).fetchone()
+        else:
+            row = self._conn.execute(
+                "SELECT profile_id FROM profiles WHERE answer_code = ?", (code,)
+            ).fetchone()
+        if row is None:
+            paths = calculate_assessment_paths(
+                {k: v for k, v in zip(GATEWAY_KEYS, values) if v}
+            )
+            enabled = _path_mask(path.name for path in paths if path.enabled)
+            cursor = self._conn.execute(
+                f"INSERT INTO profiles ({columns}, answer_code, enabled_paths, "
+                f"total_questions) VALUES ({', '.join('?' * len(values))}, ?, ?, ?)",
+                values + (code, enabled, total_questions(paths)),
+            )
+            row = (cursor.lastrowid,)
+
+        self._profile_ids[key] = row[0]
+        self._rollup_shares[row[0]] = _rollup_share(values)
+        return row[0]
+
+    def save_many(self, configs: Iterable[Mapping[str, Any]]) -> int:
+        """Store export_configuration documents, one transaction per batch"""
+        saved = 0
+        batch: List[Mapping[str, Any]] = []
+        for config in configs:
+            batch.append(config)
+            if len(batch) >= self.batch_size:
+                saved += self._write_batch(batch)
+                batch = []
+        if batch:
+            saved += self._write_batch(batch)
+        return saved
+
+    def save(self, config: Mapping[str, Any]) -> int:
+        """Store one export_configuration document and return its id"""
+        with self._lock, self._transaction():
+            row = self._row(config)
+            assessment_id = self._conn.execute(_INSERT_ASSESSMENT, row).lastrowid
+            self._add_to_rollup({row[0]: 1})
+        return assessment_id
+
+    def _write_batch(self, batch: List[Mapping[str, Any]]) -> int:
+        with self._lock, self._transaction():
+            rows = [self._row(config) for config in batch]
+            self._conn.executemany(_INSERT_ASSESSMENT, rows)
+            self._add_to_rollup(Counter(row[0] for row in rows))
+        return len(rows)
+
+    def _add_to_rollup(self, counts: Mapping[int, int]) -> None:
+        """Add assessments (profile id -> how many) to the rollup"""
+        deltas: Dict[Tuple[str, str, str], List[int]] = {}
+        for profile_id, count in counts.items():
+            for asset_type, impact, path, questions in self._rollup_shares[profile_id]:
+                delta = deltas.setdefault((asset_type, impact, path), [0, 0])
+                delta[0] += count
+                delta[1] += count * questions
+        self._conn.executemany(
+            _ADD_TO_ROLLUP, [key + tuple(delta) for key, delta in deltas.items()]
+        )
+
+    def _rebuild_rollup(self) -> None:
+        """Recompute the rollup from every stored assessment"""
+        counts = dict(
+            self._conn.execute(
+                "SELECT profile_id, COUNT(*) FROM assessments GROUP BY profile_id"
+            )
+        )
+        columns = ", ".join(ANSWER_COLUMNS.values())
+        for profile_id, *values in self._conn.execute(
+            f"SELECT profile_id, {columns} FROM profiles"
+        ).fetchall():
+            self._rollup_shares[profile_id] = _rollup_share(tuple(values))
+        self._conn.execute("DELETE FROM rollup")
+        self._add_to_rollup(counts)
+
+    def _row(self, config: Mapping[str, Any]) -> Tuple:
+        metadata = config["assessment_metadata"]
+        return (
+            self._profile_id(config["gateway_answers"]),
+            metadata["timestamp"],
+            metadata["start_time"],
+            metadata["duration_minutes"],
+            metadata.get("rules_version"),
+        )
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        """Commit on success; on failure roll back and forget new profile ids"""
+        try:
+            with self._conn:
+                yield
+        except Exception:
+            self._profile_ids.clear()
+            self._rollup_shares.clear()
+            raise
+
+    # Queries
+
+    def _profile_filter(
+        self,
+        answers: Optional[Mapping[str, str]],
+        paths: Optional[Iterable[str]],
+    ) -> Tuple[str, List[Any]]:
+        """SQL selecting the profile ids that match answers and enabled paths"""
+        clauses = []
+        params: List[Any] = []
+        for key, value in (answers or {}).items():
+            if key not in ANSWER_COLUMNS:
+                raise ValueError(f"unknown gateway question: {key!r}")
+            clauses.append(f"{ANSWER_COLUMNS[key]} = ?")
+            params.append(value or "")
+        mask = _path_mask(paths or ())
+        if mask:
+            clauses.append("enabled_paths & ? = ?")
+            params.extend([mask, mask])
+
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return f"SELECT profile_id FROM profiles{where}", params
+
+    def count(
+        self,
+        answers: Optional[Mapping[str, str]] = None,
+        paths: Optional[Iterable[str]] = None,
+    ) -> int:
+        """Number of stored assessments matching answers and enabled paths"""
+        profiles, params = self._profile_filter(answers, paths)
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT COUNT(*) FROM assessments WHERE profile_id IN ({profiles})",
+                params,
+            ).fetchone()[0]
+
+    def profile_counts(
+        self,
+        answers: Optional[Mapping[str, str]] = None,
+        paths: Optional[Iterable[str]] = None,
+    ) -> List[Tuple[Dict[str, str], int]]:
+        """Each stored answer set matching the filters, with its assessment count"""
+        profiles, params = self._profile_filter(answers, paths)
+        columns = ", ".join(f"p.{column}" for column in ANSWER_COLUMNS.values())
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {columns}, COUNT(*) FROM assessments a "
+                "JOIN profiles p ON p.profile_id = a.profile_id "
+                f"WHERE a.profile_id IN ({profiles}) GROUP BY a.profile_id",
+                params,
+            ).fetchall()
+        return [
+            ({k: v for k, v in zip(GATEWAY_KEYS, row) if v}, row[-1]) for row in rows
+        ]
+
+    def assessment_ids(self, answers: Mapping[str, str]) -> List[int]:
+        """Ids of the stored assessments with exactly this answer set"""
+        profiles, params = self._profile_filter(
+            dict(zip(GATEWAY_KEYS, _profile_key(answers))), None
+        )
+        with self._lock:
+            return [
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT assessment_id FROM assessments "
+                    f"WHERE profile_id IN ({profiles}) ORDER BY assessment_id",
+                    params,
+                )
+            ]
+
+    def rollup(self) -> List[RollupRow]:
+        """The materialized portfolio rollup, one row per non-empty cell"""
+        with self._lock:
+            return [
+                RollupRow(*row)
+                for row in self._conn.execute(
+                    "SELECT asset_type, impact, path, assessments, questions "
+                    "FROM rollup"
+                )
+            ]
+
+    def find(
+        self,
+        answers: Optional[Mapping[str, str]] = None,
+        paths: Optional[Iterable[str]] = None,
+        limit: Optional[int] = None,
+        page_size: int = 1000,
+    ) -> Iterator[StoredAssessment]:
+        """Stored assessments matching answers and enabled paths, in id order"""
+        profiles, params = self._profile_filter(answers, paths)
+        columns = ", ".join(f"p.{column}" for column in ANSWER_COLUMNS.values())
+        sql = (
+            f"SELECT a.assessment_id, {columns}, p.answer_code, p.enabled_paths, "
+            "p.total_questions, "
+            "a.timestamp, a.start_time, a.duration_minutes, a.rules_version "
+            "FROM assessments a JOIN profiles p ON p.profile_id = a.profile_id "
+            f"WHERE a.profile_id IN ({profiles}) AND a.assessment_id > ? "
+            "ORDER BY a.assessment_id LIMIT ?"
+        )
+
+        # Keyset pagination keeps memory flat and never holds the lock while
+        # the caller consumes results
+        last_id = 0
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = page_size if remaining is None else min(page_size, remaining)
+            with self._lock:
+                rows = self._conn.execute(sql, params + [last_id, size]).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield _stored_assessment(row)
+            last_id = rows[-1][0]
+            if remaining is not None:
+                remaining -= len(rows)
+
+
+def _stored_assessment(row: Tuple) -> StoredAssessment:
+    values = row[1 : 1 + len(GATEWAY_KEYS)]
+    code, enabled, total, timestamp, start_time, duration, version = row[
+        1 + len(GATEWAY_KEYS) :
+    ]
+    return StoredAssessment(
+        assessment_id=row[0],
+        answers={k: v for k, v in zip(GATEWAY_KEYS, values) if v},
+        answer_code=code,
+        enabled_paths=tuple(name for name, bit in PATH_BITS.items() if enabled & bit),
+        total_questions=total,
+        timestamp=timestamp,
+        start_time=start_time,
+        duration_minutes=duration,
+        rules_version=version,
+    )
@@ -0,0 +1,350 @@
+# ITRA sync of exported assessments to ServiceNow IRM (standard library only)
+#
+# Export documents are queued by the app (or the `itra-gateway sync` command)
+# and pushed from background threads, so clicking Export never waits on
+# the network. Records are sent in batches to an Import Set style endpoint
+#
+#   POST {url}  {"records": [{"u_idempotency_key": ..., "u_assessment": ...}]}
+#
+# over a small pool of keep-alive connections, with at most `concurrency`
+# batches in flight. Every record carries an idempotency key derived from its
+# content (coalesce on u_idempotency_key to upsert), and every batch an
+# Idempotency-Key header, so retries after timeouts never create duplicates.
+# Retries back off exponentially with jitter and honour Retry-After. Batches
+# that still fail are appended to an optional spool file (JSON lines) and
+# queued again by the next IRMSync opened on it.
+#
+# scripts/irm_standin.py is a local stand-in endpoint for testing.
+
+import hashlib
+import http.client
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Mapping, Optional
+from urllib.parse import urlsplit
+
+from itra_gateway.metrics import REGISTRY, Registry
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+logger = logging.getLogger("itra.sync")
+
+
+class SyncError(Exception):
+    """A batch was rejected or could not be delivered"""
+
+
+def idempotency_key(config: Mapping[str, Any]) -> str:
+    """Content hash of an export document, stable across processes"""
+    canonical = json.dumps(config, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def irm_record(config: Mapping[str, Any]) -> Dict[str, str]:
+    """Import set row for one export document"""
+    return {
+        "u_idempotency_key": idempotency_key(config),
+        "u_assessment": json.dumps(config, separators=(",", ":")),
+    }
+
+
+class IRMClient:
+    """Keep-alive connection pool with retrying batched upserts"""
+
+    def __init__(
+        self,
+        url: str,
+        headers: Optional[Mapping[str, str]] = None,
+        pool_size: int = 4,
+        timeout: float = 30.0,
+        retries: int = 5,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        registry: Registry = REGISTRY,
+    ):
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"IRM url must be http or https: {url!r}")
+        self._connection_class = (
+            http.client.HTTPSConnection
+            if parts.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        self._netloc = parts.netloc
+        self.path = parts.path or "/"
+        if parts.query:
+            self.path += f"?{parts.query}"
+        self.headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+            **(headers or {}),
+        }
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+        # Idle connections, most recently used first; the semaphore caps
+        # how many exist at once
+        self._idle: List[http.client.HTTPConnection] = []
+        self._slots = threading.BoundedSemaphore(pool_size)
+        self._lock = threading.Lock()
+
+        self._request_seconds = registry.histogram(
+            "itra_irm_request_seconds", "IRM batch request time", ["status"]
+        )
+        self._retries = registry.counter(
+            "itra_irm_retries_total", "IRM batch requests retried"
+        )
+
+    @contextmanager
+    def _connection(self) -> Iterator[http.client.HTTPConnection]:
+        with self._slots:
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                conn = self._connection_class(self._netloc, timeout=self.timeout)
+            try:
+                yield conn
+            except BaseException:
+                conn.close()
+                raise
+            with self._lock:
+                self._idle.append(conn)
+
+    def close(self) -> None:
+        with self._lock:
+            for conn in self._idle:
+                conn.close()
+            self._idle.clear()
+
+    def _post(self, body: bytes, key: str) -> http.client.HTTPResponse:
+        started = time.perf_counter()
+        status = "error"
+        try:
+            with self._connection() as conn:
+                conn.request(
+                    "POST", self.path, body, {**self.headers, "Idempotency-Key": key}
+                )
+                response = conn.getresponse()
+                response.read()
+                if response.will_close:
+                    conn.close()
+            status = str(response.status)
+            return response
+        finally:
+            self._request_seconds.observe(time.perf_counter() - started, status)
+
+    def _delay(self, attempt: int, retry_after: Optional[str]) -> float:
+        if retry_after:
+            try:
+                return min(float(retry_after), self.max_backoff)
+            except ValueError:
+                pass
+        delay = min(self.max_backoff, self.backoff * 2**attempt)
+        return delay * random.uniform(0.5, 1.0)
+
+    def upsert(self, records: List[Dict[str, str]]) -> None:
+        """Send one batch, retrying transient failures; SyncError if it fails"""
+        body = json.dumps({"records": records}, separators=(",", ":")).encode()
+        key = hashlib.sha256(
+            "".join(record["u_idempotency_key"] for record in records).encode()
+        ).hexdigest()
+
+        for attempt in range(self.retries + 1):
+            retry_after = None
+            try:
+                response = self._post(body, key)
+            except (OSError, http.client.HTTPException) as error:
+                problem = f"{type(error).__name__}: {error}"
+            else:
+                if 200 <= response.status < 300:
+                    return
+                if response.status not in RETRY_STATUSES:
+                    raise SyncError(f"IRM rejected the batch: HTTP {response.status}")
+                problem = f"HTTP {response.status}"
+                retry_after = response.getheader("Retry-After")
+
+            if attempt == self.retries:
+                raise SyncError(
+                    f"IRM batch failed after {attempt + 1} tries: {problem}"
+                )
+            self._retries.inc()
+            time.sleep(self._delay(attempt, retry_after))
+
+
+class IRMSync:
+    """Background batching of export documents to IRM
+
+    submit() only enqueues. A dispatcher thread groups records into batches
+    of up to `batch_size`, waiting at most `linger` seconds for a batch to
+    fill, and hands them to `concurrency` sender threads. When more than
+    `max_pending` records are waiting, non-blocking submits are dropped and
+    counted rather than growing memory.
+
+    With a `spool_path`, batches that fail after their retries are kept
+    there and sent again by the next instance opened on the same file (one
+    process at a time).
+    """
+
+    def __init__(
+        self,
+        client: IRMClient,
+        batch_size: int = 100,
+        linger: float = 1.0,
+        concurrency: int = 4,
+        max_pending: int = 10_000,
+        spool_path: Optional[str] = None,
+        registry: Registry = REGISTRY,
+    ):
+        self.client = client
+        self.spool_path = spool_path
+        self._spool_lock = threading.Lock()
+        self.batch_size = batch_size
+        self.linger = linger
+        self._queue: "queue.Queue[Dict[str, str]]" = queue.Queue(max_pending)
+        self._in_flight = threading.BoundedSemaphore(concurrency)
+        self._senders = ThreadPoolExecutor(concurrency, thread_name_prefix="irm-sync")
+        self._records = registry.counter(
+            "itra_irm_records_total", "Assessments synced to IRM", ["outcome"]
+        )
+        # This instance's own outcomes; the metric is shared process-wide
+        self._outcomes = {"sent": 0, "failed": 0, "dropped": 0}
+        self._outcomes_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+        self._dispatcher.start()
+        self.requeued = self._requeue() if spool_path else 0
+
+    @property
+    def _resend_path(self) -> str:
+        return f"{self.spool_path}.resend"
+
+    def _requeue(self) -> int:
+        """Queue the records earlier instances spooled; returns how many"""
+        # Move the spool aside first: records failing again are spooled
+        # afresh, and the moved file is only removed once a clean close has
+        # sent or re-spooled them, so a crash in between loses nothing
+        if os.path.exists(self.spool_path):
+            with (
+                open(self.spool_path, "rb") as spool,
+                open(self._resend_path, "ab") as resend,
+            ):
+                resend.write(spool.read())
+                resend.flush()
+                os.fsync(resend.fileno())
+            os.remove(self.spool_path)
+        if not os.path.exists(self._resend_path):
+            return 0
+        count = 0
+        with open(self._resend_path, encoding="utf-8") as resend:
+            for number, line in enumerate(resend, 1):
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    logger.warning(
+                        "skipping unreadable line %d of %s", number, self._resend_path
+                    )
+                    continue
+                self._queue.put(record)
+                count += 1
+        return count
+
+    def submit(self, config: Mapping[str, Any], block: bool = False) -> bool:
+        """Queue an export document; False if it was dropped"""
+        try:
+            self._queue.put(irm_record(config), block=block)
+        except queue.Full:
+            self._count("dropped", 1)
+            return False
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        """Records sent, failed and dropped by this instance so far"""
+        with self._outcomes_lock:
+            return dict(self._outcomes)
+
+    def _count(self, outcome: str, amount: int) -> None:
+        self._records.inc(outcome, amount=amount)
+        with self._outcomes_lock:
+            self._outcomes[outcome] += amount
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued record is sent or has failed"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """Flush, then stop the background threads"""
+        flushed = self.flush(timeout)
+        self._closed.set()
+        self._dispatcher.join()
+        self._senders.shutdown(wait=True)
+        self.client.close()
+        if flushed and self.spool_path and os.path.exists(self._resend_path):
+            # Every resent record was delivered or spooled again
+            os.remove(self._resend_path)
+        return flushed
+
+    def _dispatch(self) -> None:
+        while not self._closed.is_set():
+            try:
+                batch = [self._queue.get(timeout=0.1)]
+            except queue.Empty:
+                continue
+            deadline = time.monotonic() + self.linger
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    batch.append(
+                        self._queue.get(timeout=remaining)
+                        if remaining > 0
+                        else self._queue.get_nowait()
+                    )
+                except queue.Empty:
+                    break
+            # Blocks while `concurrency` batches are already in flight
+            self._in_flight.acquire()
+            self._senders.submit(self._send, batch)
+
+    def _send(self, batch: List[Dict[str, str]]) -> None:
+        try:
+            self.client.upsert(batch)
+            self._count("sent", len(batch))
+        except Exception:
+            if self.spool_path:
+                self._spool(batch)
+                logger.exception(
+                    "IRM sync failed, kept %d assessments in %s for the next sync",
+                    len(batch),
+                    self.spool_path,
+                )
+            else:
+                logger.exception(
+                    "dropping %d assessments after IRM sync failed", len(batch)
+                )
+            self._count("failed", len(batch))
+        finally:
+            self._in_flight.release()
+            for _ in batch:
+                self._queue.task_done()
+
+    def _spool(self, batch: List[Dict[str, str]]) -> None:
+        lines = "".join(json.dumps(record) + "\n" for record in batch)
+        with self._spool_lock, open(self.spool_path, "a", encoding="utf-8") as spool:
+            spool.write(lines)
+            spool.flush()
+            os.fsync(spool.fileno())
@@ -0,0 +1,225 @@
+# ITRA answer dwell telemetry (standard library only)
+#
+# The full assessment records how long users spend on each follow-up
+# question: the time from the section being shown, or from the previous
+# answer, to the answer. Dwell times are aggregated in process into
+# log-bucketed quantile sketches (one per question and one per assessment
+# path) with a fixed relative error and a fixed bucket count, so memory does
+# not grow with traffic and recording a sample is a log and two increments.
+#
+# Sketches are mergeable: each process periodically adds the counts it
+# recorded since its last flush to a SQLite file and reads back the combined
+# counts, so every process (and every restart) estimates from the history of
+# all of them, at most one flush interval behind.
+
+import math
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from itra_gateway.engine import Scope, estimate_time_range
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dwell (
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (kind, name, bucket)
+) WITHOUT ROWID;
+"""
+
+_UPSERT = (
+    "INSERT INTO dwell VALUES (?, ?, ?, ?) "
+    "ON CONFLICT (kind, name, bucket) DO UPDATE SET count = count + excluded.count"
+)
+
+# Sketch subjects, keyed (kind, name)
+PATH = "path"
+QUESTION = "question"
+Subject = Tuple[str, str]
+
+
+class DwellSketch:
+    """Streaming quantiles of dwell seconds within a fixed relative error
+
+    Bucket i holds values in (gamma**(i-1), gamma**i] with gamma =
+    (1 + alpha) / (1 - alpha), so any quantile is returned within `alpha`
+    of the true value. Values are clamped to [min_seconds, max_seconds],
+    which fixes the number of buckets.
+    """
+
+    __slots__ = ("alpha", "min_seconds", "max_seconds", "_log_gamma", "_offset")
+
+    def __init__(
+        self,
+        alpha: float = 0.02,
+        min_seconds: float = 0.5,
+        max_seconds: float = 1800.0,
+    ):
+        self.alpha = alpha
+        self.min_seconds = min_seconds
+        self.max_seconds = max_seconds
+        self._log_gamma = math.log((1 + alpha) / (1 - alpha))
+        self._offset = self.index(min_seconds, offset=0)
+
+    @property
+    def size(self) -> int:
+        return self.index(self.max_seconds) + 1
+
+    def index(self, seconds: float, offset: Optional[int] = None) -> int:
+        """Bucket of a dwell time"""
+        seconds = min(max(seconds, self.min_seconds), self.max_seconds)
+        offset = self._offset if offset is None else offset
+        return math.ceil(math.log(seconds) / self._log_gamma) - offset
+
+    def value(self, index: int) -> float:
+        """Representative value of a bucket, within `alpha` of its members"""
+        gamma = math.exp(self._log_gamma)
+        return 2 * gamma ** (index + self._offset) / (gamma + 1)
+
+    def quantile(self, counts: List[int], q: float) -> Optional[float]:
+        """The q-quantile of the samples counted in `counts`"""
+        total = sum(counts)
+        if not total:
+            return None
+        rank = q * (total - 1)
+        seen = 0
+        for index, count in enumerate(counts):
+            seen += count
+            if seen > rank:
+                return self.value(index)
+        return self.value(len(counts) - 1)
+
+
+class DwellTelemetry:
+    """Per-question and per-path dwell sketches with periodic persistence
+
+    Estimates fall back to the engine's fixed per-question range for paths
+    with fewer than `min_samples` recorded answers. Dwell times longer than
+    `max_dwell` are treated as the user having stepped away and dropped.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        flush_interval: float = 60.0,
+        min_samples: int = 20,
+        max_dwell: float = 1800.0,
+        sketch: Optional[DwellSketch] = None,
+    ):
+        self.sketch = sketch or DwellSketch(max_seconds=max_dwell)
+        self.min_samples = min_samples
+        self.max_dwell = max_dwell
+        # subject -> bucket counts, all samples and those not yet flushed
+        self._counts: Dict[Subject, List[int]] = {}
+        self._unflushed: Dict[Subject, List[int]] = {}
+        self._size = self.sketch.size
+        self._lock = threading.Lock()
+
+        self._db = None
+        self._db_lock = threading.Lock()
+        self._stop = threading.Event()
+        # Count tables a sample is added to
+        self._tables = (self._counts, self._unflushed) if path else (self._counts,)
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            with self._db:
+                self._db.executescript(_SCHEMA)
+            self._counts.update(self._read())
+            threading.Thread(
+                target=self._flush_every, args=(flush_interval,), daemon=True
+            ).start()
+
+    def record(self, path_name: str, question_id: str, seconds: float) -> bool:
+        """Count one answer's dwell time; False if it was dropped as idle"""
+        if not 0 < seconds <= self.max_dwell:
+            return False
+        index = self.sketch.index(seconds)
+        with self._lock:
+            for subject in ((PATH, path_name), (QUESTION, question_id)):
+                for counts in self._tables:
+                    buckets = counts.get(subject)
+                    if buckets is None:
+                        buckets = counts[subject] = [0] * self._size
+                    buckets[index] += 1
+        return True
+
+    def quantiles(
+        self, kind: str, name: str, qs: Tuple[float, ...] = (0.5, 0.9)
+    ) -> Tuple[int, Tuple[Optional[float], ...]]:
+        """Sample count and dwell seconds at each quantile for one subject"""
+        with self._lock:
+            counts = list(self._counts.get((kind, name), ()))
+        return sum(counts), tuple(self.sketch.quantile(counts, q) for q in qs)
+
+    def estimate(self, scope: Scope) -> Tuple[int, int]:
+        """Estimated (p50, p90) minutes for the enabled paths' questions"""
+        low = high = 0.0
+        for path in scope:
+            if not path.enabled or not path.question_count:
+                continue
+            samples, (p50, p90) = self.quantiles(PATH, path.name)
+            if samples >= self.min_samples:
+                low += path.question_count * p50 / 60
+                high += path.question_count * p90 / 60
+            else:
+                fixed_low, fixed_high = estimate_time_range(path.question_count)
+                low += fixed_low
+                high += fixed_high
+        return int(low), max(int(high), int(low))
+
+    # Persistence
+
+    def _read(self) -> Dict[Subject, List[int]]:
+        """Counts in the file, recorded by every process that shares it"""
+        size = self._size
+        counts: Dict[Subject, List[int]] = {}
+        for kind, name, bucket, count in self._db.execute(
+            "SELECT kind, name, bucket, count FROM dwell"
+        ):
+            # Skip buckets written with a different sketch configuration
+            if 0 <= bucket < size:
+                counts.setdefault((kind, name), [0] * size)[bucket] += count
+        return counts
+
+    def flush(self) -> int:
+        """Write this process's new counts and merge in everyone else's"""
+        with self._db_lock:
+            if self._db is None:
+                return 0
+            with self._lock:
+                unflushed, self._unflushed = self._unflushed, {}
+                self._tables = (self._counts, self._unflushed)
+            rows = [
+                (kind, name, bucket, count)
+                for (kind, name), counts in unflushed.items()
+                for bucket, count in enumerate(counts)
+                if count
+            ]
+            with self._db:
+                self._db.executemany(_UPSERT, rows)
+            merged = self._read()
+            with self._lock:
+                # Samples recorded while the file was read are not in it yet
+                for subject, counts in self._unflushed.items():
+                    buckets = merged.setdefault(subject, [0] * self._size)
+                    for bucket, count in enumerate(counts):
+                        buckets[bucket] += count
+                self._counts = merged
+                self._tables = (self._counts, self._unflushed)
+            return len(rows)
+
+    def _flush_every(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            self.flush()
+
+    def close(self) -> None:
+        """Stop the flush thread and write what is left"""
+        self._stop.set()
+        self.flush()
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
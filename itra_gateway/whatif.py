@@ -0,0 +1,194 @@
+# ITRA what-if rescoring (standard library only)
+#
+# Rescores stored assessments under a candidate rule set and reports what
+# would change per assessment path, per asset type and per answer profile,
+# listing the ids of the assessments whose scope would change. The store
+# groups assessments by answer profile, so each distinct answer set is scored
+# once under each rule set (a table index for in-domain answers) and weighted
+# by its assessment count; 100k stored assessments rescore in milliseconds.
+
+from dataclasses import asdict, dataclass, field
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+from itra_gateway.engine import RULES, RuleSet
+
+
+@dataclass
+class Delta:
+    """Assessments and follow-up questions before and after a rule change"""
+
+    assessments_before: int = 0
+    assessments_after: int = 0
+    questions_before: int = 0
+    questions_after: int = 0
+
+    @property
+    def assessments_change(self) -> int:
+        return self.assessments_after - self.assessments_before
+
+    @property
+    def questions_change(self) -> int:
+        return self.questions_after - self.questions_before
+
+
+@dataclass
+class ProfileChange:
+    """Stored assessments sharing one answer set whose scope would change"""
+
+    answers: Dict[str, str]
+    assessments: int
+    questions_before: int
+    questions_after: int
+    paths_enabled: List[str]
+    paths_disabled: List[str]
+    assessment_ids: List[int] = field(default_factory=list)
+
+
+@dataclass
+class WhatIfReport:
+    baseline: str
+    candidate: str
+    total: Delta = field(default_factory=Delta)
+    # Assessments with the path enabled and the questions it asks them
+    paths: Dict[str, Delta] = field(default_factory=dict)
+    # Assessments and total questions per asset type ("" when unanswered)
+    asset_types: Dict[str, Delta] = field(default_factory=dict)
+    # Answer profiles whose enabled paths or question total would change,
+    # most assessments first
+    changed: List[ProfileChange] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def rescore(
+    profiles: Iterable[Tuple[Mapping[str, str], int]],
+    candidate: RuleSet,
+    baseline: RuleSet = RULES,
+    assessment_ids: Optional[Callable[[Mapping[str, str]], List[int]]] = None,
+) -> WhatIfReport:
+    """Compare two rule sets over (answers, assessment count) profiles
+
+    `assessment_ids` looks up the stored assessments of an answer set; it is
+    only called for the profiles that change.
+    """
+    report = WhatIfReport(baseline.version, candidate.version)
+    # Paths of both versions, baseline order first
+    for name in baseline.names + candidate.names:
+        report.paths.setdefault(name, Delta())
+
+    for answers, count in profiles:
+        asset_type = report.asset_types.setdefault(
+            answers.get("asset_type", ""), Delta()
+        )
+        enabled: Dict[bool, List[str]] = {}
+        totals: Dict[bool, int] = {}
+        for scope, before in (
+            (baseline.scope(answers), True),
+            (candidate.scope(answers), False),
+        ):
+            questions = 0
+            enabled[before] = []
+            for path in scope:
+                if not path.enabled:
+                    continue
+                questions += path.question_count
+                enabled[before].append(path.name)
+                _add(
+                    report.paths[path.name], before, count, count * path.question_count
+                )
+            totals[before] = questions
+            _add(report.total, before, count, count * questions)
+            _add(asset_type, before, count, count * questions)
+
+        if enabled[True] != enabled[False] or totals[True] != totals[False]:
+            report.changed.append(
+                ProfileChange(
+                    answers=dict(answers),
+                    assessments=count,
+                    questions_before=totals[True],
+                    questions_after=totals[False],
+                    paths_enabled=[p for p in enabled[False] if p not in enabled[True]],
+                    paths_disabled=[
+                        p for p in enabled[True] if p not in enabled[False]
+                    ],
+                    assessment_ids=assessment_ids(answers) if assessment_ids else [],
+                )
+            )
+    report.changed.sort(key=lambda change: -change.assessments)
+    return report
+
+
+def _add(delta: Delta, before: bool, assessments: int, questions: int) -> None:
+    if before:
+        delta.assessments_before += assessments
+        delta.questions_before += questions
+    else:
+        delta.assessments_after += assessments
+        delta.questions_after += questions
+
+
+def _row(label: str, delta: Delta) -> str:
+    return (
+        f"{label:<40} {delta.assessments_before:>9,} {delta.assessments_after:>9,} "
+        f"{delta.assessments_change:>+9,} {delta.questions_before:>11,} "
+        f"{delta.questions_after:>11,} {delta.questions_change:>+11,}"
+    )
+
+
+def _header(label: str) -> str:
+    return (
+        f"{label:<40} {'assessed':>9} {'after':>9} {'change':>9} "
+        f"{'questions':>11} {'after':>11} {'change':>11}"
+    )
+
+
+def format_report(report: WhatIfReport) -> Iterator[str]:
+    """The report as a plain text table, one line at a time"""
+    yield f"Rules {report.baseline} -> {report.candidate}"
+    yield ""
+    yield _header("Assessment path")
+    for name, delta in report.paths.items():
+        yield _row(name, delta)
+    yield ""
+    yield _header("Asset type")
+    for asset_type, delta in sorted(report.asset_types.items()):
+        yield _row(asset_type or "(unanswered)", delta)
+    yield ""
+    yield _row("All assessments", report.total)
+    yield ""
+    changed = sum(change.assessments for change in report.changed)
+    yield (
+        f"{changed:,} assessments in {len(report.changed):,} answer profiles "
+        "would change scope"
+    )
+    for change in report.changed:
+        yield ""
+        yield ", ".join(f"{key}={value}" for key, value in change.answers.items())
+        yield (
+            f"  {change.assessments:,} assessments, questions "
+            f"{change.questions_before} -> {change.questions_after}"
+        )
+        if change.paths_enabled:
+            yield f"  enables: {', '.join(change.paths_enabled)}"
+        if change.paths_disabled:
+            yield f"  skips: {', '.join(change.paths_disabled)}"
+        if change.assessment_ids:
+            yield f"  ids: {_ids(change.assessment_ids)}"
+
+
+def _ids(ids: List[int], shown: int = 10) -> str:
+    text = ", ".join(str(i) for i in ids[:shown])
+    if len(ids) > shown:
+        text += f" and {len(ids) - shown:,} more (--json lists all)"
+    return text
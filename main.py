@@ -1,6 +1,10 @@
-def main():
-    print("Hello from itra-gateway-app!")
+# ITRA Gateway command line, for running from a checkout
+# Run with: uv run python main.py scope inventory.csv -o scoped.ndjson
+# (installed as the `itra-gateway` command, see itra_gateway/cli.py)
 
+import sys
+
+from itra_gateway.cli import main
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,342 @@
+# ITRA benchmark suite with regression gating
+# Run with: uv run python scripts/benchmark.py --check
+#
+# Drives the real Streamlit app headlessly through AppTest (per-phase answer
+# changes, the full assessment preview and the export), microbenchmarks
+# the scoping engine over the whole answer space and times imports and CLI
+# startup in fresh interpreters. Results are written as
+# JSON; --check compares them with scripts/benchmark_baseline.json and exits
+# non-zero when a benchmark is slower than its baseline by more than its
+# allowed ratio. --update-baseline records the current numbers.
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+from datetime import datetime
+from typing import Callable, Dict, List, Sequence
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+APP_PATH = os.path.join(ROOT, "streamlit_itra_app.py")
+BASELINE_PATH = os.path.join(ROOT, "scripts", "benchmark_baseline.json")
+
+# Allowed slowdown before --check fails, unless the baseline overrides it.
+# App timings include Streamlit itself and vary more between runs.
+DEFAULT_MAX_RATIO = {"us": 1.5, "ms": 1.75}
+
+Results = Dict[str, Dict[str, float]]
+
+
+def _result(value: float, unit: str) -> Dict:
+    return {"value": round(value, 3), "unit": unit}
+
+
+def _per_call_us(func: Callable[[], object], repeat: int = 5) -> float:
+    """Best-of-N microseconds per call, timeit style"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e6
+
+
+# Engine and export microbenchmarks
+
+
+def bench_engine() -> Results:
+    from itra_gateway.catalog import CATALOG
+    from itra_gateway.engine import (
+        DECISION_TABLE,
+        GATEWAY_KEYS,
+        ScopeTracker,
+        calculate_assessment_paths,
+        evaluate_assessment_paths,
+        load_rules,
+    )
+    from itra_gateway.export import serialize_configuration
+    from itra_gateway.metrics import Registry
+    from itra_gateway.profiles import ProfileCache
+    from itra_gateway.report import report_html, report_pdf
+    from itra_gateway.telemetry import DwellTelemetry
+
+    # Every (possibly partial) answer set the app can produce
+    answer_space = [
+        {k: v for k, v in zip(GATEWAY_KEYS, values) if v is not None}
+        for values in DECISION_TABLE
+    ]
+
+    def lookup_all():
+        for answers in answer_space:
+            calculate_assessment_paths(answers)
+
+    def evaluate_all():
+        for answers in answer_space:
+            evaluate_assessment_paths(answers)
+
+    tracker = ScopeTracker(phases=[phase.keys for phase in CATALOG.phases])
+    for key in GATEWAY_KEYS:
+        tracker.set_answer(key, CATALOG.questions[key].options[0].value)
+    flip = iter(["Yes", "No"] * 10_000_000)
+
+    complete = answer_space[0]
+    started = datetime.now()
+    telemetry = DwellTelemetry()
+    dwell = iter([2.5, 40.0, 310.0] * 10_000_000)
+    profiles = ProfileCache(registry=Registry())
+    metadata = {"timestamp": started.isoformat(), "start_time": started.isoformat()}
+    size = len(answer_space)
+    return {
+        "calculate_assessment_paths": _result(_per_call_us(lookup_all) / size, "us"),
+        "evaluate_assessment_paths": _result(_per_call_us(evaluate_all) / size, "us"),
+        "scope_tracker_set_answer": _result(
+            _per_call_us(lambda: tracker.set_answer("D.1", next(flip))), "us"
+        ),
+        "serialize_configuration": _result(
+            _per_call_us(lambda: serialize_configuration(complete, started)), "us"
+        ),
+        "rules_compile": _result(_per_call_us(load_rules, repeat=3) / 1000, "ms"),
+        "profile_cache_hit": _result(
+            _per_call_us(lambda: profiles.get(complete)), "us"
+        ),
+        "report_html": _result(
+            _per_call_us(lambda: report_html(complete, metadata)), "us"
+        ),
+        "report_pdf": _result(
+            _per_call_us(lambda: report_pdf(complete, metadata)), "us"
+        ),
+        "dwell_telemetry_record": _result(
+            _per_call_us(lambda: telemetry.record("Path", "Q-1", next(dwell))), "us"
+        ),
+    }
+
+
+# Startup benchmarks (fresh interpreters, so nothing is cached in-process)
+
+# Scoping rules, catalog and export schema: standard library only
+CORE_MODULES = ("itra_gateway.engine", "itra_gateway.catalog", "itra_gateway.export")
+# Optional dependencies the core must never pull in
+HEAVY_MODULES = ("streamlit", "numpy")
+
+
+def _python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=ROOT,
+        env={**os.environ, "PYTHONPATH": ROOT},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _import_ms(modules: Sequence[str]) -> float:
+    """Cumulative -X importtime milliseconds of the package's modules"""
+    stderr = _python("-X", "importtime", "-c", f"import {', '.join(modules)}").stderr
+    total = 0
+    for line in stderr.splitlines():
+        # "import time: <self us> | <cumulative us> | <indent><module>"
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        # Top-level imports only; nested ones are in their cumulative time
+        if name[1:].startswith("itra_gateway"):
+            total += int(cumulative)
+    return total / 1000
+
+
+def bench_startup(rounds: int) -> Results:
+    loaded = _python(
+        "-c", f"import sys, {', '.join(CORE_MODULES)}; print(*sys.modules)"
+    ).stdout.split()
+    leaked = [module for module in HEAVY_MODULES if module in loaded]
+    if leaked:
+        raise RuntimeError(f"core modules import {', '.join(leaked)}")
+
+    def cli_help():
+        started = time.perf_counter()
+        _python("-m", "itra_gateway", "--help")
+        return (time.perf_counter() - started) * 1000
+
+    return {
+        "import_core_modules": _result(
+            min(_import_ms(CORE_MODULES) for _ in range(rounds)), "ms"
+        ),
+        "cli_startup": _result(min(cli_help() for _ in range(rounds)), "ms"),
+    }
+
+
+# App benchmarks (AppTest runs the script in-process, no browser or socket)
+
+
+def _timed_runs(action: Callable[[], object], rounds: int) -> float:
+    """Median milliseconds of `action` over `rounds` runs"""
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        action()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def bench_app(rounds: int) -> Results:
+    from streamlit.testing.v1 import AppTest
+
+    from itra_gateway.catalog import CATALOG
+
+    def fresh_app() -> "AppTest":
+        return AppTest.from_file(APP_PATH, default_timeout=30)
+
+    results: Results = {}
+    results["app_initial_load"] = _result(
+        _timed_runs(lambda: fresh_app().run(), rounds), "ms"
+    )
+
+    at = fresh_app().run()
+    selected: Dict[str, str] = {}
+    for phase in CATALOG.phases:
+        samples: List[float] = []
+        for round_index in range(rounds):
+            for question in phase.questions:
+                radio = at.radio(key=question.widget_key)
+                option = question.texts[(round_index + 1) % 2]
+                started = time.perf_counter()
+                radio.set_value(option).run()
+                samples.append((time.perf_counter() - started) * 1000)
+                selected[question.widget_key] = option
+                # AppTest keeps only the fragments a keyed rerun redrew, and
+                # forgets the other radios' values; an untimed full run with
+                # the answers restores the whole element tree
+                for key, value in selected.items():
+                    at.session_state[key] = value
+                at.run()
+        results[f"app_answer_{phase.key}"] = _result(statistics.median(samples), "ms")
+
+    def button(label: str):
+        return next(b for b in at.button if b.label == label)
+
+    def preview():
+        # Reset so each round draws the preview from scratch
+        at.session_state["show_full_assessment"] = False
+        at.run()
+        started = time.perf_counter()
+        button("📋 Generate Full Assessment").click().run()
+        return time.perf_counter() - started
+
+    def export():
+        started = time.perf_counter()
+        button("📤 Export Configuration").click().run()
+        return time.perf_counter() - started
+
+    results["app_full_assessment_preview"] = _result(
+        statistics.median(preview() * 1000 for _ in range(rounds)), "ms"
+    )
+    results["app_export_configuration"] = _result(
+        statistics.median(export() * 1000 for _ in range(rounds)), "ms"
+    )
+
+    # Full assessment: each Next loads (or finds prefetched) the next section
+    button("▶️ Start Full Assessment").click().run()
+    samples = []
+    while any(b.label == "Next ➡️" for b in at.button):
+        started = time.perf_counter()
+        button("Next ➡️").click().run()
+        samples.append((time.perf_counter() - started) * 1000)
+        at.run()
+    results["app_full_assessment_next"] = _result(statistics.median(samples), "ms")
+    if at.exception:
+        raise RuntimeError(f"app raised during the benchmark: {at.exception}")
+    return results
+
+
+# Baselines
+
+
+def compare(results: Results, baseline: Dict) -> List[str]:
+    """Benchmarks slower than their baseline allows"""
+    failures = []
+    for name, expected in baseline["benchmarks"].items():
+        current = results.get(name)
+        if current is None:
+            continue
+        limit = expected.get("max_ratio", DEFAULT_MAX_RATIO[expected["unit"]])
+        ratio = current["value"] / expected["value"] if expected["value"] else 1.0
+        if ratio > limit:
+            failures.append(
+                f"{name}: {current['value']} {current['unit']} is {ratio:.2f}x "
+                f"the baseline {expected['value']} (limit {limit}x)"
+            )
+    return failures
+
+
+def report(results: Results, baseline: Dict) -> None:
+    expected = baseline.get("benchmarks", {})
+    print(f"{'benchmark':<32} {'value':>10} {'baseline':>10} {'ratio':>6}")
+    for name, result in results.items():
+        base = expected.get(name, {}).get("value")
+        ratio = f"{result['value'] / base:.2f}" if base else "-"
+        print(
+            f"{name:<32} {result['value']:>8.3f}{result['unit']:>2} "
+            f"{base if base is not None else '-':>10} {ratio:>6}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the ITRA gateway")
+    parser.add_argument("--rounds", type=int, default=5, help="app runs per step")
+    parser.add_argument("--skip-app", action="store_true", help="engine only")
+    parser.add_argument("-o", "--output", help="write results JSON to this file")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument(
+        "--check", action="store_true", help="exit 1 on regressions vs the baseline"
+    )
+    parser.add_argument(
+        "--update-baseline", action="store_true", help="record results as baseline"
+    )
+    args = parser.parse_args()
+
+    results = bench_engine()
+    results.update(bench_startup(args.rounds))
+    if not args.skip_app:
+        results.update(bench_app(args.rounds))
+
+    baseline = {"benchmarks": {}}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    report(results, baseline)
+
+    document = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "benchmarks": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(document, f, indent=2)
+    if args.update_baseline:
+        # Keep hand-tuned thresholds when re-recording
+        for name, result in results.items():
+            previous = baseline["benchmarks"].get(name, {})
+            if "max_ratio" in previous:
+                result["max_ratio"] = previous["max_ratio"]
+        with open(args.baseline, "w") as f:
+            json.dump(document, f, indent=2)
+            f.write("\n")
+        print(f"baseline written to {args.baseline}")
+
+    if args.check:
+        failures = compare(results, baseline)
+        for failure in failures:
+            print(f"REGRESSION {failure}", file=sys.stderr)
+        return 1 if failures else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
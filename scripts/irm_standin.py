@@ -0,0 +1,139 @@
+# Local stand-in for the ServiceNow IRM import set endpoint
+# Run with: uv run python scripts/irm_standin.py --port 8765 --fail-rate 0.2
+#
+# Accepts POST /api/now/import/<table>/insertMultiple like the real endpoint,
+# upserts records on u_idempotency_key and replays the stored response for a
+# repeated Idempotency-Key header. Failures (503 with Retry-After) and latency
+# can be injected to exercise the retry path. GET /stats returns counters.
+
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict
+
+IMPORT_PATH = re.compile(r"^/api/now/import/(\w+)/insertMultiple$")
+
+
+class StandinIRM:
+    """In-memory import set endpoint on a background thread"""
+
+    def __init__(
+        self,
+        port: int = 0,
+        host: str = "127.0.0.1",
+        fail_rate: float = 0.0,
+        latency: float = 0.0,
+    ):
+        self.fail_rate = fail_rate
+        self.latency = latency
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self.stats = {"requests": 0, "failed": 0, "replayed": 0, "upserts": 0}
+        self._responses: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/api/now/import/u_itra_assessment/insertMultiple"
+
+    def start(self) -> "StandinIRM":
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _import(self, table: str, key: str, body: bytes) -> bytes:
+        with self._lock:
+            self.stats["requests"] += 1
+            if key and key in self._responses:
+                self.stats["replayed"] += 1
+                return self._responses[key]
+            results = []
+            for record in json.loads(body)["records"]:
+                coalesce = record["u_idempotency_key"]
+                action = "updated" if coalesce in self.records else "inserted"
+                self.records[coalesce] = record
+                self.stats["upserts"] += 1
+                results.append({"status": action, "sys_id": coalesce[:32]})
+            response = json.dumps({"table": table, "result": results}).encode()
+            if key:
+                self._responses[key] = response
+            return response
+
+    def _handler(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _reply(self, status: int, body: bytes, **headers: str) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name.replace("_", "-"), value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path != "/stats":
+                    self._reply(404, b"{}")
+                    return
+                with standin._lock:
+                    stats = {**standin.stats, "records": len(standin.records)}
+                self._reply(200, json.dumps(stats).encode())
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                match = IMPORT_PATH.match(self.path)
+                if match is None:
+                    self._reply(404, b"{}")
+                    return
+                if standin.latency:
+                    time.sleep(standin.latency)
+                if random.random() < standin.fail_rate:
+                    with standin._lock:
+                        standin.stats["failed"] += 1
+                    self._reply(503, b"{}", Retry_After="0")
+                    return
+                key = self.headers.get("Idempotency-Key", "")
+                self._reply(201, standin._import(match.group(1), key, body))
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Stand-in IRM import endpoint")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--fail-rate", type=float, default=0.0, help="share of requests answered 503"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="seconds added to each import"
+    )
+    args = parser.parse_args()
+
+    standin = StandinIRM(args.port, args.host, args.fail_rate, args.latency).start()
+    print(f"IRM stand-in listening on {standin.url}", file=sys.stderr)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        standin.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,336 @@
+# Concurrent-session load test for the Streamlit app
+# Run with: uv run python scripts/loadtest_app.py --spawn --users 1,4,16,32
+#
+# Simulates N assessors at once, each in its own websocket session, answering
+# the gateway questions of Phase 1 to 3 with a realistic answer mix, pausing
+# to read between clicks, then generating the full assessment preview and
+# exporting the configuration. Every concurrency level reports interaction
+# latency (p50/p95/p99, click -> script finished), throughput and the app
+# process's resident memory per open session, measured while all of the
+# level's sessions are still connected.
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from streamlit_client import StreamlitClient, start_app, wait_until_ready  # noqa: E402
+
+from itra_gateway.catalog import CATALOG  # noqa: E402
+
+# Share of assessments giving each answer (roughly what a mixed pharma
+# portfolio looks like); --db samples stored assessments instead
+ANSWER_MIX: Mapping[str, Mapping[str, float]] = {
+    "asset_type": {
+        "it_system": 0.40,
+        "computerised_equipment": 0.25,
+        "it_infrastructure": 0.20,
+        "health_software": 0.15,
+    },
+    "B.2": {"Yes": 0.60, "No": 0.40},
+    "T.6": {"Yes": 0.20, "No": 0.80},
+    "B.3": {"Yes": 0.25, "No": 0.75},
+    "S.1": {"Not Connected": 0.20, "1": 0.50, "2": 0.30},
+    "B.13": {"Low": 0.30, "Medium": 0.45, "High": 0.25},
+    "D.1": {"Yes": 0.60, "No": 0.40},
+    "D.2": {"Yes": 0.50, "No": 0.50},
+}
+
+GENERATE = "📋 Generate Full Assessment"
+EXPORT = "📤 Export Configuration"
+DOWNLOAD = "📥 Download Configuration JSON"
+
+
+class AnswerMix:
+    """Draws whole answer sets, per question or from stored assessments"""
+
+    def __init__(self, profiles: Optional[Sequence[Tuple[Dict, int]]] = None):
+        self.profiles = profiles
+
+    def draw(self, rng: random.Random) -> Dict[str, str]:
+        if self.profiles:
+            answers, _ = rng.choices(
+                self.profiles, weights=[count for _, count in self.profiles]
+            )[0]
+            return dict(answers)
+        return {
+            key: rng.choices(list(mix), weights=list(mix.values()))[0]
+            for key, mix in ANSWER_MIX.items()
+        }
+
+
+def option_text(key: str, value: str) -> str:
+    """The radio option a user clicks to give an answer"""
+    question = CATALOG.questions[key]
+    return question.options[CATALOG.value_to_index[key][value]].text
+
+
+@dataclass
+class Level:
+    users: int
+    walks: int = 0
+    interactions: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+    # Interaction latencies in seconds
+    latencies: List[float] = field(default_factory=list, repr=False)
+    # App resident memory once warmed up and with all the level's sessions
+    # open
+    rss_before: Optional[int] = None
+    rss_peak: Optional[int] = None
+
+    def percentile(self, fraction: float) -> float:
+        values = sorted(self.latencies)
+        if not values:
+            return 0.0
+        return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))]
+
+    @property
+    def throughput(self) -> float:
+        return self.interactions / self.seconds if self.seconds else 0.0
+
+    @property
+    def bytes_per_session(self) -> Optional[float]:
+        if self.rss_before is None or self.rss_peak is None:
+            return None
+        return (self.rss_peak - self.rss_before) / self.users
+
+    def to_dict(self) -> Dict:
+        data = asdict(self)
+        del data["latencies"]
+        data.update(
+            p50_ms=self.percentile(0.50) * 1000,
+            p95_ms=self.percentile(0.95) * 1000,
+            p99_ms=self.percentile(0.99) * 1000,
+            interactions_per_second=self.throughput,
+            bytes_per_session=self.bytes_per_session,
+        )
+        return data
+
+
+def resident_bytes(pid: Optional[int]) -> Optional[int]:
+    """Resident set size of a process (Linux /proc), None when unknown"""
+    if pid is None:
+        return None
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+async def walk(
+    client: StreamlitClient,
+    answers: Mapping[str, str],
+    rng: random.Random,
+    think: float,
+    timeout: float,
+    level: Level,
+) -> None:
+    """One assessor: load, answer every gateway question, generate and export"""
+
+    async def interact(action) -> None:
+        if think:
+            # Reading and deciding between clicks
+            await asyncio.sleep(rng.expovariate(1 / think))
+        started = time.perf_counter()
+        await asyncio.wait_for(action, timeout)
+        level.latencies.append(time.perf_counter() - started)
+        level.interactions += 1
+
+    await interact(client.run())
+    for phase in CATALOG.phases:
+        for key in phase.keys:
+            widget = client.widget(CATALOG.questions[key].widget_key)
+            option = option_text(key, answers[key])
+            # A radio already showing the answer is not clicked
+            if widget.value != option:
+                await interact(client.set_radio(widget.key, option))
+    await interact(client.click(GENERATE))
+    await interact(client.click(EXPORT))
+    client.widget(DOWNLOAD)  # KeyError when the export did not render
+
+
+async def user(
+    url: str,
+    mix: AnswerMix,
+    rng: random.Random,
+    args: argparse.Namespace,
+    level: Level,
+    all_walked: asyncio.Barrier,
+) -> None:
+    # Spread arrivals over the ramp instead of N simultaneous page loads
+    await asyncio.sleep(rng.uniform(0, args.ramp))
+    waited = False
+    for index in range(args.walks):
+        client = StreamlitClient(url)
+        try:
+            async with client:
+                await walk(client, mix.draw(rng), rng, args.think, args.timeout, level)
+                level.walks += 1
+                if index == args.walks - 1:
+                    # Hold the session open until every user is done, so the
+                    # memory reading covers all of the level's sessions
+                    waited = True
+                    await all_walked.wait()
+        except Exception as exc:
+            level.errors += 1
+            if args.verbose:
+                print(f"  walk failed: {exc!r}", file=sys.stderr)
+    if not waited:
+        await all_walked.wait()
+
+
+async def run_level(
+    url: str,
+    users: int,
+    mix: AnswerMix,
+    args: argparse.Namespace,
+    pid: Optional[int],
+    rss_before: Optional[int],
+) -> Level:
+    level = Level(users, rss_before=rss_before)
+    all_walked = asyncio.Barrier(users + 1)
+    rng = random.Random(f"{args.seed}:{users}")
+    started = time.perf_counter()
+    tasks = [
+        asyncio.create_task(
+            user(url, mix, random.Random(rng.random()), args, level, all_walked)
+        )
+        for _ in range(users)
+    ]
+    await all_walked.wait()
+    level.seconds = time.perf_counter() - started
+    level.rss_peak = resident_bytes(pid)
+    await asyncio.gather(*tasks)
+    return level
+
+
+def _megabytes(value: Optional[float]) -> str:
+    return f"{value / 2**20:>8.2f}" if value is not None else f"{'-':>8}"
+
+
+def report(level: Level) -> str:
+    return (
+        f"{level.users:>5} {level.walks:>6} {level.interactions:>8} "
+        f"{level.throughput:>8.1f} {level.percentile(0.50) * 1000:>8.1f} "
+        f"{level.percentile(0.95) * 1000:>8.1f} {level.percentile(0.99) * 1000:>8.1f} "
+        f"{level.errors:>6} {_megabytes(level.rss_peak)} "
+        f"{_megabytes(level.bytes_per_session)}"
+    )
+
+
+def load_mix(path: Optional[str]) -> AnswerMix:
+    """The built-in answer mix, or the profiles of a stored portfolio"""
+    if not path:
+        return AnswerMix()
+    from itra_gateway.store import AssessmentStore
+
+    with AssessmentStore(path) as store:
+        profiles = [
+            (answers, count)
+            for answers, count in store.profile_counts()
+            if set(ANSWER_MIX) <= set(answers)
+        ]
+    if not profiles:
+        raise SystemExit(f"{path} holds no complete gateway answer sets")
+    return AnswerMix(profiles)
+
+
+async def main(args: argparse.Namespace) -> None:
+    mix = load_mix(args.db)
+    app = start_app(args.port) if args.spawn else None
+    pid = app.pid if app is not None else args.pid
+    try:
+        await wait_until_ready(args.port)
+        url = f"ws://127.0.0.1:{args.port}/_stcore/stream"
+        # Warm up imports and caches so the first level is not all cold start
+        warm = Level(1)
+        async with StreamlitClient(url) as client:
+            await walk(
+                client, mix.draw(random.Random(args.seed)), random.Random(), 0, 60, warm
+            )
+        rss_warm = resident_bytes(pid)
+
+        if not args.json:
+            print(
+                f"{args.walks} walk(s) per user, {args.think:.2f}s mean think time, "
+                f"against {url}"
+            )
+            print(
+                f"{'users':>5} {'walks':>6} {'clicks':>8} {'clicks/s':>8} "
+                f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>6} "
+                f"{'RSS MB':>8} {'MB/sess':>8}"
+            )
+        fits, laggy = None, False
+        for users in args.users:
+            level = await run_level(url, users, mix, args, pid, rss_warm)
+            if args.json:
+                print(json.dumps(level.to_dict()))
+            else:
+                print(report(level))
+            # The last level before the first one that lags or fails
+            laggy = laggy or level.errors or level.percentile(0.95) * 1000 > args.lag_ms
+            if not laggy:
+                fits = users
+        if not args.json:
+            print(
+                f"Most concurrent users with p95 under {args.lag_ms:.0f} ms and no "
+                f"errors: {fits if fits is not None else 'none'}"
+            )
+    finally:
+        if app is not None:
+            app.terminate()
+            app.wait()
+
+
+def _counts(text: str) -> List[int]:
+    return [int(value) for value in text.split(",")]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Load test the Streamlit app with concurrent simulated assessors"
+    )
+    parser.add_argument("--port", type=int, default=8501)
+    parser.add_argument(
+        "--spawn", action="store_true", help="start the app on --port for the run"
+    )
+    parser.add_argument(
+        "--pid", type=int, help="app process to read resident memory from"
+    )
+    parser.add_argument(
+        "--users",
+        type=_counts,
+        default=[1, 2, 4, 8, 16],
+        help="comma-separated concurrency levels (default: 1,2,4,8,16)",
+    )
+    parser.add_argument("--walks", type=int, default=1, help="assessments per user")
+    parser.add_argument(
+        "--think", type=float, default=0.5, help="mean seconds between clicks"
+    )
+    parser.add_argument(
+        "--ramp", type=float, default=1.0, help="seconds over which users arrive"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=30.0, help="seconds before a click fails"
+    )
+    parser.add_argument(
+        "--lag-ms", type=float, default=200.0, help="p95 latency that feels laggy"
+    )
+    parser.add_argument("--db", help="sample answer sets from a stored portfolio")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", action="store_true", help="one JSON line per level")
+    parser.add_argument("--verbose", action="store_true")
+    asyncio.run(main(parser.parse_args()))
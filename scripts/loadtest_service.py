@@ -0,0 +1,156 @@
+# Local load test for the ITRA scoping service
+# Run with: uv run python scripts/loadtest_service.py --spawn --connections 64
+#
+# Opens N keep-alive connections, each sending requests back to back for a
+# fixed duration, and reports throughput and p50/p99 latency per endpoint.
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from itra_gateway.engine import ANSWER_DOMAINS, GATEWAY_KEYS  # noqa: E402
+
+
+def random_answers(rng: random.Random) -> Dict[str, str]:
+    return {key: rng.choice(ANSWER_DOMAINS[key]) for key in GATEWAY_KEYS}
+
+
+def build_request(host: str, path: str, payload: Dict) -> bytes:
+    body = json.dumps(payload).encode()
+    head = (
+        f"POST {path} HTTP/1.1\r\nHost: {host}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n"
+    )
+    return head.encode() + body
+
+
+async def read_response(reader: asyncio.StreamReader) -> int:
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    length = 0
+    for line in head.split(b"\r\n"):
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":", 1)[1])
+    await reader.readexactly(length)
+    return status
+
+
+async def client(
+    host: str,
+    port: int,
+    requests: List[bytes],
+    deadline: float,
+    latencies: List[float],
+    errors: List[int],
+) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    index = 0
+    try:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            writer.write(requests[index % len(requests)])
+            status = await read_response(reader)
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                errors.append(status)
+            index += 1
+    finally:
+        writer.close()
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def run_endpoint(args: argparse.Namespace, path: str, payloads: List[Dict]):
+    requests = [build_request(args.host, path, payload) for payload in payloads]
+    latencies: List[float] = []
+    errors: List[int] = []
+    deadline = time.perf_counter() + args.duration
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(
+            client(args.host, args.port, requests, deadline, latencies, errors)
+            for _ in range(args.connections)
+        )
+    )
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(
+        f"{path:<18} {len(latencies):>8} req  {len(latencies) / elapsed:>9,.0f} req/s  "
+        f"p50 {percentile(latencies, 0.50) * 1000:6.2f} ms  "
+        f"p99 {percentile(latencies, 0.99) * 1000:6.2f} ms  "
+        f"errors {len(errors)}"
+    )
+
+
+async def wait_for_port(host: str, port: int, timeout: float = 10.0) -> None:
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+async def main(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    single = [{"answers": random_answers(rng)} for _ in range(256)]
+    batch = [
+        {"assessments": [{"answers": random_answers(rng)} for _ in range(100)]}
+        for _ in range(8)
+    ]
+
+    await wait_for_port(args.host, args.port)
+    print(
+        f"{args.connections} connections, {args.duration:.0f}s per endpoint "
+        f"against http://{args.host}:{args.port}"
+    )
+    await run_endpoint(args, "/v1/scope", single)
+    await run_endpoint(args, "/v1/export", single)
+    await run_endpoint(args, "/v1/export/batch", batch)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the ITRA scoping service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument(
+        "--spawn", action="store_true", help="start a local service for the run"
+    )
+    args = parser.parse_args()
+
+    server = None
+    if args.spawn:
+        server = subprocess.Popen(
+            [sys.executable, os.path.join(ROOT, "main.py"), "serve"]
+            + ["--host", args.host, "--port", str(args.port)],
+            stdout=subprocess.DEVNULL,
+        )
+    try:
+        asyncio.run(main(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
@@ -0,0 +1,88 @@
+# Measure what each click costs in the running Streamlit app
+# Run with: uv run python scripts/measure_reruns.py --spawn
+#
+# Walks every gateway question through the real websocket protocol, then
+# generates the full assessment preview and exports it, and reports, per
+# interaction, the rerun wall time (click -> script finished) and the number
+# of elements and bytes sent back to the browser.
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+from collections import defaultdict
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from streamlit_client import (  # noqa: E402
+    RunStats,
+    StreamlitClient,
+    start_app,
+    wait_until_ready,
+)
+
+QUESTION_KEYS = ["asset_type", "B.2", "T.6", "B.3", "S.1", "B.13", "D.1", "D.2"]
+BUTTONS = {
+    "generate": "📋 Generate Full Assessment",
+    "export": "📤 Export Configuration",
+}
+
+
+async def measure(url: str, rounds: int) -> Dict[str, List[RunStats]]:
+    results: Dict[str, List[RunStats]] = defaultdict(list)
+    async with StreamlitClient(url) as client:
+        results["initial load"].append(await client.run())
+        for round_index in range(rounds):
+            for key in QUESTION_KEYS:
+                widget = client.widget(f"{key}_display")
+                # Alternate between two options so every click is a change
+                option = widget.options[(round_index + 1) % 2]
+                results[key].append(await client.set_radio(widget.key, option))
+        for name, label in BUTTONS.items():
+            results[name].append(await client.click(label))
+    return results
+
+
+def report(results: Dict[str, List[RunStats]]) -> None:
+    print(f"{'interaction':<14} {'rerun ms':>9} {'elements':>9} {'bytes':>8}")
+    totals = [0.0, 0, 0]
+    for name, runs in results.items():
+        seconds = statistics.median(run.seconds for run in runs)
+        deltas = statistics.median(run.deltas for run in runs)
+        sent = statistics.median(run.bytes for run in runs)
+        print(f"{name:<14} {seconds * 1000:>9.1f} {deltas:>9.0f} {sent:>8.0f}")
+        if name in QUESTION_KEYS:
+            totals[0] += seconds
+            totals[1] += deltas
+            totals[2] += sent
+    questions = len(QUESTION_KEYS)
+    print(
+        f"{'per click':<14} {totals[0] / questions * 1000:>9.1f} "
+        f"{totals[1] / questions:>9.1f} {totals[2] / questions:>8.0f}"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    app = None
+    if args.spawn:
+        app = start_app(args.port)
+    try:
+        await wait_until_ready(args.port)
+        url = f"ws://127.0.0.1:{args.port}/_stcore/stream"
+        report(await measure(url, args.rounds))
+    finally:
+        if app is not None:
+            app.terminate()
+            app.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure per-click rerun cost")
+    parser.add_argument("--port", type=int, default=8501)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument(
+        "--spawn", action="store_true", help="start the app on --port for the run"
+    )
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,180 @@
+# Minimal headless client for a running Streamlit app
+#
+# Speaks the same websocket protocol as the browser (protobuf BackMsg /
+# ForwardMsg over /_stcore/stream), so measurements include everything a real
+# user pays for: script run time, fragment scoping and bytes on the wire.
+# Uses only packages Streamlit itself depends on (websockets, protobuf).
+
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "streamlit_itra_app.py")
+
+
+@dataclass
+class RunStats:
+    seconds: float
+    deltas: int  # elements and blocks sent to the browser
+    bytes: int  # websocket payload bytes received
+    messages: List[ForwardMsg] = field(default_factory=list, repr=False)
+
+
+@dataclass
+class Widget:
+    id: str
+    kind: str
+    label: str
+    options: List[str]
+    fragment_id: str
+    value: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        # Keyed widget ids end with "-<user key>"
+        return self.id.rsplit("-", 1)[-1]
+
+
+class StreamlitClient:
+    """One simulated browser tab"""
+
+    def __init__(self, url: str = "ws://127.0.0.1:8501/_stcore/stream"):
+        self.url = url
+        self.widgets: Dict[str, Widget] = {}
+        self.query_string = ""
+        self._ws = None
+
+    async def __aenter__(self) -> "StreamlitClient":
+        self._ws = await websockets.connect(
+            self.url, subprotocols=["streamlit"], max_size=None
+        )
+        # Without this, Nagle + delayed ACK adds ~40 ms to small messages on
+        # loopback and swamps the script run time we want to measure
+        self._ws.transport.get_extra_info("socket").setsockopt(
+            socket.IPPROTO_TCP, socket.TCP_NODELAY, 1
+        )
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self._ws.close()
+
+    def widget(self, key: str) -> Widget:
+        for widget in self.widgets.values():
+            if widget.key == key or widget.label == key:
+                return widget
+        raise KeyError(f"no widget {key!r} on the page")
+
+    async def run(
+        self, trigger: Optional[Widget] = None, fragment_id: str = ""
+    ) -> RunStats:
+        """Request a rerun with the current widget values and wait for it"""
+        message = BackMsg()
+        state = message.rerun_script
+        state.query_string = self.query_string
+        state.fragment_id = fragment_id
+        for widget in self.widgets.values():
+            if widget.kind == "radio" and widget.value is not None:
+                state.widget_states.widgets.append(
+                    WidgetState(id=widget.id, string_value=widget.value)
+                )
+        if trigger is not None:
+            state.widget_states.widgets.append(
+                WidgetState(id=trigger.id, trigger_value=True)
+            )
+
+        started = time.perf_counter()
+        await self._ws.send(message.SerializeToString())
+        return await self._collect(started)
+
+    async def set_radio(self, key: str, option: str) -> RunStats:
+        widget = self.widget(key)
+        if option not in widget.options:
+            raise ValueError(f"{option!r} is not an option of {key!r}")
+        widget.value = option
+        return await self.run(fragment_id=widget.fragment_id)
+
+    async def click(self, key: str) -> RunStats:
+        widget = self.widget(key)
+        return await self.run(trigger=widget, fragment_id=widget.fragment_id)
+
+    async def _collect(self, started: float) -> RunStats:
+        deltas = 0
+        received = 0
+        messages = []
+        while True:
+            data = await self._ws.recv()
+            received += len(data)
+            message = ForwardMsg()
+            message.ParseFromString(data)
+            messages.append(message)
+            kind = message.WhichOneof("type")
+            if kind == "delta":
+                deltas += 1
+                self._track(message)
+            elif kind == "page_info_changed":
+                self.query_string = message.page_info_changed.query_string
+            elif (
+                kind == "script_finished"
+                and message.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN
+            ):
+                # A callback calling st.rerun() ends the first run early and
+                # the rerun it asked for follows on the same socket
+                return RunStats(
+                    time.perf_counter() - started, deltas, received, messages
+                )
+
+    def _track(self, message: ForwardMsg) -> None:
+        delta = message.delta
+        if delta.WhichOneof("type") != "new_element":
+            return
+        element = delta.new_element
+        kind = element.WhichOneof("type")
+        if kind not in ("radio", "button", "download_button"):
+            return
+        proto = getattr(element, kind)
+        options = list(getattr(proto, "options", []))
+        known = self.widgets.get(proto.id)
+        value = known.value if known else None
+        if kind == "radio":
+            if proto.HasField("raw_value"):
+                value = proto.raw_value
+            elif value is None and proto.HasField("default"):
+                value = options[proto.default]
+        self.widgets[proto.id] = Widget(
+            proto.id, kind, proto.label, options, delta.fragment_id, value
+        )
+
+
+def start_app(port: int, *extra_args: str) -> subprocess.Popen:
+    """Launch the app headless on a local port"""
+    return subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", APP_PATH]
+        + ["--server.headless", "true", "--server.port", str(port)]
+        + ["--browser.gatherUsageStats", "false", *extra_args],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+async def wait_until_ready(port: int, timeout: float = 30.0) -> None:
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.2)
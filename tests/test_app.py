@@ -0,0 +1,75 @@
+import os
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("streamlit")
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from itra_gateway.app import (  # noqa: E402
+    RESUME_PARAM,
+    parse_resume_token,
+    resume_token,
+)
+from itra_gateway.engine import (  # noqa: E402
+    _PACKED_BITS,
+    ANSWER_CODE_VERSION,
+    ANSWER_DOMAINS,
+    SCOPES,
+    encode_answers,
+)
+
+APP_PATH = os.path.join(os.path.dirname(__file__), "..", "streamlit_itra_app.py")
+# Every question answered, as the page records the radios' default options
+ANSWERS = {key: domain[-1] for key, domain in ANSWER_DOMAINS.items()}
+START = datetime(2026, 3, 2, 9, 30)
+VERSION = ANSWER_CODE_VERSION << _PACKED_BITS
+BAD_TOKENS = {
+    "non-hex": "zz.69a55a28",
+    "no epoch": f"{VERSION:x}",
+    "empty epoch": f"{VERSION:x}.",
+    "epoch out of range": f"{VERSION:x}.ffffffffffffffff",
+    "unknown version": f"{(ANSWER_CODE_VERSION + 1) << _PACKED_BITS:x}.69a55a28",
+    "packed out of range": f"{VERSION | len(SCOPES):x}.69a55a28",
+    "negative code": "-1.69a55a28",
+}
+
+
+def test_resume_tokens_round_trip():
+    token = resume_token(encode_answers(ANSWERS), START)
+    assert parse_resume_token(token) == (ANSWERS, START)
+
+
+@pytest.mark.parametrize("token", BAD_TOKENS.values(), ids=BAD_TOKENS.keys())
+def test_bad_resume_tokens_are_rejected(token):
+    with pytest.raises(ValueError):
+        parse_resume_token(token)
+
+
+def run_app(token=None):
+    at = AppTest.from_file(APP_PATH, default_timeout=30)
+    if token is not None:
+        at.query_params[RESUME_PARAM] = token
+    at.run()
+    assert not at.exception, at.exception
+    return at
+
+
+def test_resume_link_restores_the_assessment():
+    token = resume_token(encode_answers(ANSWERS), START)
+    at = run_app(token)
+    assert at.query_params[RESUME_PARAM] == token
+    assert not at.warning
+
+
+@pytest.mark.parametrize("token", BAD_TOKENS.values(), ids=BAD_TOKENS.keys())
+def test_bad_resume_links_start_a_fresh_assessment(token):
+    fresh = run_app().query_params[RESUME_PARAM]
+    at = run_app(token)
+    assert [w.value for w in at.warning] == [
+        "This resume link has expired, starting a new assessment"
+    ]
+    code, _, started = at.query_params[RESUME_PARAM].partition(".")
+    assert code == fresh.partition(".")[0]
+    assert int(started, 16) >= int(fresh.partition(".")[2], 16)
@@ -0,0 +1,107 @@
+import json
+import multiprocessing
+
+import pytest
+
+from itra_gateway.audit import AuditLog, _seal, verify
+
+ANSWERS = [("asset_type", "it_system"), ("B.2", "Yes"), ("T.6", "No")]
+
+
+def fill(path, assessment="a1", rounds=5):
+    with AuditLog(path, snapshot_every=4) as log:
+        answers = {}
+        for _ in range(rounds):
+            for key, value in ANSWERS:
+                previous = answers.get(key)
+                answers[key] = value if previous != value else "No"
+                log.record(assessment, key, previous, answers[key], answers)
+        return log.state(assessment), log.stats()
+
+
+def lines(path):
+    with open(path, "rb") as f:
+        return f.readlines()
+
+
+def test_intact_log_verifies_and_replays(tmp_path):
+    path = str(tmp_path / "audit.log")
+    state, stats = fill(path)
+    result = verify(path)
+    assert result.ok
+    assert result.records == result.checkpoint == stats["records"]
+    assert result.head == stats["head"]
+    with AuditLog(path, read_only=True) as log:
+        assert log.state("a1") == state
+
+
+def test_edited_record_breaks_the_chain(tmp_path):
+    path = str(tmp_path / "audit.log")
+    fill(path)
+    records = lines(path)
+    record = json.loads(records[3])
+    record["to"] = "Maybe"
+    records[3] = json.dumps(record).encode() + b"\n"
+    with open(path, "wb") as f:
+        f.writelines(records)
+    assert verify(path).error == (4, "hash does not match the record")
+
+
+def test_truncated_tail_is_caught_by_the_checkpoint(tmp_path):
+    path = str(tmp_path / "audit.log")
+    fill(path)
+    records = lines(path)
+    with open(path, "wb") as f:
+        f.writelines(records[:-2])
+    result = verify(path)
+    assert not result.ok
+    assert result.error[0] == len(records) - 1
+    assert "removed from the end" in result.error[1]
+
+
+def test_writer_refuses_a_log_cut_short_of_its_checkpoint(tmp_path):
+    path = str(tmp_path / "audit.log")
+    fill(path)
+    with open(path, "rb+") as f:
+        f.truncate(sum(map(len, lines(path)[:-1])))
+    with pytest.raises(ValueError, match="index checkpoint"):
+        AuditLog(path)
+    # Reading what is left still works
+    with AuditLog(path, read_only=True) as log:
+        assert log.stats()["records"] == len(lines(path))
+
+
+def test_resealed_last_record_is_caught_by_the_checkpoint(tmp_path):
+    path = str(tmp_path / "audit.log")
+    fill(path)
+    records = lines(path)
+    record = json.loads(records[-1])
+    del record["hash"]
+    record["to"] = "Maybe"
+    records[-1] = _seal(record)
+    with open(path, "wb") as f:
+        f.writelines(records)
+    assert verify(path).error == (
+        len(records),
+        "record does not match the index checkpoint",
+    )
+
+
+def _append(path, assessment):
+    fill(path, assessment, rounds=100)
+
+
+def test_processes_appending_to_one_log_keep_one_chain(tmp_path):
+    path = str(tmp_path / "audit.log")
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=_append, args=(path, f"a{n}")) for n in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+        assert worker.exitcode == 0
+
+    result = verify(path)
+    assert result.ok, result.error
+    assert result.records == len(lines(path))
+    assert result.assessments == 4
@@ -0,0 +1,43 @@
+import shutil
+
+import pytest
+
+from itra_gateway.bank import BANK_DIR, QuestionBank, verify_question_counts
+from itra_gateway.engine import calculate_assessment_paths
+
+ANSWERS = {
+    "asset_type": "it_system",
+    "B.2": "Yes",
+    "T.6": "Yes",
+    "B.3": "No",
+    "S.1": "2",
+    "B.13": "High",
+    "D.1": "Yes",
+    "D.2": "Yes",
+}
+
+
+def test_bank_matches_engine_question_counts():
+    verify_question_counts(QuestionBank())
+
+
+def test_question_count_mismatch_is_reported(tmp_path):
+    bank_dir = tmp_path / "question_bank"
+    shutil.copytree(BANK_DIR, bank_dir)
+    section = bank_dir / "ai_risk.toml"
+    # Drop the section's last question
+    text = section.read_text()
+    section.write_text(text[: text.rindex("[[questions]]")])
+    with pytest.raises(AssertionError, match="AI Risk Assessment: bank has"):
+        verify_question_counts(QuestionBank(str(bank_dir)))
+
+
+def test_sections_load_on_demand():
+    bank = QuestionBank()
+    assert bank.loaded() == ()
+    sections = bank.sections_for(
+        calculate_assessment_paths(ANSWERS), ANSWERS["asset_type"]
+    )
+    assert sections
+    bank.questions(sections[0], ANSWERS)
+    assert bank.loaded() == (sections[0].file,)
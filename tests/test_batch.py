@@ -0,0 +1,103 @@
+import io
+import json
+from datetime import datetime
+
+import pytest
+
+from itra_gateway.batch import read_answer_rows, scope_row, scope_rows
+from itra_gateway.cli import main
+from itra_gateway.engine import calculate_assessment_paths, total_questions
+from itra_gateway.export import build_configuration
+
+ANSWERS = {
+    "asset_type": "health_software",
+    "B.2": "No",
+    "T.6": "Yes",
+    "B.3": "Yes",
+    "S.1": "2",
+    "B.13": "Medium",
+    "D.1": "No",
+    "D.2": "Yes",
+}
+
+
+def test_csv_and_jsonl_rows_agree():
+    header = ",".join(ANSWERS) + ",start_time"
+    csv_rows = list(
+        read_answer_rows(io.StringIO(f"{header}\n{','.join(ANSWERS.values())},\n"))
+    )
+    jsonl_rows = list(read_answer_rows(io.StringIO(json.dumps(ANSWERS) + "\n")))
+    assert csv_rows == jsonl_rows == [(ANSWERS, None)]
+
+
+def test_exported_documents_round_trip():
+    line = scope_row(ANSWERS, "2026-01-01T09:00:00")
+    [(answers, start_time)] = read_answer_rows(io.StringIO(line + "\n"))
+    assert answers == ANSWERS
+    assert start_time == "2026-01-01T09:00:00"
+
+    document = json.loads(line)
+    paths = calculate_assessment_paths(ANSWERS)
+    expected = build_configuration(
+        ANSWERS,
+        paths,
+        total_questions(paths),
+        start_time=document_time(document, "start_time"),
+        now=document_time(document, "timestamp"),
+    )
+    assert document == expected
+
+
+def document_time(document, field):
+    return datetime.fromisoformat(document["assessment_metadata"][field])
+
+
+@pytest.mark.parametrize(
+    "start_time", ["2026-01-01T09:00:00+00:00", "2026-01-01T09:00:00Z"]
+)
+def test_offset_start_times_are_scoped(start_time):
+    document = json.loads(scope_row(ANSWERS, start_time))
+    metadata = document["assessment_metadata"]
+    assert "+" not in metadata["start_time"]
+    assert metadata["duration_minutes"] > 0
+
+
+def test_non_string_answers_are_coerced():
+    record = {"gateway_answers": {"asset_type": "it_system", "B.2": ["Yes"], "T.6": 1}}
+    [(answers, _)] = read_answer_rows(io.StringIO(json.dumps(record) + "\n"))
+    assert answers == {"asset_type": "it_system", "B.2": "['Yes']", "T.6": "1"}
+    # Out-of-domain values are scored directly instead of raising
+    assert json.loads(next(scope_rows([(answers, None)])))["gateway_answers"] == answers
+
+
+@pytest.mark.parametrize(
+    "text, message",
+    [
+        ('{"gateway_answers": [1]}\n', "line 1: gateway_answers must be an object"),
+        ("{}\n[1]\n", "line 2: expected a JSON object"),
+        ("{nope\n", "line 1: invalid JSON"),
+    ],
+)
+def test_jsonl_errors_name_the_line(text, message):
+    with pytest.raises(ValueError, match=message):
+        list(read_answer_rows(io.StringIO(text), "jsonl"))
+
+
+def test_parallel_scoping_keeps_input_order():
+    rows = [({**ANSWERS, "B.13": impact}, None) for impact in ["Low", "High"] * 50]
+    serial = [json.loads(line)["gateway_answers"] for line in scope_rows(rows)]
+    parallel = [
+        json.loads(line)["gateway_answers"]
+        for line in scope_rows(rows, workers=2, chunk_size=7)
+    ]
+    assert serial == parallel == [answers for answers, _ in rows]
+
+
+def test_cli_reports_unreadable_files(tmp_path, capsys):
+    assert main(["scope", str(tmp_path / "missing.csv")]) == 1
+    assert "No such file" in capsys.readouterr().err
+
+    source = tmp_path / "rows.jsonl"
+    source.write_text('{"asset_type": "it_system", "start_time": "soon"}\n')
+    assert main(["scope", str(source), "-o", str(tmp_path / "out.ndjson")]) == 1
+    assert "error:" in capsys.readouterr().err
@@ -0,0 +1,162 @@
+import random
+from itertools import product
+
+from itra_gateway.engine import (
+    ANSWER_DOMAINS,
+    GATEWAY_KEYS,
+    RULES,
+    SCOPES,
+    AssessmentPath,
+    ScopeTracker,
+    calculate_assessment_paths,
+    decode_answers,
+    encode_answers,
+    total_questions,
+    unpack_code,
+)
+
+BASE_COUNTS = {
+    "computerised_equipment": 28,
+    "it_infrastructure": 22,
+    "it_system": 30,
+    "health_software": 28,
+}
+
+
+def reference_paths(answers):
+    """The scoping rules as they were written by hand before rules.toml"""
+    gxp = answers.get("B.2") == "Yes"
+    alternative = answers.get("B.2") == "No"
+    ai = answers.get("T.6") == "Yes"
+    patient = answers.get("B.3") == "Yes"
+    network = answers.get("S.1") not in ["Not Connected", None]
+    timing = answers.get("B.13") in ["Medium", "High"]
+    data_input = answers.get("D.1") == "Yes"
+    data_processing = answers.get("D.2") == "Yes"
+    return (
+        AssessmentPath(
+            "GxP Compliance Assessment",
+            gxp,
+            12 if gxp else 0,
+            "Full pharmaceutical compliance assessment",
+        ),
+        AssessmentPath(
+            "Alternative Compliance (GDP/GLP/GCP)",
+            alternative,
+            3 if alternative else 0,
+            "Non-GxP regulatory pathways",
+        ),
+        AssessmentPath(
+            "AI Risk Assessment",
+            ai,
+            8 if ai else 0,
+            "Artificial intelligence specific risks",
+        ),
+        AssessmentPath(
+            "Patient Safety Assessment",
+            patient,
+            2 if patient else 0,
+            "Patient health and safety impact",
+        ),
+        AssessmentPath(
+            "Network Security Assessment",
+            network,
+            4 if network else 2,
+            "Network connectivity and security risks",
+        ),
+        AssessmentPath(
+            "Detailed Timing Analysis",
+            timing,
+            2 if timing else 0,
+            "Availability and recovery requirements",
+        ),
+        AssessmentPath(
+            "Data Integrity Controls",
+            data_input or data_processing,
+            2 * data_input + data_processing,
+            "Data input and processing validation",
+        ),
+        AssessmentPath(
+            "Base Risk Assessment",
+            True,
+            BASE_COUNTS.get(answers.get("asset_type", ""), 25),
+            "Core risk questions for all assets",
+        ),
+    )
+
+
+def every_answer_set():
+    """Every partial and complete answer set within the answer domains"""
+    for values in product(*((None,) + ANSWER_DOMAINS[key] for key in GATEWAY_KEYS)):
+        yield {k: v for k, v in zip(GATEWAY_KEYS, values) if v is not None}
+
+
+def test_compiled_rules_match_the_reference_over_the_answer_space():
+    count = 0
+    for answers in every_answer_set():
+        expected = reference_paths(answers)
+        packed = unpack_code(encode_answers(answers))
+        assert SCOPES[packed] == expected, answers
+        assert RULES.evaluate(answers) == expected, answers
+        assert calculate_assessment_paths(answers) == expected, answers
+        assert RULES.totals[packed] == total_questions(expected), answers
+        count += 1
+    assert count == len(SCOPES)
+
+
+def test_answer_codes_round_trip():
+    for answers in every_answer_set():
+        assert decode_answers(encode_answers(answers)) == answers
+
+
+def test_out_of_domain_answers_are_scored_directly():
+    answers = {"asset_type": "medical_device", "S.1": "3", "D.2": "Yes"}
+    assert calculate_assessment_paths(answers) == reference_paths(answers)
+
+
+def expected_phases(phases, answers):
+    complete = 0
+    for keys in phases:
+        if not all(key in answers for key in keys):
+            break
+        complete += 1
+    return complete
+
+
+def test_scope_tracker_follows_random_answer_sequences():
+    rng = random.Random(2026)
+    phases = (("asset_type",), ("B.2", "T.6", "B.3"), GATEWAY_KEYS[4:])
+    for _ in range(200):
+        changes = []
+        tracker = ScopeTracker(phases, listeners=[changes.append])
+        answers = {}
+        for _ in range(20):
+            key = rng.choice(GATEWAY_KEYS)
+            # Clearing is as likely as any single answer
+            value = rng.choice((None,) + ANSWER_DOMAINS[key])
+            before = calculate_assessment_paths(answers)
+            previous = answers.get(key)
+            previous_phases = expected_phases(phases, answers)
+            if value is None:
+                answers.pop(key, None)
+            else:
+                answers[key] = value
+            after = calculate_assessment_paths(answers)
+
+            change = tracker.set_answer(key, value)
+            assert tracker.answers == answers
+            assert tracker.scope == after, answers
+            assert tracker.total_questions == total_questions(after)
+            assert tracker.phases_complete == expected_phases(phases, answers)
+            if value == previous:
+                assert change is None
+                continue
+            assert changes[-1] is change
+            assert (change.key, change.previous, change.value) == (key, previous, value)
+            assert change.paths == tuple(
+                (b, a) for b, a in zip(before, after) if b != a
+            ), answers
+            assert change.previous_total == total_questions(before)
+            assert change.total_questions == total_questions(after)
+            assert change.previous_phases == previous_phases
+            assert change.phases_complete == tracker.phases_complete
@@ -0,0 +1,104 @@
+import csv
+import io
+import json
+from datetime import datetime
+
+from itra_gateway.engine import (
+    PATH_NAMES,
+    calculate_assessment_paths,
+    total_questions,
+)
+from itra_gateway.export import (
+    build_configuration,
+    export_stored,
+    serialize_configuration,
+)
+from itra_gateway.store import AssessmentStore
+
+ANSWERS = {
+    "asset_type": "it_system",
+    "B.2": "Yes",
+    "T.6": "No",
+    "B.3": "No",
+    "S.1": "Not Connected",
+    "B.13": "High",
+    "D.1": "Yes",
+    "D.2": "No",
+}
+START = datetime(2026, 3, 2, 9, 0)
+NOW = datetime(2026, 3, 2, 9, 42, 30)
+
+
+def configuration(answers=ANSWERS):
+    paths = calculate_assessment_paths(answers)
+    return build_configuration(answers, paths, total_questions(paths), START, now=NOW)
+
+
+def stored(tmp_path, configs):
+    store = AssessmentStore(str(tmp_path / "assessments.sqlite"))
+    store.save_many(configs)
+    return store
+
+
+def test_serialized_configuration_matches_built():
+    assert json.loads(serialize_configuration(ANSWERS, START, now=NOW)) == (
+        configuration()
+    )
+
+
+def test_stored_ndjson_round_trips_the_app_document(tmp_path):
+    config = configuration()
+    with stored(tmp_path, [config]) as store:
+        (line,) = export_stored(store.find(), "ndjson")
+    document = json.loads(line)
+    assert document["gateway_answers"] == config["gateway_answers"]
+    assert document["assessment_scope"] == config["assessment_scope"]
+    assert document["summary"] == config["summary"]
+    for key in ("timestamp", "start_time", "duration_minutes"):
+        assert (
+            document["assessment_metadata"][key] == config["assessment_metadata"][key]
+        )
+
+
+def test_csv_path_counts_add_up_to_total(tmp_path):
+    with stored(tmp_path, [configuration()]) as store:
+        rows = list(
+            csv.reader(io.StringIO("".join(export_stored(store.find(), "csv"))))
+        )
+    header, row = rows
+    record = dict(zip(header, row))
+    paths = {path.name: path for path in calculate_assessment_paths(ANSWERS)}
+    # Network Security is skipped when the system is not connected
+    assert not paths["Network Security Assessment"].enabled
+    assert record["Network Security Assessment"] == "0"
+    assert sum(int(record[name]) for name in PATH_NAMES) == int(
+        record["total_questions"]
+    )
+
+
+def test_app_download_keys_are_pinned():
+    # The original document plus rules_version (added with rule versioning);
+    # a change here is a schema change for everyone importing the download
+    document = json.loads(serialize_configuration(ANSWERS, START, now=NOW))
+    assert list(document) == [
+        "assessment_metadata",
+        "gateway_answers",
+        "assessment_scope",
+        "summary",
+    ]
+    assert list(document["assessment_metadata"]) == [
+        "timestamp",
+        "start_time",
+        "duration_minutes",
+        "total_gateway_questions",
+        "estimated_total_questions",
+        "rules_version",
+    ]
+    assert list(document["gateway_answers"]) == list(ANSWERS)
+    for path in document["assessment_scope"]:
+        assert list(path) == ["name", "enabled", "question_count", "description"]
+    assert list(document["summary"]) == [
+        "enabled_paths",
+        "total_questions",
+        "estimated_time_minutes",
+    ]
@@ -0,0 +1,67 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+CORE_MODULES = ("itra_gateway.engine", "itra_gateway.catalog", "itra_gateway.export")
+HEAVY_MODULES = ("streamlit", "numpy")
+# Startup target for the core modules and the CLI; the best of a few fresh
+# interpreters keeps a busy machine from failing. Wall-clock checks only run
+# with ITRA_TIMING_TESTS=1 (the benchmark gates them in CI).
+BUDGET_MS = 50
+TRIES = 3
+timing = pytest.mark.skipif(
+    not os.environ.get("ITRA_TIMING_TESTS"), reason="set ITRA_TIMING_TESTS=1"
+)
+
+_PROBE = f"""
+import json, sys, time
+started = time.perf_counter()
+import {", ".join(CORE_MODULES)}
+elapsed = (time.perf_counter() - started) * 1000
+print(json.dumps({{"ms": elapsed, "modules": sorted(sys.modules)}}))
+"""
+
+
+def probe():
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout)
+
+
+def test_core_modules_import_without_heavy_dependencies():
+    modules = probe()["modules"]
+    assert [name for name in HEAVY_MODULES if name in modules] == []
+
+
+@timing
+def test_core_modules_import_within_budget():
+    best = min(probe()["ms"] for _ in range(TRIES))
+    assert best < BUDGET_MS, f"core modules took {best:.1f} ms to import"
+
+
+def cli_help_ms():
+    started = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "itra_gateway", "--help"],
+        cwd=ROOT,
+        capture_output=True,
+        check=True,
+    )
+    return (time.perf_counter() - started) * 1000
+
+
+@timing
+def test_cli_starts_within_budget():
+    best = min(cli_help_ms() for _ in range(TRIES))
+    assert best < BUDGET_MS, f"itra-gateway --help took {best:.1f} ms"
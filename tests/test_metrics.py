@@ -0,0 +1,41 @@
+import json
+import logging
+import time
+import urllib.request
+
+from itra_gateway.metrics import Registry, log_metrics, serve_metrics
+
+
+def test_log_metrics_prints_json_lines_without_logging_config(capsys, monkeypatch):
+    # As under `streamlit run`: no handler anywhere up the logger tree
+    monkeypatch.setattr(logging.root, "handlers", [])
+    logger = logging.getLogger("itra.metrics")
+    registry = Registry()
+    registry.counter("itra_test_total", "Test events").inc()
+    stop = log_metrics(0.01, registry=registry)
+    try:
+        deadline = time.monotonic() + 5
+        lines = []
+        while not lines and time.monotonic() < deadline:
+            time.sleep(0.02)
+            lines = capsys.readouterr().err.splitlines()
+    finally:
+        stop.set()
+        for handler in logger.handlers[:]:
+            logger.removeHandler(handler)
+        logger.setLevel(logging.NOTSET)
+    assert json.loads(lines[0])["itra_test_total"]
+
+
+def test_metrics_endpoint_binds_to_localhost_by_default():
+    registry = Registry()
+    registry.counter("itra_test_total", "Test events").inc()
+    server = serve_metrics(0, registry=registry)
+    try:
+        host, port = server.server_address
+        assert host == "127.0.0.1"
+        with urllib.request.urlopen(f"http://{host}:{port}/metrics") as response:
+            assert b"itra_test_total 1" in response.read()
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,78 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from itra_gateway.engine import (  # noqa: E402
+    DECISION_TABLE,
+    GATEWAY_KEYS,
+    PATH_NAMES,
+    calculate_assessment_paths,
+    estimate_time_range,
+    total_questions,
+)
+from itra_gateway.portfolio import score_portfolio  # noqa: E402
+
+# Answers outside the answer domains, and the spellings of "not answered"
+OUT_OF_DOMAIN = [
+    {"asset_type": "medical_device", "B.2": "Yes"},
+    {"asset_type": "it_system", "S.1": "3", "B.13": "Critical"},
+    {"B.2": "Maybe", "D.1": "Yes", "D.2": "Unknown"},
+]
+MISSING = [None, "", float("nan")]
+
+
+def assert_matches_engine(rows, scores):
+    assert scores.path_names == PATH_NAMES
+    assert len(scores) == len(rows)
+    for index, answers in enumerate(rows):
+        paths = calculate_assessment_paths(answers)
+        assert scores.enabled[index].tolist() == [p.enabled for p in paths], answers
+        assert scores.question_counts[index].tolist() == [
+            p.question_count for p in paths
+        ], answers
+        total = total_questions(paths)
+        assert scores.total_questions[index] == total, answers
+        assert (
+            scores.min_minutes[index],
+            scores.max_minutes[index],
+        ) == estimate_time_range(total), answers
+
+
+def columns_of(rows, missing=None):
+    return {
+        key: np.array([answers.get(key, missing) for answers in rows], dtype=object)
+        for key in GATEWAY_KEYS
+    }
+
+
+def test_every_decision_table_answer_set_matches_the_engine():
+    rows = [
+        {k: v for k, v in zip(GATEWAY_KEYS, key) if v is not None}
+        for key in DECISION_TABLE
+    ]
+    # Shuffled so profiles are not scored in table order
+    order = np.random.default_rng(7).permutation(len(rows))
+    rows = [rows[i] for i in order]
+    assert_matches_engine(rows, score_portfolio(columns_of(rows)))
+
+
+@pytest.mark.parametrize("missing", MISSING)
+def test_out_of_domain_and_missing_answers_match_the_engine(missing):
+    rows = OUT_OF_DOMAIN + [{}, {"asset_type": "it_system"}] + OUT_OF_DOMAIN
+    assert_matches_engine(rows, score_portfolio(columns_of(rows, missing)))
+
+
+def test_string_columns_and_absent_keys_match_the_engine():
+    rows = [{"asset_type": "it_system", "B.2": "No"}, {"asset_type": "other"}]
+    columns = {
+        "asset_type": np.array(["it_system", "other"]),
+        "B.2": ["No", None],
+        "T.6": None,
+    }
+    assert_matches_engine(rows, score_portfolio(columns))
+
+
+def test_empty_portfolio():
+    scores = score_portfolio({key: [] for key in GATEWAY_KEYS})
+    assert len(scores) == 0
+    assert scores.enabled.shape == (0, len(PATH_NAMES))
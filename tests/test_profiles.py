@@ -0,0 +1,61 @@
+import pytest
+
+from itra_gateway.catalog import CATALOG, Catalog
+from itra_gateway.engine import RULES_FINGERPRINT, calculate_assessment_paths
+from itra_gateway.metrics import Registry
+from itra_gateway.profiles import ProfileCache
+
+A = {"asset_type": "it_system", "B.2": "Yes", "T.6": "No"}
+B = {"asset_type": "it_system", "B.2": "No"}
+C = {"asset_type": "other"}
+
+
+def lookups(registry):
+    return registry.snapshot()["itra_profile_cache_lookups_total"]
+
+
+def test_answer_order_does_not_matter():
+    registry = Registry()
+    cache = ProfileCache(registry=registry)
+    profile = cache.get(A)
+    assert cache.get(dict(reversed(list(A.items())))) is profile
+    assert profile.scope == calculate_assessment_paths(A)
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1}
+    assert lookups(registry) == {"hit": 1, "miss": 1}
+
+
+def test_least_recently_used_profile_is_evicted_at_the_bound():
+    registry = Registry()
+    cache = ProfileCache(max_entries=2, registry=registry)
+    cache.get(A)
+    cache.get(B)
+    cache.get(A)
+    cache.get(C)
+    assert cache.stats() == {"entries": 2, "hits": 1, "misses": 3}
+
+    # B went rather than A, which was used after it; B then pushed out C
+    a = cache.get(A)
+    cache.get(B)
+    assert cache.stats() == {"entries": 2, "hits": 2, "misses": 4}
+    assert cache.get(A) is a
+    cache.get(C)
+    assert lookups(registry) == {"hit": 3, "miss": 5}
+    assert registry.snapshot()["itra_profile_cache_entries"] == {"total": 2}
+
+
+@pytest.mark.parametrize(
+    "changed",
+    [
+        {"rules_fingerprint": RULES_FINGERPRINT + "0"},
+        {"catalog": Catalog(CATALOG.phases[:-1])},
+    ],
+    ids=["rules", "catalog"],
+)
+def test_changed_fingerprints_miss(changed):
+    cache = ProfileCache(registry=Registry())
+    stale = cache.get(A)
+    # As after reloading changed rules or questions into a running cache
+    cache.version = ProfileCache(registry=Registry(), **changed).version
+    fresh = cache.get(A)
+    assert fresh is not stale and fresh.key != stale.key
+    assert cache.stats() == {"entries": 2, "hits": 0, "misses": 2}
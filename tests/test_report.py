@@ -0,0 +1,32 @@
+from itra_gateway.engine import RULES_VERSION
+from itra_gateway.report import render_stored
+from itra_gateway.store import StoredAssessment
+
+
+def stored(rules_version):
+    return StoredAssessment(
+        assessment_id=7,
+        answers={"asset_type": "it_system", "B.2": "Yes"},
+        answer_code=None,
+        enabled_paths=(),
+        total_questions=0,
+        timestamp="2026-03-02T09:30:00",
+        start_time="2026-03-02T09:00:00",
+        duration_minutes=30.0,
+        rules_version=rules_version,
+    )
+
+
+def html(rules_version):
+    ((name, data),) = render_stored(stored(rules_version), ("html",))
+    assert name == "itra-report-000007.html"
+    return data.decode()
+
+
+def test_reports_show_the_rules_the_assessment_was_completed_under():
+    page = html("0")
+    assert "Scoping rules version" in page and ">0<" in page
+    assert "Scope shown under rules version" in page
+
+    assert "Scope shown under rules version" not in html(RULES_VERSION)
+    assert "not recorded" in html(None)
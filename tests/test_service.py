@@ -0,0 +1,72 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from itra_gateway.service import dispatch
+
+ANSWERS = {
+    "asset_type": "it_system",
+    "B.2": "Yes",
+    "T.6": "No",
+    "B.3": "No",
+    "S.1": "1",
+    "B.13": "High",
+    "D.1": "Yes",
+    "D.2": "No",
+}
+
+
+def post(path, payload):
+    status, body = dispatch("POST", path, json.dumps(payload).encode())
+    return status, json.loads(body)
+
+
+def test_scope():
+    status, body = post("/v1/scope", {"answers": ANSWERS})
+    assert status == 200
+    assert body["gateway_answers"] == ANSWERS
+    assert body["summary"]["total_questions"] > 0
+
+
+@pytest.mark.parametrize("suffix", ["+00:00", "Z", "+05:30"])
+def test_export_accepts_offset_start_times(suffix):
+    started = datetime.now(timezone.utc) - timedelta(minutes=30)
+    start_time = started.replace(tzinfo=None).isoformat() + suffix
+    if suffix == "+05:30":
+        start_time = started.astimezone(
+            timezone(timedelta(hours=5, minutes=30))
+        ).isoformat()
+    status, body = post("/v1/export", {"answers": ANSWERS, "start_time": start_time})
+    assert status == 200
+    minutes = body["assessment_metadata"]["duration_minutes"]
+    assert 29.9 < minutes < 30.5
+
+
+@pytest.mark.parametrize(
+    "payload, message",
+    [
+        ({"answers": ANSWERS, "start_time": "yesterday"}, "start_time"),
+        ({"answers": ANSWERS, "start_time": 1700000000}, "start_time"),
+        ({"answers": {"B.2": "Maybe"}}, "invalid gateway answers"),
+        ({"answers": {"B.2": ["Yes"]}}, "invalid gateway answers"),
+        ({"answer": ANSWERS}, "'answers' object"),
+    ],
+)
+def test_export_validation_errors(payload, message):
+    status, body = post("/v1/export", payload)
+    assert status == 400
+    assert message in body["error"]
+
+
+def test_batch_errors_name_the_assessment():
+    payload = {"assessments": [{"answers": ANSWERS}, {"answers": {"X": "1"}}]}
+    status, body = post("/v1/export/batch", payload)
+    assert status == 400
+    assert body["error"].startswith("assessments[1]:")
+
+
+def test_invalid_json_and_routes():
+    assert dispatch("POST", "/v1/export", b"{")[0] == 400
+    assert dispatch("GET", "/v1/export", b"")[0] == 405
+    assert dispatch("POST", "/nope", b"{}")[0] == 404
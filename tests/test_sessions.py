@@ -0,0 +1,93 @@
+import pickle
+import sqlite3
+
+import pytest
+
+from itra_gateway import sessions
+from itra_gateway.metrics import Registry
+from itra_gateway.sessions import SessionStore
+
+STATE = b"x" * 1000
+SIZE = len(pickle.dumps(STATE, pickle.HIGHEST_PROTOCOL))
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(sessions.time, "time", lambda: now[0])
+    return now
+
+
+def metrics(registry):
+    snapshot = registry.snapshot()
+    return (
+        snapshot["itra_session_evictions_total"],
+        snapshot["itra_session_restores_total"].get("total", 0),
+        snapshot["itra_session_store_sessions"]["total"],
+        snapshot["itra_session_store_bytes"]["total"],
+    )
+
+
+def spilled(path):
+    with sqlite3.connect(path) as db:
+        return [row[0] for row in db.execute("SELECT session_id FROM sessions")]
+
+
+def test_idle_sessions_are_swept_after_the_ttl(clock):
+    registry = Registry()
+    store = SessionStore(ttl_seconds=100, registry=registry)
+    store.put("a", STATE)
+    clock[0] += 50
+    store.put("b", STATE)
+    clock[0] += 60
+    store.put("c", STATE)
+
+    assert store.get("a") is None
+    assert store.get("b") == STATE
+    assert store.stats() == {"sessions": 2, "bytes": 2 * SIZE}
+    assert metrics(registry) == ({"ttl": 1}, 0, 2, 2 * SIZE)
+
+
+def test_least_recently_used_sessions_go_over_the_byte_cap(clock):
+    registry = Registry()
+    store = SessionStore(max_bytes=2 * SIZE, registry=registry)
+    for session_id in "abc":
+        store.put(session_id, STATE)
+        store.get("a")
+
+    assert store.get("b") is None
+    assert store.get("a") == store.get("c") == STATE
+    assert metrics(registry) == ({"lru": 1}, 0, 2, 2 * SIZE)
+
+    # A session over the cap on its own still stays resident
+    store.put("d", STATE * 3)
+    assert store.stats()["sessions"] == 1
+    assert metrics(registry)[0] == {"lru": 3}
+
+
+def test_evicted_sessions_are_spilled_and_resumed(tmp_path, clock):
+    path = str(tmp_path / "sessions.sqlite")
+    registry = Registry()
+    store = SessionStore(max_bytes=SIZE, spill_path=path, registry=registry)
+    store.put("a", STATE)
+    store.put("b", STATE + b"b")
+    assert spilled(path) == ["a"]
+
+    assert store.get("a") == STATE
+    assert spilled(path) == ["b"]
+    assert metrics(registry) == ({"lru": 2}, 1, 1, SIZE)
+    store.close()
+
+
+def test_putting_a_spilled_session_again_drops_the_stale_copy(tmp_path, clock):
+    path = str(tmp_path / "sessions.sqlite")
+    store = SessionStore(max_bytes=SIZE, spill_path=path, registry=Registry())
+    store.put("a", STATE)
+    store.put("b", STATE)
+    assert spilled(path) == ["a"]
+
+    store.put("a", STATE[1:])
+    assert spilled(path) == ["b"]
+    store.put("b", STATE)
+    assert store.get("a") == STATE[1:]
+    store.close()
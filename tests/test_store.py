@@ -0,0 +1,88 @@
+import csv
+import io
+import json
+import sqlite3
+from datetime import datetime
+
+from itra_gateway.engine import (
+    RULES_VERSION,
+    calculate_assessment_paths,
+    total_questions,
+)
+from itra_gateway.export import build_configuration, export_stored
+from itra_gateway.store import ALL_PATHS, AssessmentStore
+
+GXP = {"asset_type": "it_system", "B.2": "Yes", "S.1": "1", "B.13": "High"}
+NON_GXP = {"asset_type": "it_infrastructure", "B.2": "No", "S.1": "Not Connected"}
+START = datetime(2026, 3, 2, 9, 0)
+NOW = datetime(2026, 3, 2, 9, 30)
+
+
+def configuration(answers, rules_version=RULES_VERSION):
+    paths = calculate_assessment_paths(answers)
+    config = build_configuration(answers, paths, total_questions(paths), START, now=NOW)
+    config["assessment_metadata"]["rules_version"] = rules_version
+    return config
+
+
+def open_store(tmp_path):
+    return AssessmentStore(str(tmp_path / "assessments.sqlite"))
+
+
+def test_assessments_keep_the_rules_version_they_were_scoped_under(tmp_path):
+    with open_store(tmp_path) as store:
+        store.save_many([configuration(GXP, "0"), configuration(NON_GXP)])
+        assert [a.rules_version for a in store.find()] == ["0", RULES_VERSION]
+        documents = [json.loads(line) for line in export_stored(store.find())]
+        rows = list(
+            csv.DictReader(io.StringIO("".join(export_stored(store.find(), "csv"))))
+        )
+
+    assert [d["assessment_metadata"]["rules_version"] for d in documents] == [
+        "0",
+        RULES_VERSION,
+    ]
+    assert {d["assessment_metadata"]["scored_rules_version"] for d in documents} == {
+        RULES_VERSION
+    }
+    assert [row["rules_version"] for row in rows] == ["0", RULES_VERSION]
+
+
+def test_older_databases_gain_an_unknown_rules_version(tmp_path):
+    with open_store(tmp_path) as store:
+        store.save(configuration(GXP))
+    conn = sqlite3.connect(tmp_path / "assessments.sqlite")
+    with conn:
+        conn.execute("ALTER TABLE assessments DROP COLUMN rules_version")
+    conn.close()
+
+    with open_store(tmp_path) as store:
+        (assessment,) = store.find()
+        assert assessment.rules_version is None
+        store.save(configuration(NON_GXP))
+        assert next(store.find(NON_GXP)).rules_version == RULES_VERSION
+
+
+def test_reopening_under_other_rules_rescores_profiles_and_rollup(tmp_path):
+    with open_store(tmp_path) as store:
+        store.save_many([configuration(GXP)] * 3 + [configuration(NON_GXP, "0")])
+        expected = set(store.rollup())
+        totals = [a.total_questions for a in store.find()]
+
+    # As left by a process running other rules
+    conn = sqlite3.connect(tmp_path / "assessments.sqlite")
+    with conn:
+        conn.execute("UPDATE scoring SET rules_fingerprint = 'other'")
+        conn.execute("UPDATE profiles SET enabled_paths = 0, total_questions = 1")
+        conn.execute("UPDATE rollup SET assessments = 0, questions = 0")
+    conn.close()
+
+    with open_store(tmp_path) as store:
+        assert set(store.rollup()) == expected
+        assert [a.total_questions for a in store.find()] == totals
+        assert "GxP Compliance Assessment" in next(store.find(GXP)).enabled_paths
+        # Rescoring never rewrites what an assessment was completed under
+        assert [a.rules_version for a in store.find()] == [RULES_VERSION] * 3 + ["0"]
+    everything = [row for row in expected if row.path == ALL_PATHS]
+    assert sum(row.assessments for row in everything) == 4
+    assert sum(row.questions for row in everything) == sum(totals)
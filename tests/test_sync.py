@@ -0,0 +1,94 @@
+import importlib.util
+import json
+import os
+import random
+from pathlib import Path
+
+import pytest
+
+from itra_gateway.metrics import Registry
+from itra_gateway.sync import IRMClient, IRMSync, SyncError
+
+_spec = importlib.util.spec_from_file_location(
+    "irm_standin", Path(__file__).parent.parent / "scripts" / "irm_standin.py"
+)
+irm_standin = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(irm_standin)
+
+
+def configs(count):
+    return [
+        {"assessment_metadata": {"n": n}, "gateway_answers": {}} for n in range(count)
+    ]
+
+
+@pytest.fixture
+def standin():
+    server = irm_standin.StandinIRM().start()
+    yield server
+    server.stop()
+
+
+def syncer(url, spool_path=None, retries=5):
+    registry = Registry()
+    client = IRMClient(url, retries=retries, backoff=0.001, registry=registry)
+    return IRMSync(
+        client,
+        batch_size=7,
+        linger=0.01,
+        spool_path=spool_path,
+        registry=registry,
+    )
+
+
+def test_retried_batches_upsert_every_record_once(standin):
+    random.seed(3)
+    standin.fail_rate = 0.3
+    sync = syncer(standin.url)
+    for config in configs(50):
+        sync.submit(config, block=True)
+    assert sync.close(timeout=30)
+    assert sync.stats() == {"sent": 50, "failed": 0, "dropped": 0}
+    assert len(standin.records) == 50
+    assert standin.stats["failed"] > 0
+
+
+def test_rejected_batch_raises(standin):
+    client = IRMClient(standin.url.replace("insertMultiple", "nope"), retries=0)
+    with pytest.raises(SyncError, match="HTTP 404"):
+        client.upsert([{"u_idempotency_key": "k", "u_assessment": "{}"}])
+    client.close()
+
+
+def test_failed_batches_are_spooled_and_resent(standin, tmp_path):
+    spool = str(tmp_path / "irm.jsonl")
+    standin.fail_rate = 1.0
+    sync = syncer(standin.url, spool, retries=1)
+    for config in configs(10):
+        sync.submit(config, block=True)
+    assert sync.close(timeout=30)
+    assert sync.stats()["failed"] == 10
+    with open(spool) as f:
+        assert len(f.readlines()) == 10
+    assert not standin.records
+
+    standin.fail_rate = 0.0
+    sync = syncer(standin.url, spool)
+    assert sync.requeued == 10
+    assert sync.close(timeout=30)
+    assert sync.stats()["sent"] == 10
+    assert len(standin.records) == 10
+    assert not os.path.exists(spool) and not os.path.exists(spool + ".resend")
+
+
+def test_interrupted_resend_is_kept_for_the_next_sync(standin, tmp_path):
+    spool = str(tmp_path / "irm.jsonl")
+    with open(spool + ".resend", "w") as f:
+        record = {"u_idempotency_key": "k1", "u_assessment": json.dumps({})}
+        f.write(json.dumps(record) + "\n")
+        f.write('{"u_idempotency_key": "k2", "u_asse')  # torn by a crash
+    sync = syncer(standin.url, spool)
+    assert sync.requeued == 1
+    assert sync.close(timeout=30)
+    assert list(standin.records) == ["k1"]
+    assert not os.path.exists(spool + ".resend")
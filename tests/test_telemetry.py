@@ -0,0 +1,43 @@
+from itra_gateway.telemetry import PATH, QUESTION, DwellTelemetry
+
+
+def record(telemetry, count, seconds=45.0):
+    for _ in range(count):
+        telemetry.record("AI Risk Assessment", "AI-01", seconds)
+
+
+def test_processes_sharing_a_file_see_each_others_samples(tmp_path):
+    path = str(tmp_path / "telemetry.sqlite")
+    first = DwellTelemetry(path, flush_interval=3600)
+    second = DwellTelemetry(path, flush_interval=3600)
+    record(first, 5)
+    record(second, 3)
+    first.flush()
+    second.flush()
+    # The first process merges the second's counts on its next flush
+    assert first.quantiles(PATH, "AI Risk Assessment")[0] == 5
+    first.flush()
+    assert first.quantiles(PATH, "AI Risk Assessment")[0] == 8
+    assert second.quantiles(QUESTION, "AI-01")[0] == 8
+    first.close()
+    second.close()
+
+
+def test_unflushed_samples_are_counted_once(tmp_path):
+    telemetry = DwellTelemetry(str(tmp_path / "telemetry.sqlite"), flush_interval=3600)
+    record(telemetry, 4)
+    telemetry.flush()
+    record(telemetry, 2)
+    assert telemetry.quantiles(PATH, "AI Risk Assessment")[0] == 6
+    telemetry.flush()
+    assert telemetry.quantiles(PATH, "AI Risk Assessment")[0] == 6
+    telemetry.close()
+    reopened = DwellTelemetry(str(tmp_path / "telemetry.sqlite"))
+    assert reopened.quantiles(PATH, "AI Risk Assessment")[0] == 6
+    reopened.close()
+
+
+def test_idle_dwell_is_dropped():
+    telemetry = DwellTelemetry(max_dwell=600)
+    assert not telemetry.record("AI Risk Assessment", "AI-01", 601)
+    assert telemetry.quantiles(PATH, "AI Risk Assessment")[0] == 0
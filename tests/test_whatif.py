@@ -0,0 +1,67 @@
+import tomllib
+from datetime import datetime
+
+from itra_gateway.engine import (
+    RULES,
+    RULES_PATH,
+    calculate_assessment_paths,
+    compile_rules,
+    total_questions,
+)
+from itra_gateway.export import build_configuration
+from itra_gateway.store import AssessmentStore
+from itra_gateway.whatif import format_report, rescore
+
+PATIENT = {"asset_type": "it_system", "B.2": "Yes", "B.3": "Yes"}
+NO_PATIENT = {"asset_type": "it_system", "B.2": "Yes", "B.3": "No"}
+START = datetime(2026, 3, 2, 9, 0)
+
+
+def rules_data():
+    with open(RULES_PATH, "rb") as f:
+        data = tomllib.load(f)
+    data["version"] = "candidate"
+    return data
+
+
+def candidate_rules(patient_questions):
+    data = rules_data()
+    for path in data["paths"]:
+        if path["name"] == "Patient Safety Assessment":
+            path["triggers"][0]["questions"] = patient_questions
+    return compile_rules(data)
+
+
+def test_changed_assessments_are_listed_by_id(tmp_path):
+    configs = []
+    for answers in (PATIENT, NO_PATIENT, PATIENT, NO_PATIENT, PATIENT):
+        paths = calculate_assessment_paths(answers)
+        configs.append(
+            build_configuration(answers, paths, total_questions(paths), START, START)
+        )
+    with AssessmentStore(str(tmp_path / "assessments.sqlite")) as store:
+        store.save_many(configs)
+        report = rescore(
+            store.profile_counts(), candidate_rules(5), RULES, store.assessment_ids
+        )
+
+    (change,) = report.changed
+    assert change.answers == PATIENT
+    assert change.assessment_ids == [1, 3, 5]
+    assert change.questions_after - change.questions_before == 3
+    assert report.total.questions_change == 9
+    assert any("ids: 1, 3, 5" in line for line in format_report(report))
+
+
+def test_removed_paths_are_reported_as_skipped():
+    data = rules_data()
+    data["paths"] = [
+        path for path in data["paths"] if path["name"] != "Patient Safety Assessment"
+    ]
+    report = rescore([(PATIENT, 4), (NO_PATIENT, 2)], compile_rules(data))
+
+    (change,) = report.changed
+    assert change.assessments == 4
+    assert change.paths_disabled == ["Patient Safety Assessment"]
+    assert change.assessment_ids == []
+    assert report.paths["Patient Safety Assessment"].assessments_after == 0